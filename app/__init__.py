@@ -12,6 +12,24 @@ def create_app(config_class=Config):
     login_manager.init_app(app)
     csrf.init_app(app)
 
+    from app.services import sqlite_profile
+    sqlite_profile.init_app(app)
+
+    from app.services import db_routing
+    db_routing.init_app(app)
+
+    from app.services import metrics
+    metrics.init_app(app)
+
+    from app.services import sectors
+    sectors.init_app(app)
+
+    from app.services import stats_service
+    stats_service.init_app(app)
+
+    from app.services import user_cache
+    user_cache.init_app(app)
+
     from app import models  # noqa: F401 — registers user_loader
 
     from app.controllers.public import public
@@ -29,4 +47,10 @@ def create_app(config_class=Config):
     from app.controllers.admin import admin
     app.register_blueprint(admin)
 
+    from app.services import assets
+    assets.init_app(app)
+
+    from app.services import compression
+    compression.init_app(app)
+
     return app
@@ -1,9 +1,12 @@
 from functools import wraps
-from flask import Blueprint, render_template, abort, request, url_for
+from flask import Blueprint, render_template, abort, request, url_for, flash, current_app
 from flask_login import login_required, current_user
-from app.models.landing import LandingRequest
-from app.models.user import User
-from app.extensions import db
+from app.services.data_export import EXPORT_FORMATS, ORDER_COLUMNS, export_response, order_rows
+from app.services.import_service import ImportFormatError, import_landings, read_csv
+from app.services.landing_service import admin_orders_count, admin_orders_query, keyset_admin_orders
+from app.services.metrics import metrics
+from app.services.sectors import sector_registry
+from app.services.stats_service import series as stats_series, totals as stats_totals
 
 admin = Blueprint('admin', __name__, url_prefix='/admin')
 
@@ -21,29 +24,11 @@ def admin_required(f):
 @admin.route('/')
 @admin_required
 def index():
-    """Admin dashboard with analytics."""
-    total = LandingRequest.query.count()
-    total_b2b = LandingRequest.query.filter_by(landing_type='b2b').count()
-    total_b2c = LandingRequest.query.filter_by(landing_type='b2c').count()
-    total_users = User.query.count()
-
-    # Per-sector counts
-    sectors = db.session.query(
-        LandingRequest.sector,
-        db.func.count(LandingRequest.id)
-    ).group_by(LandingRequest.sector).all()
-
-    # Recent requests
-    recent = LandingRequest.query\
-        .order_by(LandingRequest.created_at.desc())\
-        .limit(10).all()
-
+    """Admin dashboard with analytics, read from the daily_stat rollup."""
+    recent = admin_orders_query().limit(10).all()
     return render_template('admin/index.html',
-        total=total,
-        total_b2b=total_b2b,
-        total_b2c=total_b2c,
-        total_users=total_users,
-        sectors=sectors,
+        **stats_totals(),
+        series=stats_series(),
         recent=recent,
     )
 
@@ -52,23 +37,56 @@ def index():
 @admin_required
 def orders():
     """All orders with public links for NFC programming."""
-    page = request.args.get('page', 1, type=int)
     filter_type = request.args.get('tipo', '')
     filter_sector = request.args.get('sector', '')
 
-    query = LandingRequest.query
-
-    if filter_type in ('b2b', 'b2c'):
-        query = query.filter_by(landing_type=filter_type)
-    if filter_sector:
-        query = query.filter_by(sector=filter_sector)
-
-    orders = query.order_by(LandingRequest.created_at.desc())\
-        .paginate(page=page, per_page=25, error_out=False)
+    orders = keyset_admin_orders(request.args.get('cursor'), per_page=25,
+                                 filter_type=filter_type, filter_sector=filter_sector)
 
     return render_template('admin/orders.html',
         orders=orders,
+        total=admin_orders_count(filter_type, filter_sector),
         filter_type=filter_type,
         filter_sector=filter_sector,
+        sectors=sector_registry(),
         base_url=request.url_root.rstrip('/'),
     )
+
+
+@admin.route('/pedidos/exportar.<fmt>')
+@admin_required
+def export_orders(fmt):
+    """Every order matching the filters, with its public link, as CSV or NDJSON."""
+    if fmt not in EXPORT_FORMATS:
+        abort(404)
+    rows = order_rows(request.args.get('tipo', ''), request.args.get('sector', ''),
+                      base_url=request.url_root)
+    return export_response(fmt, 'pedidos', ORDER_COLUMNS, rows)
+
+
+@admin.route('/importar', methods=['GET', 'POST'])
+@admin_required
+def import_csv():
+    """Create profiles in bulk from an uploaded CSV and list the rejected rows."""
+    report = None
+    if request.method == 'POST':
+        upload = request.files.get('archivo')
+        if not upload or not upload.filename:
+            flash('Selecciona un archivo CSV.', 'danger')
+        else:
+            try:
+                report = import_landings(read_csv(upload.stream),
+                                         base_url=request.url_root)
+            except ImportFormatError as exc:
+                flash(str(exc), 'danger')
+    return render_template('admin/import.html', report=report)
+
+
+@admin.route('/metrics')
+@admin_required
+def metrics_text():
+    """Request and SQL metrics of this process in Prometheus text format."""
+    if 'metrics' not in current_app.extensions:
+        abort(404)
+    return current_app.response_class(metrics().render(),
+                                       mimetype='text/plain; version=0.0.4')
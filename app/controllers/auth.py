@@ -4,6 +4,7 @@ from app.extensions import db
 from app.forms.auth import LoginForm, RegisterForm
 from app.models.user import User
 from app.models.landing import LandingRequest
+from app.services.passwords import PasswordCheckBusy
 
 auth = Blueprint('auth', __name__)
 
@@ -55,9 +56,15 @@ def login():
     form = LoginForm()
     if form.validate_on_submit():
         user = User.query.filter_by(email=form.email.data).first()
-        if user and user.check_password(form.password.data):
+        try:
+            valid = user is not None and user.check_password(form.password.data)
+        except PasswordCheckBusy:
+            flash('Hay muchos accesos en este momento. Inténtalo de nuevo en unos segundos.', 'danger')
+            return render_template('auth/login.html', form=form), 503
+        if valid:
             login_user(user)
             # Auto-link any unclaimed QR profiles created with this email
+            # (this commit also stores a re-hashed password)
             LandingRequest.query.filter_by(email=user.email, user_id=None).update({'user_id': user.id})
             db.session.commit()
             next_page = request.args.get('next')
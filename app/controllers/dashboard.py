@@ -1,16 +1,24 @@
-from datetime import datetime, timezone, timedelta, date
+from datetime import date
 from flask import Blueprint, render_template, redirect, url_for, flash, request, abort, jsonify
 from flask_login import login_required, current_user
+from sqlalchemy.exc import IntegrityError
 from app.extensions import db
 from app.forms.professional import ProfessionalForm
 from app.forms.service import ServiceForm
 from app.models.professional import Professional
 from app.models.service import Service
 from app.models.landing import LandingRequest
-from app.models.landing_service import LandingService
 from app.models.contact import Contact
 from app.models.availability import Availability
 from app.models.appointment import Appointment
+from app.services.agenda_service import invalidate_agenda
+from app.services.data_export import (
+    APPOINTMENT_COLUMNS, CONTACT_COLUMNS, EXPORT_FORMATS, appointment_rows, contact_rows,
+    export_response,
+)
+from app.services.dashboard_service import dashboard_data, invalidate_dashboard
+from app.services.page_cache import invalidate_page, invalidate_user_pages
+from app.services.landing_service import touch_profile
 
 dashboard = Blueprint('dashboard', __name__)
 
@@ -41,16 +49,17 @@ def _generar_mensaje(req, contact, service_name):
     )
 
 
-def _calc_completion(landing_requests):
+def _calc_completion(landing_requests, req_stats):
     """Return 0-100 profile completion and a list of step dicts."""
     has_qr = bool(landing_requests)
     req = landing_requests[0] if has_qr else None
+    has_services = bool(req and req_stats[req.id]['services'])
     steps = [
         {'label': 'Crea tu primer perfil QR',     'done': has_qr,
          'url': url_for('landing.create') if not has_qr else None},
         {'label': 'Añade tu teléfono',            'done': bool(req and req.phone),    'url': None},
         {'label': 'Añade tu email',               'done': bool(req and req.email),    'url': None},
-        {'label': 'Añade al menos un servicio',   'done': bool(req and req.services), 'url': None},
+        {'label': 'Añade al menos un servicio',   'done': has_services,               'url': None},
         {'label': 'Añade tu página web',           'done': bool(req and req.website),  'url': None},
     ]
     pct = int(sum(1 for s in steps if s['done']) / len(steps) * 100)
@@ -60,56 +69,15 @@ def _calc_completion(landing_requests):
 @dashboard.route('/dashboard')
 @login_required
 def index():
-    landing_requests = LandingRequest.query.filter_by(user_id=current_user.id)\
-        .order_by(LandingRequest.created_at.desc()).all()
-
-    req_ids = [r.id for r in landing_requests]
-    twelve_months_ago = datetime.now(timezone.utc) - timedelta(days=365)
-    today = date.today()
-
-    if req_ids:
-        contacts_12m = Contact.query.filter(
-            Contact.request_id.in_(req_ids),
-            Contact.created_at >= twelve_months_ago
-        ).count()
-        contacts_total = Contact.query.filter(
-            Contact.request_id.in_(req_ids)
-        ).count()
-        services_count = LandingService.query.filter(
-            LandingService.request_id.in_(req_ids)
-        ).count()
-        recent_contacts = (Contact.query
-            .filter(Contact.request_id.in_(req_ids))
-            .order_by(Contact.created_at.desc())
-            .limit(20).all())
-        upcoming_appointments = (Appointment.query
-            .filter(Appointment.landing_request_id.in_(req_ids))
-            .filter(Appointment.date >= today)
-            .order_by(Appointment.date, Appointment.time)
-            .limit(20).all())
-        appointments_total = Appointment.query.filter(
-            Appointment.landing_request_id.in_(req_ids)
-        ).count()
-    else:
-        contacts_12m = contacts_total = services_count = 0
-        recent_contacts = []
-        upcoming_appointments = []
-        appointments_total = 0
-
-    completion_pct, completion_steps = _calc_completion(landing_requests)
+    data = dashboard_data(current_user.id)
+    completion_pct, completion_steps = _calc_completion(data['landing_requests'],
+                                                        data['req_stats'])
 
     return render_template('dashboard/index.html',
-        landing_requests=landing_requests,
-        contacts_12m=contacts_12m,
-        contacts_total=contacts_total,
-        qr_count=len(landing_requests),
-        services_count=services_count,
-        recent_contacts=recent_contacts,
-        upcoming_appointments=upcoming_appointments,
-        appointments_total=appointments_total,
         completion_pct=completion_pct,
         completion_steps=completion_steps,
         status_labels=STATUS_LABELS,
+        **data,
     )
 
 
@@ -124,6 +92,22 @@ def mensaje(contact_id):
     return jsonify({'message': _generar_mensaje(req, contact, service_name)})
 
 
+@dashboard.route('/dashboard/solicitudes/exportar.<fmt>')
+@login_required
+def export_contacts(fmt):
+    if fmt not in EXPORT_FORMATS:
+        abort(404)
+    return export_response(fmt, 'solicitudes', CONTACT_COLUMNS, contact_rows(current_user.id))
+
+
+@dashboard.route('/dashboard/citas/exportar.<fmt>')
+@login_required
+def export_appointments(fmt):
+    if fmt not in EXPORT_FORMATS:
+        abort(404)
+    return export_response(fmt, 'citas', APPOINTMENT_COLUMNS, appointment_rows(current_user.id))
+
+
 # ── Agenda (availability config per QR profile) ──────────────────────────────
 
 @dashboard.route('/dashboard/citas/<int:req_id>/agenda', methods=['GET', 'POST'])
@@ -151,7 +135,11 @@ def agenda(req_id):
                 slot_minutes=slot_minutes,
             ))
 
+        touch_profile(req)
         db.session.commit()
+        invalidate_agenda(req.public_slug)
+        invalidate_page(req.public_slug)
+        invalidate_dashboard(req.user_id)
         flash('Agenda actualizada correctamente.', 'success')
         return redirect(url_for('dashboard.agenda', req_id=req_id))
 
@@ -185,11 +173,22 @@ def appointment_status(appt_id):
     if not appt or appt.request.user_id != current_user.id:
         abort(403)
     new_status = request.form.get('status')
-    if new_status in ('pending', 'confirmed', 'cancelled'):
-        appt.status = new_status
-        db.session.commit()
     # Return to wherever came from
     next_url = request.form.get('next') or url_for('dashboard.index') + '#citas'
+    if new_status in ('pending', 'confirmed', 'cancelled'):
+        slug = appt.request.public_slug
+        appt.status = new_status
+        touch_profile(appt.request)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Re-activating a cancelled appointment whose slot was booked again
+            db.session.rollback()
+            flash('Ese horario ya está ocupado', 'danger')
+            return redirect(next_url)
+        invalidate_agenda(slug)
+        invalidate_page(slug)
+        invalidate_dashboard(current_user.id)
     return redirect(next_url)
 
 
@@ -212,6 +211,7 @@ def create_profile():
         )
         db.session.add(prof)
         db.session.commit()
+        invalidate_user_pages(current_user.id)
         flash('Perfil profesional creado.', 'success')
         return redirect(url_for('dashboard.index'))
 
@@ -229,6 +229,7 @@ def edit_profile():
     if form.validate_on_submit():
         form.populate_obj(prof)
         db.session.commit()
+        invalidate_user_pages(current_user.id)
         flash('Perfil actualizado.', 'success')
         return redirect(url_for('dashboard.index'))
 
@@ -255,6 +256,7 @@ def create_service():
         )
         db.session.add(service)
         db.session.commit()
+        invalidate_user_pages(current_user.id)
         flash('Servicio creado.', 'success')
         return redirect(url_for('dashboard.index'))
 
@@ -272,6 +274,7 @@ def edit_service(service_id):
     if form.validate_on_submit():
         form.populate_obj(service)
         db.session.commit()
+        invalidate_user_pages(current_user.id)
         flash('Servicio actualizado.', 'success')
         return redirect(url_for('dashboard.index'))
 
@@ -287,5 +290,6 @@ def delete_service(service_id):
 
     db.session.delete(service)
     db.session.commit()
+    invalidate_user_pages(current_user.id)
     flash('Servicio eliminado.', 'success')
     return redirect(url_for('dashboard.index'))
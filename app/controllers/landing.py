@@ -1,129 +1,31 @@
-import json
-from datetime import date, timedelta
-from flask import Blueprint, render_template, redirect, url_for, flash, session, request
+import io
+from datetime import date
+from flask import (Blueprint, render_template, redirect, url_for, flash, session, request,
+                   abort, current_app, jsonify, send_file)
 from flask_login import login_required, current_user
+from flask_wtf.csrf import generate_csrf
+from sqlalchemy.orm import undefer_group
 from app.extensions import db
 from app.forms.landing import LandingForm, ContactForm
 from app.forms.appointment import AppointmentForm
 from app.models.landing import LandingRequest
 from app.models.landing_service import LandingService
 from app.models.contact import Contact
-from app.models.appointment import Appointment
-from app.services.landing_service import generate_qr, build_prompt
+from app.models.qr_image import QrImage
+from app.services.landing_service import (QrOptions, attach_qr, build_prompt,
+                                          my_landings_query, profile_by_slug_or_404,
+                                          render_qr, touch_profile)
+from app.services.assets import ASSET_MAX_AGE, asset_bundle
+from app.services.agenda_service import agenda_json, book_slot, invalidate_agenda, is_bookable
+from app.services.dashboard_service import invalidate_dashboard
+from app.services.generation_service import enqueue_generation, latest_job
+from app.services.page_cache import invalidate_page, page_cached
+from app.services.sectors import sector_registry
 
 landing = Blueprint('landing', __name__)
 
-# Theme config per sector
-SECTOR_THEMES = {
-    'abogatap': {
-        'label': 'Abogados',
-        'primary': '#1e3a5f',
-        'bg': '#f0f2f5',
-        'icon_bg': '#e8edf3',
-        'icon': '\u2696\ufe0f',
-        'community': 'AbogaTAP',
-        'community_desc': 'Conecta con otros profesionales del derecho, comparte casos de éxito y accede a recursos exclusivos.',
-    },
-    'segurotap': {
-        'label': 'Seguros',
-        'primary': '#0d6e3f',
-        'bg': '#f0f7f4',
-        'icon_bg': '#e6f4ed',
-        'icon': '\U0001f6e1\ufe0f',
-        'community': 'SeguroTAP',
-        'community_desc': 'Únete a la red de agentes de seguros, comparte estrategias y haz crecer tu cartera.',
-    },
-    'inmotap': {
-        'label': 'Inmobiliaria',
-        'primary': '#7c5c2e',
-        'bg': '#f7f4f0',
-        'icon_bg': '#f0ebe3',
-        'icon': '\U0001f3e0',
-        'community': 'InmoTAP',
-        'community_desc': 'Conecta con agentes inmobiliarios, comparte propiedades y cierra más operaciones.',
-    },
-    'consultortap': {
-        'label': 'Consultoría',
-        'primary': '#4f46e5',
-        'bg': '#f5f3ff',
-        'icon_bg': '#ede9fe',
-        'icon': '\U0001f4bc',
-        'community': 'ConsultorTAP',
-        'community_desc': 'Conecta con consultores y asesores, comparte metodologías y amplía tu red de clientes.',
-    },
-    'gestoratap': {
-        'label': 'Gestoría y Asesoría',
-        'primary': '#334155',
-        'bg': '#f1f5f9',
-        'icon_bg': '#e2e8f0',
-        'icon': '\U0001f4ca',
-        'community': 'GestoraTAP',
-        'community_desc': 'Red de gestores y asesores fiscales. Comparte recursos, resuelve dudas y consigue nuevos clientes.',
-    },
-    'psicologiatap': {
-        'label': 'Psicología',
-        'primary': '#7c3aed',
-        'bg': '#f5f3ff',
-        'icon_bg': '#ede9fe',
-        'icon': '\U0001f9e0',
-        'community': 'PsicologíaTAP',
-        'community_desc': 'Comunidad de psicólogos y terapeutas. Comparte conocimiento y conecta con nuevos pacientes.',
-    },
-    'reformatap': {
-        'label': 'Reformas y Construcción',
-        'primary': '#b45309',
-        'bg': '#fffbeb',
-        'icon_bg': '#fef3c7',
-        'icon': '\U0001f527',
-        'community': 'ReformaTAP',
-        'community_desc': 'Red de profesionales de reformas y construcción. Comparte proyectos y consigue más clientes.',
-    },
-    'marketingtap': {
-        'label': 'Marketing Digital',
-        'primary': '#be185d',
-        'bg': '#fdf2f8',
-        'icon_bg': '#fce7f3',
-        'icon': '\U0001f4f1',
-        'community': 'MarketingTAP',
-        'community_desc': 'Comunidad de marketers digitales. Comparte estrategias, herramientas y casos de éxito.',
-    },
-    'saludtap': {
-        'label': 'Salud y Bienestar',
-        'primary': '#0f766e',
-        'bg': '#f0fdfa',
-        'icon_bg': '#ccfbf1',
-        'icon': '\U0001f3e5',
-        'community': 'SaludTAP',
-        'community_desc': 'Red de profesionales de la salud: fisioterapeutas, nutricionistas y más. Llega a más pacientes.',
-    },
-}
-
-
-def _build_agenda_json(req):
-    """Build JSON with availability for the calendar. Returns None if no agenda configured."""
-    if not req.availability:
-        return None
-
-    av0 = req.availability[0]
-    weekdays = [av.day_of_week for av in req.availability]
-
-    today = date.today()
-    future = today + timedelta(days=90)
-    booked = {}
-    for appt in req.appointments:
-        if today <= appt.date <= future:
-            key = appt.date.isoformat()
-            if key not in booked:
-                booked[key] = []
-            booked[key].append(appt.time)
-
-    return json.dumps({
-        'weekdays': weekdays,
-        'start': av0.start_time,
-        'end': av0.end_time,
-        'slot_minutes': av0.slot_minutes,
-        'booked': booked,
-    })
+# QR images are content-addressed, so clients can revalidate cheaply via ETag.
+QR_MAX_AGE = 24 * 60 * 60
 
 
 @landing.route('/comenzar', methods=['GET', 'POST'])
@@ -166,10 +68,12 @@ def create():
 
         # Generate QR pointing to the public profile
         public_url = url_for('landing.public_view', slug=req.public_slug, _external=True)
-        req.qr_code = generate_qr(public_url)
+        attach_qr(req, public_url)
 
         # Build AI-ready prompt from sector template and professional data
         req.generated_prompt = build_prompt(req, saved_services)
+        # The HTML itself is produced by a generation worker
+        enqueue_generation(req)
 
         db.session.commit()
 
@@ -183,7 +87,7 @@ def create():
 def result(slug):
     """Public result page — QR + community invite."""
     req = LandingRequest.query.filter_by(public_slug=slug).first_or_404()
-    theme = SECTOR_THEMES.get(req.sector, SECTOR_THEMES['abogatap'])
+    theme = sector_registry().get_or_default(req.sector)
     is_mine = current_user.is_authenticated and req.user_id == current_user.id
     can_claim = current_user.is_authenticated and req.user_id is None
     return render_template('landing/result.html', req=req, theme=theme,
@@ -197,6 +101,7 @@ def claim(slug):
     req = LandingRequest.query.filter_by(public_slug=slug, user_id=None).first_or_404()
     req.user_id = current_user.id
     db.session.commit()
+    invalidate_page(slug)
     flash('Perfil añadido a tu dashboard.', 'success')
     return redirect(url_for('dashboard.index'))
 
@@ -204,17 +109,72 @@ def claim(slug):
 @landing.route('/mis-landings')
 @login_required
 def my_landings():
-    requests = LandingRequest.query.filter_by(user_id=current_user.id)\
-        .order_by(LandingRequest.created_at.desc()).all()
+    requests = my_landings_query(current_user.id).all()
     return render_template('landing/list.html', requests=requests)
 
 
 @landing.route('/mis-landings/<int:id>')
 @login_required
 def detail(id):
-    req = LandingRequest.query.filter_by(id=id, user_id=current_user.id).first_or_404()
-    theme = SECTOR_THEMES.get(req.sector, SECTOR_THEMES['abogatap'])
-    return render_template('landing/detail.html', req=req, theme=theme)
+    req = LandingRequest.query.options(undefer_group('content'))\
+        .filter_by(id=id, user_id=current_user.id).first_or_404()
+    theme = sector_registry().get_or_default(req.sector)
+    job = None if req.generated_html else latest_job(req.id)
+    return render_template('landing/detail.html', req=req, theme=theme, job=job)
+
+
+@landing.route('/mis-landings/<int:id>/generacion')
+@login_required
+def generation_status(id):
+    """JSON status of the request's HTML generation, polled by the detail page."""
+    row = db.session.query(LandingRequest.has_generated_html)\
+        .filter_by(id=id, user_id=current_user.id).first()
+    if row is None:
+        abort(404)
+    job = latest_job(id)
+    return jsonify({
+        'status': 'done' if row.has_generated_html else (job.status if job else None),
+        'attempts': job.attempts if job else 0,
+    })
+
+
+@landing.route('/qr/<slug>.png')
+def qr_png(slug):
+    """Stream the QR PNG for a public profile."""
+    digest = db.session.query(LandingRequest.qr_hash)\
+        .filter_by(public_slug=slug).scalar()
+    if not digest:
+        abort(404)
+    # Answer revalidations before touching the image bytes
+    if digest in request.if_none_match:
+        response = current_app.response_class(status=304)
+        response.set_etag(digest)
+        response.cache_control.public = True
+        response.cache_control.max_age = QR_MAX_AGE
+        return response
+    data = db.session.query(QrImage.data).filter_by(sha256=digest).scalar()
+    if data is None:
+        abort(404)
+    response = send_file(io.BytesIO(data), mimetype='image/png',
+                         download_name=f'qr-{slug}.png', etag=digest,
+                         max_age=QR_MAX_AGE)
+    response.cache_control.public = True
+    return response
+
+
+@landing.route('/qr/<slug>.svg')
+def qr_svg(slug):
+    """Vector QR for printing, rendered from the public URL (memoized per process)."""
+    if db.session.query(LandingRequest.id).filter_by(public_slug=slug).scalar() is None:
+        abort(404)
+    options = QrOptions.from_config(current_app.config)._replace(format='svg')
+    data = render_qr(url_for('landing.public_view', slug=slug, _external=True), options)
+    response = current_app.response_class(data, mimetype=options.mimetype)
+    response.headers['Content-Disposition'] = f'inline; filename=qr-{slug}.svg'
+    response.cache_control.public = True
+    response.cache_control.max_age = QR_MAX_AGE
+    response.add_etag()
+    return response.make_conditional(request)
 
 
 def _service_choices(req):
@@ -224,24 +184,50 @@ def _service_choices(req):
     return choices
 
 
-@landing.route('/p/<slug>')
-def public_view(slug):
-    """Public profile page — visible to anyone who scans the QR."""
-    req = LandingRequest.query.filter_by(public_slug=slug).first_or_404()
-    theme = SECTOR_THEMES.get(req.sector, SECTOR_THEMES['abogatap'])
+def render_public_profile(req):
+    """Render the public profile page of *req*. Also used by the static export."""
+    theme = sector_registry().get_or_default(req.sector)
     form = ContactForm()
     form.service_id.choices = _service_choices(req)
     appt_form = AppointmentForm()
-    agenda_json = _build_agenda_json(req)
     return render_template('landing/public_placeholder.html',
                            req=req, theme=theme, form=form,
-                           appt_form=appt_form, agenda_json=agenda_json)
+                           appt_form=appt_form, agenda_json=agenda_json(req))
+
+
+@landing.route('/p/<slug>')
+@page_cached
+def public_view(slug):
+    """Public profile page — visible to anyone who scans the QR."""
+    req = profile_by_slug_or_404(slug, 'public_view')
+    return render_public_profile(req)
+
+
+@landing.route('/assets/<path:name>')
+def profile_asset(name):
+    """Fingerprinted profile-page bundle; its name changes with its content."""
+    asset = asset_bundle().get(name)
+    if asset is None:
+        abort(404)
+    response = current_app.response_class(asset.data, mimetype=asset.mimetype)
+    response.cache_control.public = True
+    response.cache_control.max_age = ASSET_MAX_AGE
+    response.cache_control.immutable = True
+    return response
+
+
+@landing.route('/csrf-token')
+def csrf_token():
+    """CSRF token for the current session, for statically served profile pages."""
+    response = jsonify(csrf_token=generate_csrf())
+    response.cache_control.no_store = True
+    return response
 
 
 @landing.route('/p/<slug>/contactar', methods=['POST'])
 def contact(slug):
     """Receive contact data left by someone who scanned the QR."""
-    req = LandingRequest.query.filter_by(public_slug=slug).first_or_404()
+    req = profile_by_slug_or_404(slug, 'contact')
     form = ContactForm()
     form.service_id.choices = _service_choices(req)
     if form.validate_on_submit():
@@ -258,6 +244,7 @@ def contact(slug):
         )
         db.session.add(c)
         db.session.commit()
+        invalidate_dashboard(req.user_id)
         flash('¡Gracias! Tus datos han sido enviados correctamente.', 'success')
     else:
         flash('Por favor, completa al menos tu nombre.', 'danger')
@@ -271,7 +258,6 @@ def book_appointment(slug):
     appt_form = AppointmentForm()
 
     # Read raw form data directly — more reliable for JS-populated hidden fields
-    from flask import current_app
     current_app.logger.info('CITA POST form keys: %s', list(request.form.keys()))
     current_app.logger.info('CITA POST appt_date=%r appt_time=%r name=%r',
                             request.form.get('appt_date'),
@@ -305,14 +291,8 @@ def book_appointment(slug):
         flash('No puedes reservar una cita en el pasado.', 'danger')
         return redirect(url_for('landing.public_view', slug=slug) + '#pide-cita')
 
-    # Prevent double-booking the same slot
-    existing = Appointment.query.filter_by(
-        landing_request_id=req.id,
-        date=appt_date,
-        time=appt_time,
-    ).first()
-    if existing:
-        flash('Ese horario ya no está disponible. Por favor elige otro.', 'danger')
+    if not is_bookable(req.id, appt_date, appt_time):
+        flash('Ese horario no está disponible. Por favor elige otro.', 'danger')
         return redirect(url_for('landing.public_view', slug=slug) + '#pide-cita')
 
     try:
@@ -320,7 +300,8 @@ def book_appointment(slug):
     except ValueError:
         service_id = None
 
-    appt = Appointment(
+    # The unique slot index decides who gets the slot — no check-then-insert
+    appt_id = book_slot(
         landing_request_id=req.id,
         service_id=service_id,
         name=name,
@@ -330,7 +311,15 @@ def book_appointment(slug):
         time=appt_time,
         message=request.form.get('message', '').strip() or None,
     )
-    db.session.add(appt)
+    if appt_id is not None:
+        touch_profile(req)
     db.session.commit()
+    if appt_id is None:
+        flash('Ese horario ya no está disponible. Por favor elige otro.', 'danger')
+        return redirect(url_for('landing.public_view', slug=slug) + '#pide-cita')
+
+    invalidate_agenda(slug)
+    invalidate_page(slug)
+    invalidate_dashboard(req.user_id)
     flash('¡Cita reservada! Te confirmaremos lo antes posible.', 'success')
     return redirect(url_for('landing.public_view', slug=slug))
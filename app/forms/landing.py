@@ -2,19 +2,13 @@ from flask_wtf import FlaskForm
 from wtforms import SelectField, StringField, TextAreaField, SubmitField
 from wtforms.validators import DataRequired, Length, Optional, ValidationError
 
+from app.services.sectors import sector_registry
+
 
 class LandingForm(FlaskForm):
-    sector = SelectField('Sector', choices=[
-        ('abogatap',     'AbogaTAP — Abogados'),
-        ('segurotap',    'SeguroTAP — Seguros'),
-        ('inmotap',      'InmoTAP — Inmobiliaria'),
-        ('consultortap', 'ConsultorTAP — Consultoría'),
-        ('gestoratap',   'GestoraTAP — Gestoría y Asesoría'),
-        ('psicologiatap','PsicologíaTAP — Psicología'),
-        ('reformatap',   'ReformaTAP — Reformas y Construcción'),
-        ('marketingtap', 'MarketingTAP — Marketing Digital'),
-        ('saludtap',     'SaludTAP — Salud y Bienestar'),
-    ], validators=[DataRequired()])
+    # Callable so the choices come from the sector registry, which builds them once
+    sector = SelectField('Sector', choices=lambda: sector_registry().choices(),
+                         validators=[DataRequired()])
 
     contact_name = StringField('Nombre completo', validators=[
         DataRequired(), Length(max=150)
@@ -6,3 +6,6 @@ from app.models.landing_service import LandingService
 from app.models.contact import Contact
 from app.models.availability import Availability
 from app.models.appointment import Appointment
+from app.models.qr_image import QrImage
+from app.models.generation_job import GenerationJob
+from app.models.daily_stat import DailyStat
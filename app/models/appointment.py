@@ -1,9 +1,24 @@
 from datetime import datetime, timezone
+from sqlalchemy.orm import column_property
+
 from app.extensions import db
 
 
+# Partial-index predicate: a cancelled appointment frees its slot
+ACTIVE_SLOT_PREDICATE = db.text("status != 'cancelled'")
+
+
 class Appointment(db.Model):
     __tablename__ = 'appointment'
+    __table_args__ = (
+        # One active booking per slot; see agenda_service.book_slot
+        db.Index('uq_appointment_active_slot', 'landing_request_id', 'date', 'time',
+                 unique=True,
+                 sqlite_where=ACTIVE_SLOT_PREDICATE,
+                 postgresql_where=ACTIVE_SLOT_PREDICATE),
+        # Upcoming appointments (no status filter, so the partial index above can't serve it)
+        db.Index('ix_appointment_request_date_time', 'landing_request_id', 'date', 'time'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     landing_request_id = db.Column(db.Integer, db.ForeignKey('landing_request.id'), nullable=False)
@@ -14,7 +29,10 @@ class Appointment(db.Model):
     date = db.Column(db.Date, nullable=False)
     time = db.Column(db.String(5), nullable=False)   # "09:00"
     message = db.Column(db.Text, nullable=True)
-    status = db.Column(db.String(20), default='pending')  # pending / confirmed / cancelled
+    # pending / confirmed / cancelled. active_history keeps the old value for
+    # the daily_stat rollup even when it was not loaded before the change.
+    status = column_property(db.Column(db.String(20), nullable=False, default='pending',
+                                       server_default='pending'), active_history=True)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
 
     service = db.relationship('LandingService', backref='appointments', lazy=True)
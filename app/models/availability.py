@@ -3,6 +3,9 @@ from app.extensions import db
 
 class Availability(db.Model):
     __tablename__ = 'availability'
+    __table_args__ = (
+        db.Index('ix_availability_request_day', 'landing_request_id', 'day_of_week'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     landing_request_id = db.Column(db.Integer, db.ForeignKey('landing_request.id'), nullable=False)
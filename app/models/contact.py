@@ -4,6 +4,10 @@ from app.extensions import db
 
 class Contact(db.Model):
     __tablename__ = 'contact'
+    __table_args__ = (
+        # Dashboard: WHERE request_id IN (...) ORDER BY created_at DESC, and the 12-month count
+        db.Index('ix_contact_request_id_created_at', 'request_id', 'created_at'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     request_id = db.Column(db.Integer, db.ForeignKey('landing_request.id'), nullable=False)
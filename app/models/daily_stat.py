@@ -0,0 +1,19 @@
+from app.extensions import db
+
+
+class DailyStat(db.Model):
+    """Existing rows per UTC creation day, kept up to date by app/services/stats_service.py.
+
+    ``metric`` is one of ``requests`` (dimension ``<landing_type>:<sector>``),
+    ``users``, ``contacts`` or ``appointments`` (empty dimension; cancelled
+    ones are not counted).
+    """
+    __tablename__ = 'daily_stat'
+
+    day = db.Column(db.Date, primary_key=True)
+    metric = db.Column(db.String(20), primary_key=True)
+    dimension = db.Column(db.String(40), primary_key=True, default='', server_default='')
+    count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
+    def __repr__(self):
+        return f'<DailyStat {self.day} {self.metric}/{self.dimension}={self.count}>'
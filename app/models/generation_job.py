@@ -0,0 +1,33 @@
+from datetime import datetime, timezone
+from app.extensions import db
+
+
+class GenerationJob(db.Model):
+    """A queued HTML generation for a LandingRequest.
+
+    Rows go pending -> running -> done, or back to pending after a failure
+    until ``attempts`` reaches the limit, then failed. Workers claim the
+    oldest pending row with a conditional UPDATE, so any number of them
+    can share the table. See app/services/generation_service.py.
+    """
+    __tablename__ = 'generation_job'
+    __table_args__ = (
+        db.Index('ix_generation_job_status_id', 'status', 'id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    landing_request_id = db.Column(db.Integer, db.ForeignKey('landing_request.id'),
+                                   nullable=False, index=True)
+    status = db.Column(db.String(10), nullable=False, default='pending',
+                       server_default='pending')  # pending, running, done, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    worker = db.Column(db.String(64), nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    request = db.relationship('LandingRequest', backref=db.backref('generation_jobs', lazy=True))
+
+    def __repr__(self):
+        return f'<GenerationJob {self.id} {self.status} req={self.landing_request_id}>'
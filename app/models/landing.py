@@ -8,6 +8,18 @@ def generate_slug():
 
 
 class LandingRequest(db.Model):
+    __table_args__ = (
+        # dashboard / mis-landings: WHERE user_id = ? ORDER BY created_at DESC
+        db.Index('ix_landing_request_user_id_created_at', 'user_id', 'created_at'),
+        # auth: claim unowned requests by email (WHERE email = ? AND user_id IS NULL)
+        db.Index('ix_landing_request_email_user_id', 'email', 'user_id'),
+        # admin.orders: optional tipo/sector filters, newest first
+        db.Index('ix_landing_request_type_sector_created_at',
+                 'landing_type', 'sector', 'created_at'),
+        db.Index('ix_landing_request_sector_created_at', 'sector', 'created_at'),
+        db.Index('ix_landing_request_created_at', 'created_at'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=True)
     public_slug = db.Column(db.String(16), unique=True, nullable=False, default=generate_slug)
@@ -24,10 +36,17 @@ class LandingRequest(db.Model):
     linkedin = db.Column(db.String(200), nullable=True)
     website = db.Column(db.String(200), nullable=True)
 
-    generated_prompt = db.Column(db.Text, nullable=True)
-    generated_html = db.Column(db.Text, nullable=True)
-    qr_code = db.Column(db.Text, nullable=True)  # base64 PNG
+    # Large text columns are deferred as the 'content' group: list views never
+    # load them, detail views opt in with undefer_group('content').
+    generated_prompt = db.deferred(db.Column(db.Text, nullable=True), group='content')
+    generated_html = db.deferred(db.Column(db.Text, nullable=True), group='content')
+    has_generated_html = db.column_property(generated_html.columns[0].isnot(None))
+    qr_hash = db.Column(db.String(64), db.ForeignKey('qr_image.sha256'), nullable=True)
     created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+    # Bumped on row edits and by landing_service.touch_profile when something
+    # rendered on the public page (bookings, agenda) changes
+    updated_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc),
+                           onupdate=lambda: datetime.now(timezone.utc))
 
     user = db.relationship('User', backref=db.backref('landing_requests', lazy=True))
     services = db.relationship('LandingService', backref='request', lazy=True,
@@ -36,6 +55,7 @@ class LandingRequest(db.Model):
     availability = db.relationship('Availability', backref='request', lazy=True,
                                    order_by='Availability.day_of_week')
     appointments = db.relationship('Appointment', backref='request', lazy=True)
+    qr_image = db.relationship('QrImage', lazy=True)
 
     @property
     def is_b2b(self):
@@ -3,6 +3,9 @@ from app.extensions import db
 
 class LandingService(db.Model):
     __tablename__ = 'landing_service'
+    __table_args__ = (
+        db.Index('ix_landing_service_request_id_order', 'request_id', 'order'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     request_id = db.Column(db.Integer, db.ForeignKey('landing_request.id'), nullable=False)
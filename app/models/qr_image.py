@@ -0,0 +1,18 @@
+from datetime import datetime, timezone
+from app.extensions import db
+
+
+class QrImage(db.Model):
+    """PNG bytes of a QR code, keyed by the SHA-256 of its content.
+
+    Identical images (same URL, same options) are stored once and shared by
+    every LandingRequest that points at them.
+    """
+    __tablename__ = 'qr_image'
+
+    sha256 = db.Column(db.String(64), primary_key=True)
+    data = db.Column(db.LargeBinary, nullable=False)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return f'<QrImage {self.sha256[:12]}>'
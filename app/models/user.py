@@ -1,7 +1,7 @@
 from datetime import datetime, timezone
 from flask_login import UserMixin
-from werkzeug.security import generate_password_hash, check_password_hash
 from app.extensions import db, login_manager
+from app.services.passwords import hash_password, needs_rehash, verify_password
 
 
 class User(UserMixin, db.Model):
@@ -14,10 +14,18 @@ class User(UserMixin, db.Model):
     professional = db.relationship('Professional', backref='user', uselist=False, lazy=True)
 
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = hash_password(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        """Verify *password*; on success, re-hash it if PASSWORD_HASH_METHOD changed.
+
+        The caller commits the new hash.
+        """
+        if not verify_password(self.password_hash, password):
+            return False
+        if needs_rehash(self.password_hash):
+            self.set_password(password)
+        return True
 
     def __repr__(self):
         return f'<User {self.email}>'
@@ -25,4 +33,5 @@ class User(UserMixin, db.Model):
 
 @login_manager.user_loader
 def load_user(user_id):
-    return User.query.get(int(user_id))
+    from app.services.user_cache import cached_user  # the cache imports this module
+    return cached_user(int(user_id))
@@ -0,0 +1,156 @@
+"""Slot availability for the public booking calendar.
+
+Availability rows are expanded server-side into concrete slots for a fixed
+window of days. Each day is sent to the browser as a bitmap string (one
+character per slot, ``'1'`` = free) so the calendar no longer has to work
+out slots or bookings itself.
+
+The result is cached per slug and dropped whenever an appointment is booked,
+changes status, or the owner edits the agenda.
+
+Bookings go through :func:`book_slot`, which relies on the partial unique
+index on Appointment instead of a check-then-insert.
+"""
+import json
+from datetime import date, timedelta
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models.appointment import Appointment, ACTIVE_SLOT_PREDICATE
+from app.models.availability import Availability
+from app.services.cache import MISS, app_cache
+from app.services.stats_service import record_one
+
+AGENDA_WINDOW_DAYS = 90
+
+
+def slot_times(start: str, end: str, minutes: int) -> list:
+    """Return the 'HH:MM' slot start times between *start* and *end* (exclusive)."""
+    if not minutes or minutes <= 0:
+        return []
+    sh, sm = (int(p) for p in start.split(':'))
+    eh, em = (int(p) for p in end.split(':'))
+    cur, end_m = sh * 60 + sm, eh * 60 + em
+    slots = []
+    while cur + minutes <= end_m:
+        slots.append(f'{cur // 60:02d}:{cur % 60:02d}')
+        cur += minutes
+    return slots
+
+
+def weekday_slots(availability) -> dict:
+    """Map day_of_week -> list of slot times for a request's Availability rows."""
+    return {
+        av.day_of_week: slot_times(av.start_time, av.end_time, av.slot_minutes or 60)
+        for av in availability
+    }
+
+
+def is_bookable(landing_request_id: int, appt_date: date, appt_time: str) -> bool:
+    """True if *appt_time* is one of the slots the agenda produces on *appt_date*."""
+    av = Availability.query.filter_by(landing_request_id=landing_request_id,
+                                      day_of_week=appt_date.weekday()).first()
+    if av is None:
+        return False
+    return appt_time in slot_times(av.start_time, av.end_time, av.slot_minutes or 60)
+
+
+def booked_slots(landing_request_id: int, start: date, end: date) -> dict:
+    """Return {date: set(times)} of non-cancelled bookings with start <= date < end."""
+    rows = db.session.query(Appointment.date, Appointment.time).filter(
+        Appointment.landing_request_id == landing_request_id,
+        Appointment.date >= start,
+        Appointment.date < end,
+        Appointment.status != 'cancelled',
+    ).all()
+    booked = {}
+    for appt_date, appt_time in rows:
+        booked.setdefault(appt_date, set()).add(appt_time)
+    return booked
+
+
+def build_calendar(req, start: date = None, days: int = AGENDA_WINDOW_DAYS):
+    """Expand *req*'s availability into free-slot bitmaps for *days* days from *start*.
+
+    Returns None if the request has no agenda configured.
+    """
+    if not req.availability:
+        return None
+    start = start or date.today()
+    end = start + timedelta(days=days)
+    slots = weekday_slots(req.availability)
+    booked = booked_slots(req.id, start, end)
+
+    free = {}
+    day = start
+    while day < end:
+        day_slots = slots.get(day.weekday())
+        if day_slots:
+            taken = booked.get(day, ())
+            free[day.isoformat()] = ''.join('0' if t in taken else '1' for t in day_slots)
+        day += timedelta(days=1)
+
+    return {
+        'start': start.isoformat(),
+        'days': days,
+        'slots': {str(dow): times for dow, times in slots.items()},
+        'free': free,
+    }
+
+
+_UPSERT_DIALECTS = {'sqlite': sqlite.insert, 'postgresql': postgresql.insert}
+
+
+def book_slot(**values):
+    """Insert an Appointment unless its slot is already actively booked.
+
+    Returns the new appointment id, or None when the slot was taken. On SQLite
+    and PostgreSQL this is a single INSERT ... ON CONFLICT DO NOTHING RETURNING;
+    other backends fall back to catching the unique-index violation. Either
+    way the booking is counted in daily_stat. The caller commits.
+    """
+    table = Appointment.__table__
+    insert = _UPSERT_DIALECTS.get(db.session.get_bind().dialect.name)
+    if insert is not None:
+        stmt = insert(table).values(**values).on_conflict_do_nothing(
+            index_elements=['landing_request_id', 'date', 'time'],
+            index_where=ACTIVE_SLOT_PREDICATE,
+        ).returning(table.c.id)
+        appt_id = db.session.execute(stmt).scalar()
+        if appt_id is not None:
+            # Core inserts skip the ORM flush hook that keeps daily_stat current
+            record_one('appointments')
+        return appt_id
+
+    appt = Appointment(**values)
+    try:
+        with db.session.begin_nested():
+            db.session.add(appt)
+    except IntegrityError:
+        return None
+    return appt.id
+
+
+def _cache():
+    return app_cache('agenda_cache', 'AGENDA_CACHE_TTL')
+
+
+def agenda_json(req):
+    """Cached calendar JSON for the public page of *req*, or None without an agenda."""
+    today = date.today()
+    cache = _cache()
+    # Entries are tagged with the day they start on, so they roll over at midnight
+    entry = cache.get(req.public_slug)
+    if entry is not MISS and entry[0] == today:
+        return entry[1]
+    calendar = build_calendar(req, start=today)
+    value = json.dumps(calendar, separators=(',', ':')) if calendar else None
+    cache.set(req.public_slug, (today, value))
+    return value
+
+
+def invalidate_agenda(slug: str):
+    """Drop the cached calendar for *slug* after its bookings or agenda change."""
+    _cache().delete(slug)
@@ -0,0 +1,157 @@
+"""Fingerprinted CSS/JS bundles for the public profile page (``/p/<slug>``).
+
+The page is a small HTML shell. Its styles and calendar script live in
+``app/static/profile/`` and are served as ``/assets/<name>.<hash>.<ext>``
+with ``Cache-Control: immutable``. A phone that scanned one profile
+downloads them once and reuses them for every other profile. The bundles
+are built in memory when the app starts, with no build step:
+
+* ``profile.css`` — the page styles, preceded by ``@font-face`` rules for
+  any fonts found in ``app/static/fonts/``
+* ``profile.js`` — theme toggle, service selection and booking calendar
+* ``sector-<name>.css`` — one per sector in the registry, with its colours
+* ``fonts/<file>.woff2`` — self-hosted font files named
+  ``<Family>-<weight>.woff2`` (weight may be ``var`` for a variable font),
+  e.g. a Latin subset made with ``pyftsubset Inter.ttf --unicodes=U+0000-00FF
+  --flavor=woff2``. Until a family is self-hosted, the page keeps loading it
+  from Google Fonts (see :func:`self_hosted_font`).
+
+The static export writes the same files under ``assets/``.
+"""
+import hashlib
+import os
+from typing import NamedTuple
+
+from flask import current_app, url_for
+
+from app.services.sectors import sector_registry
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'static')
+SOURCE_DIR = os.path.join(STATIC_DIR, 'profile')
+FONT_DIR = os.path.join(STATIC_DIR, 'fonts')
+ASSET_MAX_AGE = 365 * 24 * 60 * 60
+
+_MIMETYPES = {
+    'css': 'text/css; charset=utf-8',
+    'js': 'text/javascript; charset=utf-8',
+    'woff2': 'font/woff2',
+}
+
+
+class Asset(NamedTuple):
+    name: str  # fingerprinted, e.g. 'profile.3f2a9c1b7d0e.css'
+    data: bytes
+    mimetype: str
+
+
+class AssetBundle:
+    """Assets by logical name ('profile.css') and by fingerprinted name."""
+
+    def __init__(self):
+        self._by_logical = {}
+        self._by_name = {}
+        self.font_families = set()
+
+    def add(self, logical: str, data: bytes) -> Asset:
+        stem, ext = logical.rsplit('.', 1)
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        asset = Asset(f'{stem}.{digest}.{ext}', data, _MIMETYPES[ext])
+        self._by_logical[logical] = asset
+        self._by_name[asset.name] = asset
+        return asset
+
+    def name_of(self, logical: str) -> str:
+        return self._by_logical[logical].name
+
+    def get(self, name: str):
+        """The Asset with fingerprinted *name*, or None."""
+        return self._by_name.get(name)
+
+    @property
+    def version(self) -> str:
+        """Short digest of every asset name; changes whenever any asset does."""
+        return hashlib.sha256(' '.join(sorted(self._by_name)).encode()).hexdigest()[:12]
+
+    def write(self, out_dir: str) -> None:
+        """Write every asset under *out_dir* by fingerprinted name."""
+        for asset in self._by_name.values():
+            path = os.path.join(out_dir, asset.name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if not os.path.exists(path):
+                with open(path, 'wb') as f:
+                    f.write(asset.data)
+
+
+def _read(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _font_faces(bundle: AssetBundle, font_dir: str) -> str:
+    rules = []
+    files = sorted(os.listdir(font_dir)) if os.path.isdir(font_dir) else []
+    for filename in files:
+        if not filename.endswith('.woff2'):
+            continue
+        family, _, weight = filename[:-len('.woff2')].rpartition('-')
+        asset = bundle.add(f'fonts/{filename}', _read(os.path.join(font_dir, filename)))
+        bundle.font_families.add(family)
+        rules.append(
+            f"@font-face {{ font-family: '{family}'; "
+            f"font-weight: {'100 900' if weight == 'var' else weight}; "
+            f"font-display: swap; src: url('{asset.name}') format('woff2'); }}"
+        )
+    return '\n'.join(rules)
+
+
+def build_assets(sectors, source_dir: str = SOURCE_DIR, font_dir: str = FONT_DIR) -> AssetBundle:
+    """Build every bundle from *source_dir*, *font_dir* and the *sectors* iterable."""
+    bundle = AssetBundle()
+    # Font URLs are relative, so fonts/ must be served next to profile.css
+    faces = _font_faces(bundle, font_dir)
+    css = _read(os.path.join(source_dir, 'profile.css')).decode('utf-8')
+    bundle.add('profile.css', ((faces + '\n\n' if faces else '') + css).encode('utf-8'))
+    bundle.add('profile.js', _read(os.path.join(source_dir, 'profile.js')))
+    for sector in sectors:
+        bundle.add(f'sector-{sector.name}.css',
+                   f':root {{ --bg-page: {sector.bg}; --primary: {sector.primary}; }}\n'
+                   .encode('utf-8'))
+    return bundle
+
+
+def _stamp(source_dir: str, sectors) -> tuple:
+    sources = tuple(os.path.getmtime(os.path.join(source_dir, f))
+                    for f in sorted(os.listdir(source_dir)))
+    return sources, tuple((s.name, s.mtime) for s in sectors)
+
+
+def asset_bundle() -> AssetBundle:
+    """The current app's bundle. Rebuilt on change when the sector registry auto-reloads."""
+    ext = current_app.extensions
+    registry = sector_registry()
+    if registry.auto_reload:
+        stamp = _stamp(SOURCE_DIR, registry)
+        if ext.get('assets_stamp') != stamp:
+            ext['assets'] = build_assets(registry)
+            ext['assets_stamp'] = stamp
+    elif 'assets' not in ext:
+        ext['assets'] = build_assets(registry)
+    return ext['assets']
+
+
+def asset_url(logical: str) -> str:
+    """URL of the fingerprinted asset for *logical* (template global)."""
+    return url_for('landing.profile_asset', name=asset_bundle().name_of(logical))
+
+
+def self_hosted_font(family: str) -> bool:
+    """Whether the bundle has @font-face rules for *family* (template global)."""
+    return family in asset_bundle().font_families
+
+
+def init_app(app) -> None:
+    """Build the bundles at start-up and expose the template helpers."""
+    app.add_template_global(asset_url)
+    app.add_template_global(self_hosted_font)
+    with app.app_context():
+        asset_bundle()
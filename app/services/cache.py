@@ -0,0 +1,65 @@
+"""In-process caches shared by the service layer."""
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app
+
+# Returned by TTLCache.get on a miss; None is a valid cached value
+MISS = object()
+
+
+class TTLCache:
+    """Small thread-safe LRU whose entries also expire after *ttl* seconds.
+
+    The TTL bounds how long other worker processes, which never see a local
+    invalidation, can serve a stale value.
+    """
+
+    def __init__(self, ttl: float = 60, max_entries: int = 1024):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=MISS):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def app_cache(name: str, ttl_key: str, default_ttl: float = 60) -> TTLCache:
+    """Return the TTLCache *name* of the current app, creating it on first use.
+
+    The TTL is read from ``app.config[ttl_key]``.
+    """
+    cache = current_app.extensions.get(name)
+    if cache is None:
+        cache = TTLCache(ttl=current_app.config.get(ttl_key, default_ttl))
+        current_app.extensions[name] = cache
+    return cache
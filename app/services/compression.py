@@ -0,0 +1,192 @@
+"""gzip / brotli response compression (an ``after_request`` hook).
+
+The encoding is negotiated from ``Accept-Encoding``. Brotli is offered
+only when the optional ``brotli`` package is installed. Responses are
+left alone when they are streamed, already encoded, too small, not
+textual, or anything but a 200. Dynamic bodies are only compressed for
+the public, anonymous pages in ``DYNAMIC_ENDPOINTS``: pages behind a login
+carry per-user data and are neither compressed nor cached.
+
+Compression work is kept off the request path where possible:
+
+* Files under ``static/`` are compressed once, when the app starts, at
+  maximum level whatever ``COMPRESS_LEVEL`` says, and served from memory.
+* Other bodies go through an LRU of compressed output (``COMPRESS_CACHE_SIZE``
+  entries), keyed by the body's hash, so a repeat ``/p/<slug>`` or
+  ``/assets/`` hit costs a hash instead of a deflate.
+
+A page that embeds this request's CSRF token differs on every request.
+Compressing the token together with text an attacker can reflect into the
+page would leak it byte by byte (BREACH), so the token is always deflated
+on its own. The cache holds that body without the token: the text before
+and after it, deflated separately and ended with a full flush (which makes
+the deflate streams independent). A hit compresses only the token, splices
+the three streams and adds a fresh gzip header and trailer. This only
+works with gzip and one token: a page with several tokens, or a client
+that does not accept gzip, gets the body uncompressed.
+"""
+import hashlib
+import os
+import struct
+import zlib
+
+from flask import current_app, g, request
+
+from app.services.cache import MISS, TTLCache
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+COMPRESSIBLE_TYPES = {
+    'text/html', 'text/css', 'text/plain', 'text/csv', 'text/javascript',
+    'application/javascript', 'application/json', 'image/svg+xml',
+}
+# Endpoints whose HTML/JSON bodies are compressed; static files always are
+DYNAMIC_ENDPOINTS = frozenset((
+    'landing.public_view', 'landing.profile_asset',
+    'public.home', 'public.about', 'public.contact',
+    'public.professionals', 'public.professional_detail',
+))
+# gzip header: magic, deflate, no flags, no mtime, no extra flags, unknown OS
+_GZIP_HEADER = b'\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff'
+
+
+def available_encodings() -> tuple:
+    """Supported encodings, preferred first."""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negotiate(accept_encodings) -> str:
+    """Best encoding in *accept_encodings* (werkzeug's Accept object), or None."""
+    best, best_q = None, 0
+    for encoding in available_encodings():
+        q = accept_encodings[encoding]
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def _deflate(data: bytes, level: int, final: bool) -> bytes:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush(
+        zlib.Z_FINISH if final else zlib.Z_FULL_FLUSH)
+
+
+def _gzip(raw_deflate: bytes, data: bytes) -> bytes:
+    trailer = struct.pack('<II', zlib.crc32(data), len(data) & 0xFFFFFFFF)
+    return _GZIP_HEADER + raw_deflate + trailer
+
+
+def compress(data: bytes, encoding: str, level: int = 6) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=min(level + 3, 11))
+    return _gzip(_deflate(data, level, final=True), data)
+
+
+class CompressedOutputCache:
+    """LRU of compressed bodies keyed by their content hash."""
+
+    def __init__(self, max_entries: int, level: int = 6):
+        self.level = level
+        self._cache = TTLCache(ttl=float('inf'), max_entries=max_entries) if max_entries else None
+
+    def _cached(self, key, build):
+        if self._cache is None:
+            return build()
+        value = self._cache.get(key)
+        if value is MISS:
+            value = build()
+            self._cache.set(key, value)
+        return value
+
+    def get(self, data: bytes, encoding: str) -> bytes:
+        key = (encoding, hashlib.sha1(data).digest())
+        return self._cached(key, lambda: compress(data, encoding, self.level))
+
+    def get_spliced(self, data: bytes, token: bytes) -> bytes:
+        """gzip of *data*, which contains *token* once, reusing everything but the token."""
+        head, _, tail = data.partition(token)
+        key = ('gzip-splice', hashlib.sha1(head + b'\0' + tail).digest())
+        head_z, tail_z = self._cached(key, lambda: (_deflate(head, self.level, final=False),
+                                                     _deflate(tail, self.level, final=True)))
+        return _gzip(head_z + _deflate(token, self.level, final=False) + tail_z, data)
+
+
+STATIC_LEVEL = 9  # static files are compressed once, so the slowest level is affordable
+
+
+def precompress_static(static_folder: str, min_size: int) -> dict:
+    """{(relative path, encoding): bytes} for every compressible file in *static_folder*."""
+    from mimetypes import guess_type
+    result = {}
+    for root, _, files in os.walk(static_folder):
+        for filename in files:
+            path = os.path.join(root, filename)
+            mimetype = guess_type(filename)[0]
+            if mimetype not in COMPRESSIBLE_TYPES or os.path.getsize(path) < min_size:
+                continue
+            with open(path, 'rb') as f:
+                data = f.read()
+            relative = os.path.relpath(path, static_folder).replace(os.sep, '/')
+            for encoding in available_encodings():
+                result[(relative, encoding)] = compress(data, encoding, STATIC_LEVEL)
+    return result
+
+
+def _encode(response, body: bytes, encoding: str):
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag:
+        # Same content in another encoding: only weakly equal to the identity version
+        response.set_etag(etag, weak=True)
+
+
+def compress_response(response):
+    config = current_app.config
+    if response.mimetype not in COMPRESSIBLE_TYPES:
+        return response
+    response.vary.add('Accept-Encoding')
+    if response.status_code != 200 or 'Content-Encoding' in response.headers:
+        return response
+    encoding = negotiate(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    if request.endpoint == 'static' and response.direct_passthrough:
+        # send_file's file wrapper: swap it for the bytes compressed at start-up
+        body = current_app.extensions['compressed_static'].get(
+            (request.view_args['filename'], encoding))
+        if body is not None:
+            response.response.close()
+            response.direct_passthrough = False
+            _encode(response, body, encoding)
+        return response
+    if response.is_streamed or request.endpoint not in DYNAMIC_ENDPOINTS:
+        return response
+
+    data = response.get_data()
+    if len(data) < config.get('COMPRESS_MIN_SIZE', 500):
+        return response
+    cache = current_app.extensions['compressed_output']
+    token = g.get(config.get('WTF_CSRF_FIELD_NAME', 'csrf_token'))
+    tokens = data.count(token.encode('utf-8')) if token else 0
+    if not tokens:
+        _encode(response, cache.get(data, encoding), encoding)
+    elif tokens == 1 and request.accept_encodings['gzip'] > 0:
+        # Even when brotli wins: only the gzip splice keeps the token apart
+        _encode(response, cache.get_spliced(data, token.encode('utf-8')), 'gzip')
+    return response
+
+
+def init_app(app) -> None:
+    """Precompress static files and install the response hook."""
+    if not app.config.get('COMPRESS_ENABLED', True):
+        return
+    app.extensions['compressed_static'] = precompress_static(
+        app.static_folder, app.config.get('COMPRESS_MIN_SIZE', 500))
+    app.extensions['compressed_output'] = CompressedOutputCache(
+        app.config.get('COMPRESS_CACHE_SIZE', 256), app.config.get('COMPRESS_LEVEL', 6))
+    app.after_request(compress_response)
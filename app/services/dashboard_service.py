@@ -0,0 +1,143 @@
+"""Counters and lists shown on the professional dashboard."""
+from datetime import datetime, timezone, timedelta, date
+
+from sqlalchemy.orm import joinedload, load_only
+
+from app.extensions import db
+from app.models.landing import LandingRequest
+from app.models.landing_service import LandingService
+from app.models.contact import Contact
+from app.models.availability import Availability
+from app.models.appointment import Appointment
+from app.services.cache import MISS, app_cache
+from app.services.landing_service import dashboard_landings_query
+
+RECENT_LIMIT = 20
+
+
+def _cache():
+    return app_cache('dashboard_stats_cache', 'DASHBOARD_STATS_TTL', default_ttl=30)
+
+
+def _grouped_count(column, req_ids, *extra):
+    """Subquery of (rid, total[, extra...]) grouped by *column*, limited to *req_ids*."""
+    return db.session.query(
+        column.label('rid'), db.func.count().label('total'), *extra
+    ).filter(column.in_(req_ids)).group_by(column).subquery()
+
+
+def request_counters(req_ids: list) -> dict:
+    """Return {request_id: counters} for *req_ids* in one aggregate statement.
+
+    Each counters dict has ``contacts``, ``contacts_12m``, ``appointments``,
+    ``services`` and ``has_agenda``.
+    """
+    if not req_ids:
+        return {}
+    since = datetime.now(timezone.utc) - timedelta(days=365)
+    contacts = _grouped_count(
+        Contact.request_id, req_ids,
+        db.func.count(db.case((Contact.created_at >= since, 1))).label('last_12m'),
+    )
+    appointments = _grouped_count(Appointment.landing_request_id, req_ids)
+    services = _grouped_count(LandingService.request_id, req_ids)
+    availability = _grouped_count(Availability.landing_request_id, req_ids)
+
+    rows = db.session.query(
+        LandingRequest.id,
+        db.func.coalesce(contacts.c.total, 0),
+        db.func.coalesce(contacts.c.last_12m, 0),
+        db.func.coalesce(appointments.c.total, 0),
+        db.func.coalesce(services.c.total, 0),
+        db.func.coalesce(availability.c.total, 0),
+    ).outerjoin(contacts, contacts.c.rid == LandingRequest.id)\
+        .outerjoin(appointments, appointments.c.rid == LandingRequest.id)\
+        .outerjoin(services, services.c.rid == LandingRequest.id)\
+        .outerjoin(availability, availability.c.rid == LandingRequest.id)\
+        .filter(LandingRequest.id.in_(req_ids)).all()
+
+    return {
+        rid: {
+            'contacts': n_contacts,
+            'contacts_12m': n_recent,
+            'appointments': n_appts,
+            'services': n_services,
+            'has_agenda': n_avail > 0,
+        }
+        for rid, n_contacts, n_recent, n_appts, n_services, n_avail in rows
+    }
+
+
+def cached_request_counters(user_id: int, req_ids: list) -> dict:
+    """:func:`request_counters` cached per user for ``DASHBOARD_STATS_TTL`` seconds.
+
+    The entry is tied to the user's current set of requests, so creating or
+    claiming a profile misses the cache without an explicit invalidation.
+    """
+    cache = _cache()
+    key = tuple(req_ids)
+    entry = cache.get(user_id)
+    if entry is not MISS and entry[0] == key:
+        return entry[1]
+    counters = request_counters(req_ids)
+    cache.set(user_id, (key, counters))
+    return counters
+
+
+def invalidate_dashboard(user_id):
+    """Drop the cached counters of *user_id* after a contact or appointment changes."""
+    if user_id is not None:
+        _cache().delete(user_id)
+
+
+def recent_contacts(req_ids: list, limit: int = RECENT_LIMIT) -> list:
+    """Newest contacts for *req_ids* with their request and service already loaded."""
+    if not req_ids:
+        return []
+    return Contact.query.options(
+        joinedload(Contact.request).load_only(
+            LandingRequest.contact_name, LandingRequest.business_name),
+        joinedload(Contact.service).load_only(LandingService.title),
+    ).filter(Contact.request_id.in_(req_ids))\
+        .order_by(Contact.created_at.desc())\
+        .limit(limit).all()
+
+
+def upcoming_appointments(req_ids: list, limit: int = RECENT_LIMIT) -> list:
+    """Next appointments from today for *req_ids*, with their request already loaded."""
+    if not req_ids:
+        return []
+    return Appointment.query.options(
+        joinedload(Appointment.request).load_only(
+            LandingRequest.contact_name, LandingRequest.business_name),
+    ).filter(Appointment.landing_request_id.in_(req_ids))\
+        .filter(Appointment.date >= date.today())\
+        .order_by(Appointment.date, Appointment.time)\
+        .limit(limit).all()
+
+
+def dashboard_data(user_id: int) -> dict:
+    """Everything the dashboard template needs for *user_id*.
+
+    Costs one query for the request list, one for the recent contacts, one
+    for the upcoming appointments and, on a cache miss, one aggregate for all
+    the counters.
+    """
+    landing_requests = dashboard_landings_query(user_id).all()
+    req_ids = [r.id for r in landing_requests]
+    counters = cached_request_counters(user_id, req_ids)
+
+    def total(name):
+        return sum(c[name] for c in counters.values())
+
+    return {
+        'landing_requests': landing_requests,
+        'req_stats': counters,
+        'contacts_12m': total('contacts_12m'),
+        'contacts_total': total('contacts'),
+        'services_count': total('services'),
+        'appointments_total': total('appointments'),
+        'qr_count': len(landing_requests),
+        'recent_contacts': recent_contacts(req_ids),
+        'upcoming_appointments': upcoming_appointments(req_ids),
+    }
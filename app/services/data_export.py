@@ -0,0 +1,145 @@
+"""Streaming CSV / NDJSON downloads of orders, contacts and appointments.
+
+Rows are read as plain column tuples with ``yield_per``, so the ORM keeps
+no identity map and PostgreSQL uses a server-side cursor. They are
+encoded in small buffered chunks straight into a streaming Response. Memory
+stays flat however many rows are exported.
+
+Names, messages and notes come from visitors, so in CSV a text cell that a
+spreadsheet would evaluate as a formula is prefixed with ``'``.
+"""
+import csv
+import io
+import json
+
+from flask import Response, stream_with_context
+from sqlalchemy import select
+
+from app.extensions import db
+from app.models.appointment import Appointment
+from app.models.contact import Contact
+from app.models.landing import LandingRequest
+from app.models.landing_service import LandingService
+from app.models.user import User
+from app.services.landing_service import public_urls
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+# Rows fetched per round trip and encoded per response chunk
+YIELD_PER = 1000
+_SLUG_TOKEN = '__slug__'
+# First characters that make Excel / LibreOffice read a cell as a formula
+_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _stream(statement):
+    """Yield the rows of *statement* YIELD_PER at a time."""
+    result = db.session.execute(statement.execution_options(yield_per=YIELD_PER))
+    for partition in result.partitions():
+        yield from partition
+
+
+def _cell(value):
+    if value is None:
+        return ''
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
+def _csv_cell(value):
+    value = _cell(value)
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def encode_csv(header, rows):
+    """Yield CSV text chunks: the *header* row, then *rows*."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for i, row in enumerate(rows, 1):
+        writer.writerow([_csv_cell(value) for value in row])
+        if i % YIELD_PER == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def encode_ndjson(header, rows):
+    """Yield NDJSON chunks: one object per row, keyed by *header*."""
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(dict(zip(header, map(_cell, row))), ensure_ascii=False))
+        if len(lines) == YIELD_PER:
+            yield '\n'.join(lines) + '\n'
+            lines.clear()
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+_ENCODERS = {'csv': encode_csv, 'ndjson': encode_ndjson}
+
+
+def export_response(fmt: str, name: str, header, rows) -> Response:
+    """Streaming download of *rows* as ``<name>.<fmt>``. *fmt* must be in EXPORT_FORMATS."""
+    body = _ENCODERS[fmt](header, rows)
+    return Response(
+        stream_with_context(body),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={'Content-Disposition': f'attachment; filename="{name}.{fmt}"'},
+    )
+
+
+ORDER_COLUMNS = ('id', 'tipo', 'sector', 'negocio', 'contacto', 'cliente', 'fecha', 'enlace')
+
+
+def order_rows(filter_type: str = '', filter_sector: str = '', base_url: str = None):
+    """Yield admin order rows (ORDER_COLUMNS), newest first, with their public URL."""
+    prefix, _, suffix = public_urls([_SLUG_TOKEN], base_url)[0].rpartition(_SLUG_TOKEN)
+    statement = select(
+        LandingRequest.id, LandingRequest.landing_type, LandingRequest.sector,
+        LandingRequest.business_name, LandingRequest.contact_name, User.email,
+        LandingRequest.created_at, LandingRequest.public_slug,
+    ).outerjoin(User, LandingRequest.user_id == User.id)\
+        .order_by(LandingRequest.created_at.desc(), LandingRequest.id.desc())
+    if filter_type in ('b2b', 'b2c'):
+        statement = statement.where(LandingRequest.landing_type == filter_type)
+    if filter_sector:
+        statement = statement.where(LandingRequest.sector == filter_sector)
+    for *row, slug in _stream(statement):
+        yield (*row, prefix + slug + suffix)
+
+
+CONTACT_COLUMNS = ('fecha', 'perfil', 'nombre', 'email', 'telefono', 'servicio', 'mensaje')
+
+
+def contact_rows(user_id: int):
+    """Yield the contacts received on *user_id*'s profiles (CONTACT_COLUMNS), newest first."""
+    statement = select(
+        Contact.created_at, LandingRequest.business_name, Contact.name, Contact.email,
+        Contact.phone, LandingService.title, Contact.message,
+    ).join(LandingRequest, Contact.request_id == LandingRequest.id)\
+        .outerjoin(LandingService, Contact.service_id == LandingService.id)\
+        .where(LandingRequest.user_id == user_id)\
+        .order_by(Contact.created_at.desc(), Contact.id.desc())
+    return _stream(statement)
+
+
+APPOINTMENT_COLUMNS = ('fecha', 'hora', 'estado', 'perfil', 'nombre', 'email', 'telefono',
+                       'servicio', 'mensaje')
+
+
+def appointment_rows(user_id: int):
+    """Yield the appointments booked on *user_id*'s profiles (APPOINTMENT_COLUMNS), by date."""
+    statement = select(
+        Appointment.date, Appointment.time, Appointment.status, LandingRequest.business_name,
+        Appointment.name, Appointment.email, Appointment.phone, LandingService.title,
+        Appointment.message,
+    ).join(LandingRequest, Appointment.landing_request_id == LandingRequest.id)\
+        .outerjoin(LandingService, Appointment.service_id == LandingService.id)\
+        .where(LandingRequest.user_id == user_id)\
+        .order_by(Appointment.date, Appointment.time, Appointment.id)
+    return _stream(statement)
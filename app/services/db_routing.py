@@ -0,0 +1,96 @@
+"""Read-replica routing for ``db.session``.
+
+When ``SQLALCHEMY_BINDS`` has a ``replica`` bind (``DATABASE_REPLICA_URL``),
+the SELECTs of GET and HEAD requests go to the replica. Everything else
+goes to the primary:
+
+* flushes, INSERT/UPDATE/DELETE, raw SQL and ``SELECT ... FOR UPDATE``
+* every statement of POST and other unsafe requests
+* the rest of a request once its session has flushed
+* CLI commands and code outside a request
+
+Read-your-writes: a request that wrote marks the visitor's Flask session
+sticky for ``DB_REPLICA_STICKY_SECONDS``. During that window their GETs
+also read from the primary. A professional who saves a form and is
+redirected to the dashboard therefore sees the change, even while the
+replica lags.
+
+Without a ``replica`` bind, nothing changes.
+"""
+import time
+
+from flask import current_app, g, has_request_context, request, session
+from flask_sqlalchemy.session import Session as _FlaskSession
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+REPLICA = 'replica'
+SAFE_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS'))
+# Flask session key: until when (epoch seconds) this visitor reads from the primary
+_STICKY = '_db_primary_until'
+
+
+def _reads_from_replica(clause) -> bool:
+    return (getattr(clause, 'is_select', False)
+            and getattr(clause, '_for_update_arg', None) is None
+            and has_request_context() and g.get('db_read_replica', False))
+
+
+class RoutingSession(_FlaskSession):
+    """Flask-SQLAlchemy session that sends safe reads to the ``replica`` bind."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        engine = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+        if bind is None and not self._flushing and _reads_from_replica(clause):
+            engines = self._db.engines
+            if engine is engines[None] and REPLICA in engines:
+                return engines[REPLICA]
+        return engine
+
+
+def _start_request():
+    if REPLICA in current_app.config.get('SQLALCHEMY_BINDS', {}):
+        g.db_read_replica = (request.method in SAFE_METHODS
+                             and session.get(_STICKY, 0) < time.time())
+
+
+def _mark_sticky(response):
+    if g.pop('db_wrote', False) and REPLICA in current_app.config.get('SQLALCHEMY_BINDS', {}):
+        session[_STICKY] = time.time() + current_app.config.get('DB_REPLICA_STICKY_SECONDS', 5)
+    return response
+
+
+def _end_request(exc):
+    g.pop('db_read_replica', None)
+
+
+def _wrote():
+    if has_request_context():
+        g.db_wrote = True
+        g.db_read_replica = False
+
+
+def _after_flush(session, flush_context):
+    _wrote()
+
+
+def _do_orm_execute(state):
+    # Core-style DML through the session (bulk inserts, ON CONFLICT upserts) skips the flush
+    if state.is_insert or state.is_update or state.is_delete:
+        _wrote()
+
+
+_LISTENERS = (
+    ('after_flush', _after_flush),
+    ('do_orm_execute', _do_orm_execute),
+)
+
+
+def init_app(app) -> None:
+    """Install the per-request routing hooks."""
+    app.before_request(_start_request)
+    app.after_request(_mark_sticky)
+    app.teardown_request(_end_request)
+    for name, fn in _LISTENERS:
+        if not event.contains(Session, name, fn):
+            event.listen(Session, name, fn)
@@ -0,0 +1,178 @@
+"""Static export of public profile pages for serving without Python.
+
+``export_profiles`` writes, under the output directory::
+
+    p/<slug>.html      rendered landing/public_placeholder.html
+    qr/<slug>.png      the profile's QR image
+    assets/<name>      the pages' fingerprinted CSS/JS (see app/services/assets.py)
+    manifest.json      what was exported, used for incremental runs
+
+A front proxy can serve ``/p/<slug>``, ``/qr/<slug>.png`` and ``/assets/``
+from there and send only the contact and booking POSTs (and ``/csrf-token``)
+to Flask.
+Exported pages carry no CSRF token; a small script fetches one from
+``/csrf-token`` when the page loads. Flash messages after a POST are not
+shown on the static copy.
+
+A profile is re-rendered when its ``updated_at`` changed since the last run,
+when its QR file is missing, or, if it has a booking calendar, when it was
+exported on an earlier day (the calendar starts today). A profile listed in
+the manifest that no longer exists has its page and QR file removed.
+"""
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from flask import current_app
+from flask_wtf.csrf import generate_csrf
+
+from app.controllers.landing import render_public_profile
+from app.extensions import db
+from app.models.landing import LandingRequest
+from app.models.availability import Availability
+from app.models.qr_image import QrImage
+from app.services.assets import asset_bundle
+from app.services.page_cache import CSRF_PLACEHOLDER
+
+MANIFEST = 'manifest.json'
+CHUNK_SIZE = 50
+
+_CSRF_SCRIPT = (
+    "<script>fetch('/csrf-token',{credentials:'same-origin'})"
+    ".then(function(r){return r.json();}).then(function(d){"
+    "document.querySelectorAll('input[name=\"csrf_token\"]').forEach("
+    "function(i){i.value=d.csrf_token;});});</script>"
+)
+
+
+def _load_manifest(out_dir: str) -> dict:
+    try:
+        with open(os.path.join(out_dir, MANIFEST), encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _write_atomic(path: str, data, mode='w'):
+    tmp = path + '.tmp'
+    kwargs = {'encoding': 'utf-8'} if 'b' not in mode else {}
+    with open(tmp, mode, **kwargs) as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _stamp(value) -> str:
+    return value.isoformat() if value else ''
+
+
+def profiles_to_export(out_dir: str, force: bool = False) -> list:
+    """Return [(id, slug, stamp, has_agenda)] for the profiles that need rendering."""
+    manifest = {} if force else _load_manifest(out_dir)
+    today = date.today().isoformat()
+    with_agenda = {rid for (rid,) in db.session.query(Availability.landing_request_id).distinct()}
+    rows = db.session.query(LandingRequest.id, LandingRequest.public_slug,
+                            LandingRequest.updated_at, LandingRequest.qr_hash).all()
+    pending = []
+    for rid, slug, updated_at, qr_hash in rows:
+        stamp = _stamp(updated_at)
+        has_agenda = rid in with_agenda
+        previous = manifest.get(slug)
+        stale = (
+            previous is None
+            or previous['updated_at'] != stamp
+            or (has_agenda and previous['exported_on'] != today)
+            or (qr_hash and not os.path.exists(os.path.join(out_dir, 'qr', f'{slug}.png')))
+        )
+        if stale:
+            pending.append((rid, slug, stamp, has_agenda))
+    return pending
+
+
+def remove_deleted(out_dir: str, manifest: dict) -> list:
+    """Delete the files of *manifest* slugs whose profile is gone and drop their entries.
+
+    Returns the removed slugs.
+    """
+    existing = {slug for (slug,) in db.session.query(LandingRequest.public_slug)}
+    gone = sorted(slug for slug in manifest if slug not in existing)
+    for slug in gone:
+        for path in (os.path.join(out_dir, 'p', f'{slug}.html'),
+                     os.path.join(out_dir, 'qr', f'{slug}.png')):
+            if os.path.exists(path):
+                os.remove(path)
+        del manifest[slug]
+    return gone
+
+
+def render_static_profile(req) -> str:
+    """Render *req*'s public page as shareable HTML (no session-bound CSRF token)."""
+    with current_app.test_request_context(f'/p/{req.public_slug}'):
+        html = render_public_profile(req)
+        if current_app.config.get('WTF_CSRF_ENABLED', True):
+            html = html.replace(generate_csrf(), CSRF_PLACEHOLDER)
+            html = html.replace('</body>', _CSRF_SCRIPT + '\n</body>', 1)
+    return html
+
+
+def export_chunk(ids: list, out_dir: str) -> int:
+    """Render and write the profiles in *ids*. Returns how many were written."""
+    reqs = LandingRequest.query.filter(LandingRequest.id.in_(ids)).all()
+    qr = dict(db.session.query(QrImage.sha256, QrImage.data).filter(
+        QrImage.sha256.in_([r.qr_hash for r in reqs if r.qr_hash])).all())
+    for req in reqs:
+        _write_atomic(os.path.join(out_dir, 'p', f'{req.public_slug}.html'),
+                      render_static_profile(req))
+        if req.qr_hash in qr:
+            _write_atomic(os.path.join(out_dir, 'qr', f'{req.public_slug}.png'),
+                          qr[req.qr_hash], mode='wb')
+    return len(reqs)
+
+
+# Process-pool workers build their own app once and reuse it for every chunk
+_worker_app = None
+
+
+def _init_worker(config_class):
+    global _worker_app
+    from app import create_app
+    _worker_app = create_app(config_class)
+
+
+def _export_chunk_in_worker(ids, out_dir):
+    with _worker_app.app_context():
+        return export_chunk(ids, out_dir)
+
+
+def export_profiles(out_dir: str, config_class=None, workers: int = 1,
+                    force: bool = False, chunk_size: int = CHUNK_SIZE) -> int:
+    """Export every changed profile to *out_dir*. Returns how many were rendered.
+
+    With ``workers > 1`` chunks are rendered by a process pool, each worker
+    building its app from *config_class* (required in that case).
+    """
+    os.makedirs(os.path.join(out_dir, 'p'), exist_ok=True)
+    os.makedirs(os.path.join(out_dir, 'qr'), exist_ok=True)
+    # Old bundles are kept, so pages rendered by earlier runs still find theirs
+    asset_bundle().write(os.path.join(out_dir, 'assets'))
+
+    pending = profiles_to_export(out_dir, force=force)
+    ids = [rid for rid, *_ in pending]
+    chunks = [ids[i:i + chunk_size] for i in range(0, len(ids), chunk_size)]
+
+    if workers > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(config_class,)) as pool:
+            done = sum(pool.map(_export_chunk_in_worker, chunks, [out_dir] * len(chunks)))
+    else:
+        done = sum(export_chunk(chunk, out_dir) for chunk in chunks)
+
+    manifest = _load_manifest(out_dir)
+    remove_deleted(out_dir, manifest)
+    if force:
+        manifest = {}
+    today = date.today().isoformat()
+    for _, slug, stamp, has_agenda in pending:
+        manifest[slug] = {'updated_at': stamp, 'exported_on': today, 'agenda': has_agenda}
+    _write_atomic(os.path.join(out_dir, MANIFEST), json.dumps(manifest, indent=1, sort_keys=True))
+    return done
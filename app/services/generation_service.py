@@ -0,0 +1,201 @@
+"""Background generation of ``LandingRequest.generated_html``.
+
+``landing.create`` only enqueues a :class:`GenerationJob`; one or more
+``flask generation-worker`` processes claim jobs from that table, run the
+configured generator and store its HTML. No broker is needed: workers
+claim the oldest pending row with a conditional UPDATE, so adding workers
+adds throughput.
+
+A generator is any callable ``generator(req) -> str`` that receives the
+LandingRequest (with ``generated_prompt`` loaded). ``LANDING_GENERATOR``
+names it as ``'package.module:attribute'``. The default,
+:func:`offline_generator`, renders a plain deterministic card without
+calling any external service.
+"""
+import os
+import socket
+import time
+from datetime import datetime, timedelta, timezone
+from importlib import import_module
+from multiprocessing import Process
+
+from flask import current_app
+from markupsafe import escape
+from sqlalchemy import case
+from sqlalchemy.orm import undefer_group
+
+from app.extensions import db
+from app.models.generation_job import GenerationJob
+from app.models.landing import LandingRequest
+from app.services.sectors import sector_registry
+
+MAX_ATTEMPTS = 3
+# A running job older than this belongs to a dead worker and is retried
+STALE_AFTER = timedelta(minutes=10)
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def offline_generator(req) -> str:
+    """Deterministic card HTML built from the request's own fields."""
+    theme = sector_registry().get_or_default(req.sector)
+    services = ''.join(
+        f'<li><strong>{escape(s.title)}</strong>'
+        + (f' — {escape(s.description)}' if s.description else '') + '</li>'
+        for s in req.services
+    )
+    contact = ''.join(
+        f'<p>{escape(value)}</p>' for value in (req.phone, req.email, req.website) if value
+    )
+    return (
+        '<!DOCTYPE html><html lang="es"><head><meta charset="utf-8">'
+        '<meta name="viewport" content="width=device-width, initial-scale=1">'
+        f'<title>{escape(req.business_name)}</title></head>'
+        f'<body style="font-family:sans-serif;background:{theme.bg};margin:0;padding:2rem;">'
+        f'<main style="max-width:32rem;margin:auto;background:#fff;border-radius:1rem;'
+        f'padding:2rem;border-top:6px solid {theme.primary};">'
+        f'<p>{theme.icon} {escape(theme.community)}</p>'
+        f'<h1 style="color:{theme.primary};">{escape(req.contact_name or req.business_name)}</h1>'
+        f'{contact}<ul>{services}</ul></main></body></html>'
+    )
+
+
+def load_generator(spec: str = None):
+    """Import the generator named by *spec* (default: ``LANDING_GENERATOR``)."""
+    spec = spec or current_app.config.get(
+        'LANDING_GENERATOR', 'app.services.generation_service:offline_generator')
+    module, _, attr = spec.partition(':')
+    return getattr(import_module(module), attr)
+
+
+def enqueue_generation(req) -> GenerationJob:
+    """Queue HTML generation for *req*. The caller commits."""
+    job = GenerationJob(request=req)
+    db.session.add(job)
+    return job
+
+
+def latest_job(req_id: int):
+    """The most recent GenerationJob of request *req_id*, or None."""
+    return GenerationJob.query.filter_by(landing_request_id=req_id)\
+        .order_by(GenerationJob.id.desc()).first()
+
+
+def claim_next_job(worker: str):
+    """Mark the oldest pending job as running for *worker* and return its id.
+
+    Returns None when the queue is empty. If another worker claims the same
+    row first, the UPDATE matches nothing and the next row is tried.
+    """
+    while True:
+        job_id = db.session.query(GenerationJob.id).filter_by(status='pending')\
+            .order_by(GenerationJob.id).limit(1).scalar()
+        if job_id is None:
+            db.session.commit()
+            return None
+        claimed = GenerationJob.query.filter_by(id=job_id, status='pending').update({
+            'status': 'running',
+            'worker': worker,
+            'started_at': _now(),
+            'attempts': GenerationJob.attempts + 1,
+        }, synchronize_session=False)
+        db.session.commit()
+        if claimed:
+            return job_id
+
+
+def run_job(job_id: int, generator) -> str:
+    """Generate and store the HTML for job *job_id*. Returns the job's new status.
+
+    A failing generator puts the job back to pending until it has been
+    tried MAX_ATTEMPTS times; then it stays failed with the error message.
+    """
+    job = db.session.get(GenerationJob, job_id)
+    req = LandingRequest.query.options(undefer_group('content'))\
+        .filter_by(id=job.landing_request_id).one()
+    try:
+        html = generator(req)
+    except Exception as exc:
+        db.session.rollback()
+        job = db.session.get(GenerationJob, job_id)
+        job.status = 'failed' if job.attempts >= MAX_ATTEMPTS else 'pending'
+        job.error = f'{type(exc).__name__}: {exc}'
+        job.worker = None
+        db.session.commit()
+        current_app.logger.warning('Generation job %s failed (attempt %s): %s',
+                                   job_id, job.attempts, job.error)
+        return job.status
+
+    req.generated_html = html
+    job.status = 'done'
+    job.error = None
+    job.finished_at = _now()
+    db.session.commit()
+    return job.status
+
+
+def requeue_stale(older_than: timedelta = STALE_AFTER) -> int:
+    """Put running jobs whose worker died back in the queue. Returns how many.
+
+    A job that has already been tried MAX_ATTEMPTS times is marked failed
+    instead, so one that keeps killing its worker (OOM, segfault) is not
+    retried forever.
+    """
+    exhausted = GenerationJob.attempts >= MAX_ATTEMPTS
+    count = GenerationJob.query.filter(
+        GenerationJob.status == 'running',
+        GenerationJob.started_at < _now() - older_than,
+    ).update({
+        'status': case((exhausted, 'failed'), else_='pending'),
+        'error': case((exhausted, 'WorkerLost: the worker stopped while running the job'),
+                      else_=GenerationJob.error),
+        'worker': None,
+    }, synchronize_session=False)
+    db.session.commit()
+    return count
+
+
+def work(worker: str = None, generator=None, once: bool = False,
+         poll_interval: float = 1.0, max_jobs: int = None) -> int:
+    """Process jobs until the queue is empty (*once*) or forever.
+
+    Returns how many jobs were run. Needs an app context.
+    """
+    worker = worker or f'{socket.gethostname()}:{os.getpid()}'
+    generator = generator or load_generator()
+    done = 0
+    requeue_stale()
+    while max_jobs is None or done < max_jobs:
+        job_id = claim_next_job(worker)
+        if job_id is None:
+            if once:
+                break
+            time.sleep(poll_interval)
+            requeue_stale()
+            continue
+        run_job(job_id, generator)
+        done += 1
+    return done
+
+
+def _worker_main(config_class, once, poll_interval):
+    from app import create_app
+    app = create_app(config_class)
+    with app.app_context():
+        work(once=once, poll_interval=poll_interval)
+
+
+def run_workers(config_class, workers: int = 1, once: bool = False,
+                poll_interval: float = 1.0) -> None:
+    """Run *workers* worker processes, each with its own app, and wait for them."""
+    if workers <= 1:
+        _worker_main(config_class, once, poll_interval)
+        return
+    processes = [Process(target=_worker_main, args=(config_class, once, poll_interval))
+                 for _ in range(workers)]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
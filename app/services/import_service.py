@@ -0,0 +1,185 @@
+"""Bulk import of professionals from CSV (``flask import-landings``, /admin/importar).
+
+Each row is a ``/comenzar`` submission: it is validated by
+:class:`~app.forms.landing.LandingForm` and stored the same way as
+``landing.create``, with its services, QR, prompt and generation job.
+Instead of one flush and commit per profile, valid rows are written
+*batch_size* at a time. Each batch gets one process-pool QR run, one
+multi-row INSERT per table and one commit.
+
+Columns are the form's field names: ``sector``, ``contact_name``,
+``phone``, ``email``, ``website`` and ``service_<n>_title`` /
+``service_<n>_description`` for n = 1..3. Imported profiles have no owner;
+professionals claim them by email when they register.
+
+The whole file is decoded and parsed before the first batch is written, so
+a file that is not UTF-8 or has broken quoting is rejected with
+:class:`ImportFormatError` instead of being imported halfway.
+"""
+import csv
+import io
+from collections import Counter
+from datetime import datetime, timezone
+from operator import itemgetter
+from typing import NamedTuple
+
+from flask import current_app
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from werkzeug.datastructures import MultiDict
+
+from app.extensions import db
+from app.forms.landing import LandingForm
+from app.models.generation_job import GenerationJob
+from app.models.landing import LandingRequest, generate_slug
+from app.models.landing_service import LandingService
+from app.services.landing_service import (
+    QrOptions, build_prompt, generate_qr_batch, public_urls, store_qr_pngs,
+)
+from app.services.stats_service import record
+
+IMPORT_BATCH_SIZE = 500
+REQUIRED_COLUMNS = ('sector', 'contact_name', 'phone')
+SERVICE_SLOTS = 3
+DUPLICATE_SLUG = 'Enlace público repetido; el lote se ha descartado, vuelve a importar la fila.'
+
+
+class ImportFormatError(ValueError):
+    """The file is not a CSV with the expected columns."""
+
+
+class ImportReport(NamedTuple):
+    created: int
+    # [(CSV row number, {field: [messages]})]
+    errors: list
+
+
+def read_csv(stream) -> list:
+    """Rows of a binary or text CSV *stream* as dicts, checking the header row.
+
+    Raises ImportFormatError when the file is not UTF-8, its quoting is
+    malformed or a required column is missing.
+    """
+    data = stream.read()
+    if isinstance(data, bytes):
+        try:
+            data = data.decode('utf-8-sig')
+        except UnicodeDecodeError:
+            raise ImportFormatError('El archivo no está codificado en UTF-8') from None
+    reader = csv.DictReader(io.StringIO(data, newline=''), strict=True)
+    try:
+        missing = [c for c in REQUIRED_COLUMNS if c not in (reader.fieldnames or ())]
+        if missing:
+            raise ImportFormatError(f'Faltan columnas: {", ".join(missing)}')
+        return list(reader)
+    except csv.Error as exc:
+        raise ImportFormatError(f'CSV mal formado en la línea {reader.line_num}: {exc}') from None
+
+
+def validate_row(row: dict):
+    """Return ``(form, None)`` for a valid row or ``(None, errors)``."""
+    data = MultiDict((k, (v or '').strip()) for k, v in row.items() if k)
+    form = LandingForm(formdata=data, meta={'csrf': False})
+    if form.validate():
+        return form, None
+    return None, form.errors
+
+
+def _services(form) -> list:
+    services = []
+    for i in range(SERVICE_SLOTS):
+        title = getattr(form, f'service_{i + 1}_title').data
+        desc = getattr(form, f'service_{i + 1}_description').data
+        if title and title.strip():
+            services.append(LandingService(title=title.strip(),
+                                           description=desc.strip() if desc else None, order=i))
+    return services
+
+
+def _insert_batch(forms: list, base_url: str, workers: int, options: QrOptions) -> int:
+    now = datetime.now(timezone.utc)
+    reqs, services = [], []
+    for form in forms:
+        reqs.append(LandingRequest(
+            public_slug=generate_slug(),
+            landing_type='b2b',
+            sector=form.sector.data,
+            business_name=form.contact_name.data,
+            description='',
+            location='',
+            contact_name=form.contact_name.data,
+            phone=form.phone.data,
+            email=form.email.data or None,
+            website=form.website.data or None,
+            created_at=now,
+            updated_at=now,
+        ))
+        services.append(_services(form))
+
+    slugs = [r.public_slug for r in reqs]
+    pngs = generate_qr_batch(public_urls(slugs, base_url), workers=workers, options=options)
+    for req, digest, saved in zip(reqs, store_qr_pngs(pngs), services):
+        req.qr_hash = digest
+        req.generated_prompt = build_prompt(req, saved)
+    db.session.flush()  # new QrImage rows before the requests that reference them
+
+    columns = ('public_slug', 'landing_type', 'sector', 'business_name', 'description',
+               'location', 'contact_name', 'phone', 'email', 'website', 'qr_hash',
+               'generated_prompt', 'created_at', 'updated_at')
+    ids = db.session.scalars(
+        insert(LandingRequest).returning(LandingRequest.id, sort_by_parameter_order=True),
+        [{c: getattr(r, c) for c in columns} for r in reqs],
+    ).all()
+    service_rows = [
+        {'request_id': rid, 'title': s.title, 'description': s.description, 'order': s.order}
+        for rid, saved in zip(ids, services) for s in saved
+    ]
+    if service_rows:
+        db.session.execute(insert(LandingService), service_rows)
+    db.session.execute(insert(GenerationJob),
+                       [{'landing_request_id': rid, 'created_at': now} for rid in ids])
+
+    # Core inserts skip the flush hook that keeps daily_stat current
+    record(db.session.connection(), Counter(
+        (now.date(), 'requests', f'b2b:{r.sector}') for r in reqs))
+    db.session.commit()
+    return len(ids)
+
+
+def import_landings(rows, base_url: str = None, workers: int = 1,
+                    batch_size: int = IMPORT_BATCH_SIZE) -> ImportReport:
+    """Validate and store every row of *rows* (dicts, e.g. from :func:`read_csv`).
+
+    Invalid rows are skipped and reported with their row number (the header
+    is row 1). Each batch is committed on its own, so a crash keeps the
+    batches already written; a batch that hits a duplicate public slug is
+    rolled back and its rows reported. QR codes point at *base_url*
+    (default: the app's SERVER_NAME) and are rendered by *workers*
+    processes. Raises ValueError, before anything is stored, when neither
+    is set.
+    """
+    if not base_url and not current_app.config.get('SERVER_NAME'):
+        raise ValueError('Indica la URL pública del sitio o configura SERVER_NAME')
+    options = QrOptions.from_config(current_app.config)
+    created, errors, batch = 0, [], []
+
+    def flush_batch():
+        try:
+            return _insert_batch([form for _, form in batch], base_url, workers, options)
+        except IntegrityError:
+            db.session.rollback()
+            errors.extend((number, {'public_slug': [DUPLICATE_SLUG]}) for number, _ in batch)
+            return 0
+
+    for number, row in enumerate(rows, 2):
+        form, row_errors = validate_row(row)
+        if row_errors:
+            errors.append((number, row_errors))
+            continue
+        batch.append((number, form))
+        if len(batch) == batch_size:
+            created += flush_batch()
+            batch = []
+    if batch:
+        created += flush_batch()
+    return ImportReport(created, sorted(errors, key=itemgetter(0)))
@@ -1,19 +1,219 @@
 """Business logic for LandingRequest creation and management."""
 import io
-import os
 import base64
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from functools import lru_cache, partial
+from typing import NamedTuple
 
 import qrcode
+from qrcode.image.svg import SvgPathImage
+from flask import current_app, url_for
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import joinedload, load_only
 
-_SECTORS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'sectors')
+from app.extensions import db
+from app.models.landing import LandingRequest
+from app.models.qr_image import QrImage
+from app.models.user import User
+from app.services.cache import MISS, app_cache
+from app.services.sectors import sector_registry
+
+# URLs handed to each process-pool worker at a time by generate_qr_batch
+QR_CHUNK_SIZE = 32
+# Rendered QR codes kept in memory per process, keyed on (url, options)
+QR_MEMO_SIZE = 1024
+
+_ERROR_CORRECTION = {
+    'L': qrcode.constants.ERROR_CORRECT_L,
+    'M': qrcode.constants.ERROR_CORRECT_M,
+    'Q': qrcode.constants.ERROR_CORRECT_Q,
+    'H': qrcode.constants.ERROR_CORRECT_H,
+}
+
+# format -> mimetype. 'png-optimized' is the same 1-bit image as 'png',
+# written with maximum zlib compression.
+QR_FORMATS = {
+    'png': 'image/png',
+    'png-optimized': 'image/png',
+    'svg': 'image/svg+xml',
+}
+
+
+class QrOptions(NamedTuple):
+    """How a QR code is rendered. The defaults match ``qrcode.make``."""
+    error_correction: str = 'M'
+    box_size: int = 10
+    border: int = 4
+    format: str = 'png'
+
+    @classmethod
+    def from_config(cls, config) -> 'QrOptions':
+        """Options from the ``QR_*`` settings of *config*."""
+        return cls(
+            error_correction=config.get('QR_ERROR_CORRECTION', 'M'),
+            box_size=config.get('QR_BOX_SIZE', 10),
+            border=config.get('QR_BORDER', 4),
+            format=config.get('QR_FORMAT', 'png'),
+        )
+
+    @property
+    def mimetype(self) -> str:
+        return QR_FORMATS[self.format]
+
+
+DEFAULT_QR_OPTIONS = QrOptions()
+
+
+@lru_cache(maxsize=QR_MEMO_SIZE)
+def render_qr(url: str, options: QrOptions = DEFAULT_QR_OPTIONS) -> bytes:
+    """Render the QR code for *url* in ``options.format`` and return its bytes.
+
+    Results are memoized, so rendering the same public URL again is free.
+    """
+    if options.format not in QR_FORMATS:
+        raise ValueError(f'Unknown QR format: {options.format!r}')
+    qr = qrcode.QRCode(error_correction=_ERROR_CORRECTION[options.error_correction],
+                       box_size=options.box_size, border=options.border)
+    qr.add_data(url)
+    qr.make(fit=True)
+    buf = io.BytesIO()
+    if options.format == 'svg':
+        qr.make_image(image_factory=SvgPathImage).save(buf)
+    else:
+        qr.make_image().save(buf, format='PNG', optimize=options.format == 'png-optimized')
+    return buf.getvalue()
+
+
+def generate_qr_png(url: str, options: QrOptions = None) -> bytes:
+    """Generate a QR code for *url* and return the raw PNG bytes."""
+    options = options or DEFAULT_QR_OPTIONS
+    if options.mimetype != 'image/png':
+        raise ValueError(f'Not a PNG format: {options.format!r}')
+    return render_qr(url, options)
 
 
 def generate_qr(url: str) -> str:
     """Generate a QR code for *url* and return it as a base64-encoded PNG string."""
-    img = qrcode.make(url)
-    buf = io.BytesIO()
-    img.save(buf, format='PNG')
-    return base64.b64encode(buf.getvalue()).decode('utf-8')
+    return base64.b64encode(generate_qr_png(url)).decode('utf-8')
+
+
+def store_qr_png(png: bytes) -> str:
+    """Add *png* to the content-addressed QR store and return its SHA-256 hex digest.
+
+    The image is only inserted if no row with the same digest exists yet.
+    The caller is responsible for committing the session.
+    """
+    digest = hashlib.sha256(png).hexdigest()
+    if db.session.get(QrImage, digest) is None:
+        db.session.add(QrImage(sha256=digest, data=png))
+    return digest
+
+
+def generate_qr_batch(urls, workers: int = 1, chunk_size: int = QR_CHUNK_SIZE,
+                      options: QrOptions = None) -> list:
+    """Generate the PNG for every URL in *urls* and return them in the same order.
+
+    With ``workers > 1`` the URLs are split into chunks of *chunk_size* and
+    rendered by a process pool; QR encoding is CPU-bound, so threads would
+    not help.
+    """
+    urls = list(urls)
+    render = partial(generate_qr_png, options=options)
+    if workers <= 1 or len(urls) <= chunk_size:
+        return [render(url) for url in urls]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(render, urls, chunksize=chunk_size))
+
+
+def store_qr_pngs(pngs) -> list:
+    """Batch version of :func:`store_qr_png`: one lookup for all digests.
+
+    Returns the digests in the order of *pngs*. The caller commits.
+    """
+    by_digest = {hashlib.sha256(png).hexdigest(): png for png in pngs}
+    existing = {d for (d,) in db.session.query(QrImage.sha256)
+                .filter(QrImage.sha256.in_(list(by_digest)))}
+    db.session.add_all(QrImage(sha256=d, data=png)
+                       for d, png in by_digest.items() if d not in existing)
+    return [hashlib.sha256(png).hexdigest() for png in pngs]
+
+
+def public_urls(slugs, base_url: str = None) -> list:
+    """Absolute ``/p/<slug>`` URLs for *slugs*, on *base_url* or else on ``SERVER_NAME``.
+
+    Raises ValueError when neither is set: outside a request, url_for would
+    silently build ``http://localhost/...`` links.
+    """
+    if not base_url and not current_app.config.get('SERVER_NAME'):
+        raise ValueError('Indica la URL pública del sitio o configura SERVER_NAME')
+    with current_app.test_request_context():
+        if base_url:
+            root = base_url.rstrip('/')
+            return [root + url_for('landing.public_view', slug=slug) for slug in slugs]
+        return [url_for('landing.public_view', slug=slug, _external=True) for slug in slugs]
+
+
+def regenerate_qr_codes(base_url: str = None, slugs=None, workers: int = 1,
+                        batch_size: int = 500) -> int:
+    """(Re)generate the QR of every profile (or only *slugs*) pointing at *base_url*.
+
+    Without *base_url* the codes point at ``SERVER_NAME``, and ValueError is
+    raised when that is not configured either.
+
+    Profiles are processed *batch_size* at a time: one process-pool run,
+    one store and one commit per batch. Profiles whose QR does not change
+    are left untouched, so their ``updated_at`` (and static export) stays
+    as it is. Returns how many profiles got a new QR.
+    """
+    query = db.session.query(LandingRequest.id, LandingRequest.public_slug,
+                             LandingRequest.qr_hash).order_by(LandingRequest.id)
+    if slugs is not None:
+        query = query.filter(LandingRequest.public_slug.in_(list(slugs)))
+    rows = query.all()
+    options = QrOptions.from_config(current_app.config)
+
+    changed = 0
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        pngs = generate_qr_batch(public_urls([slug for _, slug, _ in batch], base_url),
+                                 workers=workers, options=options)
+        now = datetime.now(timezone.utc)
+        updates = [
+            {'id': rid, 'qr_hash': digest, 'updated_at': now}
+            for (rid, _, old), digest in zip(batch, store_qr_pngs(pngs))
+            if digest != old
+        ]
+        if updates:
+            db.session.execute(update(LandingRequest), updates)
+        db.session.commit()
+        changed += len(updates)
+    return changed
+
+
+def prune_qr_images() -> int:
+    """Delete the stored QR images no profile points at. Returns how many.
+
+    A regenerate or a deleted profile leaves the old images behind; nothing
+    else removes them from the content-addressed store. The caller commits.
+    """
+    in_use = select(LandingRequest.qr_hash).where(LandingRequest.qr_hash.isnot(None))
+    return db.session.execute(
+        delete(QrImage).where(QrImage.sha256.not_in(in_use))
+    ).rowcount
+
+
+def attach_qr(req, url: str) -> str:
+    """Generate the QR for *url*, store it and point *req* at it. Returns the digest."""
+    options = QrOptions.from_config(current_app.config)
+    req.qr_hash = store_qr_png(generate_qr_png(url, options))
+    return req.qr_hash
+
+
+def touch_profile(req) -> None:
+    """Mark *req*'s public page as changed (for the incremental static export)."""
+    req.updated_at = datetime.now(timezone.utc)
 
 
 def build_prompt(req, services: list) -> str:
@@ -25,11 +225,8 @@ def build_prompt(req, services: list) -> str:
 
     Returns an empty string if the sector template is not found.
     """
-    prompt_path = os.path.join(_SECTORS_DIR, req.sector, 'prompt.txt')
-    try:
-        with open(prompt_path, encoding='utf-8') as f:
-            template = f.read()
-    except FileNotFoundError:
+    sector = sector_registry().get(req.sector)
+    if sector is None:
         return ''
 
     # Build description from saved services when available
@@ -44,8 +241,185 @@ def build_prompt(req, services: list) -> str:
 
     ubicacion = req.location or req.website or ''
 
-    return template.format(
+    return sector.prompt.render(
         nombre=req.business_name or req.contact_name or '',
         descripcion=descripcion,
         ubicacion=ubicacion,
     )
+
+
+# ---------------------------------------------------------------------------
+# List-view projections
+#
+# Each helper loads only the columns its template renders. ``raiseload=True``
+# makes a template that starts using another column fail loudly in tests
+# instead of silently issuing one extra SELECT per row.
+# ---------------------------------------------------------------------------
+
+_ORDER_LIST_COLUMNS = (
+    LandingRequest.id,
+    LandingRequest.user_id,
+    LandingRequest.public_slug,
+    LandingRequest.landing_type,
+    LandingRequest.sector,
+    LandingRequest.business_name,
+    LandingRequest.contact_name,
+    LandingRequest.created_at,
+)
+
+_MY_LANDINGS_COLUMNS = (
+    LandingRequest.id,
+    LandingRequest.landing_type,
+    LandingRequest.sector,
+    LandingRequest.business_name,
+    LandingRequest.created_at,
+    LandingRequest.has_generated_html,
+)
+
+_DASHBOARD_COLUMNS = (
+    LandingRequest.id,
+    LandingRequest.public_slug,
+    LandingRequest.sector,
+    LandingRequest.business_name,
+    LandingRequest.contact_name,
+    LandingRequest.phone,
+    LandingRequest.email,
+    LandingRequest.website,
+    LandingRequest.created_at,
+)
+
+
+def admin_orders_query(filter_type: str = '', filter_sector: str = ''):
+    """Newest-first LandingRequest query for the admin order tables, with the owner's email."""
+    query = LandingRequest.query.options(
+        load_only(*_ORDER_LIST_COLUMNS, raiseload=True),
+        joinedload(LandingRequest.user).load_only(User.email, raiseload=True),
+    )
+    if filter_type in ('b2b', 'b2c'):
+        query = query.filter_by(landing_type=filter_type)
+    if filter_sector:
+        query = query.filter_by(sector=filter_sector)
+    return query.order_by(LandingRequest.created_at.desc())
+
+
+# ---------------------------------------------------------------------------
+# Keyset pagination for admin orders
+#
+# Pages are addressed by the (created_at, id) of a boundary row instead of an
+# OFFSET, so page 10 000 costs the same index seek as page 1. The cursor is
+# an opaque base64 token; a malformed one falls back to the first page.
+# ---------------------------------------------------------------------------
+
+class KeysetPage:
+    """One newest-first page of orders plus the cursors to its neighbours."""
+
+    def __init__(self, items: list, next_cursor: str = None, prev_cursor: str = None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self) -> bool:
+        return self.prev_cursor is not None
+
+
+def encode_cursor(direction: str, req) -> str:
+    """Token for the page after ('next') or before ('prev') *req*."""
+    raw = f'{direction}|{req.created_at.isoformat()}|{req.id}'
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: str) -> tuple:
+    """Return (direction, created_at, id) from *token*; ValueError if malformed."""
+    # binascii.Error and UnicodeDecodeError are ValueErrors too
+    raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode('utf-8')
+    direction, created_at, rid = raw.split('|')
+    if direction not in ('next', 'prev'):
+        raise ValueError(f'bad cursor direction: {direction!r}')
+    return direction, datetime.fromisoformat(created_at), int(rid)
+
+
+def keyset_admin_orders(cursor: str = None, per_page: int = 25,
+                        filter_type: str = '', filter_sector: str = '') -> KeysetPage:
+    """Page of :func:`admin_orders_query` after/before *cursor*, newest first."""
+    try:
+        direction, created_at, rid = decode_cursor(cursor) if cursor else ('next', None, None)
+    except ValueError:
+        direction, created_at, rid = 'next', None, None
+
+    query = admin_orders_query(filter_type, filter_sector).order_by(None)
+    key = db.tuple_(LandingRequest.created_at, LandingRequest.id)
+
+    if direction == 'prev':
+        rows = query.filter(key > db.tuple_(created_at, rid))\
+            .order_by(LandingRequest.created_at, LandingRequest.id)\
+            .limit(per_page + 1).all()
+        has_prev, has_next = len(rows) > per_page, True
+        rows = rows[:per_page][::-1]
+    else:
+        if rid is not None:
+            query = query.filter(key < db.tuple_(created_at, rid))
+        rows = query.order_by(LandingRequest.created_at.desc(), LandingRequest.id.desc())\
+            .limit(per_page + 1).all()
+        has_prev, has_next = rid is not None, len(rows) > per_page
+        rows = rows[:per_page]
+
+    if not rows:
+        return KeysetPage([])
+    return KeysetPage(
+        rows,
+        next_cursor=encode_cursor('next', rows[-1]) if has_next else None,
+        prev_cursor=encode_cursor('prev', rows[0]) if has_prev else None,
+    )
+
+
+def admin_orders_count(filter_type: str = '', filter_sector: str = '') -> int:
+    """Order total for the filters, cached for ``ADMIN_ORDERS_COUNT_TTL`` seconds."""
+    cache = app_cache('admin_orders_count_cache', 'ADMIN_ORDERS_COUNT_TTL', default_ttl=60)
+    key = (filter_type, filter_sector)
+    total = cache.get(key)
+    if total is MISS:
+        query = admin_orders_query(filter_type, filter_sector).order_by(None)
+        total = query.with_entities(db.func.count(LandingRequest.id)).scalar()
+        cache.set(key, total)
+    return total
+
+
+def my_landings_query(user_id: int):
+    """Newest-first LandingRequest query for the 'Mis landings' table."""
+    return LandingRequest.query.options(load_only(*_MY_LANDINGS_COLUMNS, raiseload=True))\
+        .filter_by(user_id=user_id)\
+        .order_by(LandingRequest.created_at.desc())
+
+
+def dashboard_landings_query(user_id: int):
+    """Newest-first LandingRequest query for the dashboard QR cards and completion steps."""
+    return LandingRequest.query.options(load_only(*_DASHBOARD_COLUMNS, raiseload=True))\
+        .filter_by(user_id=user_id)\
+        .order_by(LandingRequest.created_at.desc())
+
+
+# ---------------------------------------------------------------------------
+# Public profile loading
+#
+# Each public view declares the relationships it renders so they arrive with
+# the profile instead of as one lazy SELECT each. Use joinedload for a single
+# collection (same round-trip) and selectinload when a view needs several, to
+# avoid a row cross-product. Availability is left lazy on purpose: it is only
+# read when the cached booking calendar has to be rebuilt.
+# ---------------------------------------------------------------------------
+
+PROFILE_LOADERS = {
+    'public_view': (joinedload(LandingRequest.services),),
+    'contact': (joinedload(LandingRequest.services),),
+}
+
+
+def profile_by_slug_or_404(slug: str, view: str = None, **filters):
+    """Fetch the LandingRequest for *slug* with the relationships *view* needs."""
+    return LandingRequest.query.options(*PROFILE_LOADERS.get(view, ()))\
+        .filter_by(public_slug=slug, **filters).first_or_404()
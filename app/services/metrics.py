@@ -0,0 +1,184 @@
+"""Per-endpoint request and SQL metrics, exported in Prometheus text format.
+
+Each request is timed from ``before_request`` to ``after_request``. For a
+streamed export, that measures the time to the first byte. Each SQL
+statement is timed with the engine's ``before/after_cursor_execute``
+events. Measurements are grouped by endpoint name (``landing.public_view``,
+``dashboard.index``, ...), so label cardinality is bounded by the URL map.
+A 404 is grouped under ``<unmatched>``, and a method outside the standard
+HTTP set under ``OTHER``.
+
+Exposed at ``/admin/metrics``:
+
+* ``http_requests_total{endpoint,method,status}``
+* ``http_request_duration_seconds{endpoint}`` (histogram)
+* ``db_queries_total{endpoint}`` and ``db_query_duration_seconds_total{endpoint}``
+* ``db_slow_queries_total{endpoint}``
+
+Statements slower than ``SLOW_QUERY_MS`` are also logged as warnings on
+``app.services.metrics``, with their endpoint and SQL. Statements run
+outside a request (CLI, scripts) count under ``<none>``.
+
+The cost is a few ``perf_counter`` calls and dictionary updates under one
+lock per request and per statement, which is low enough to leave
+``METRICS_ENABLED`` on in production. Counters are per process. With
+several workers, scrape each one or aggregate them in Prometheus.
+"""
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+NO_REQUEST = '<none>'
+UNMATCHED = '<unmatched>'
+# Any other method sent by a client is counted as OTHER, so it cannot add label values
+METHODS = frozenset(('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS',
+                     'CONNECT', 'TRACE'))
+
+
+class Histogram:
+    __slots__ = ('counts', 'sum')
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # the last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.sum += value
+
+
+class Metrics:
+    """Thread-safe counters for one app."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = defaultdict(int)      # (endpoint, method, status) -> n
+        self.latency = defaultdict(Histogram)  # endpoint -> Histogram
+        self.queries = defaultdict(int)        # endpoint -> n
+        self.query_time = defaultdict(float)   # endpoint -> seconds
+        self.slow_queries = defaultdict(int)   # endpoint -> n
+
+    def record_request(self, endpoint: str, method: str, status: int, seconds: float):
+        with self._lock:
+            self.requests[(endpoint, method, status)] += 1
+            self.latency[endpoint].observe(seconds)
+
+    def record_query(self, endpoint: str, seconds: float, slow: bool):
+        with self._lock:
+            self.queries[endpoint] += 1
+            self.query_time[endpoint] += seconds
+            if slow:
+                self.slow_queries[endpoint] += 1
+
+    def render(self) -> str:
+        """Prometheus text exposition format, version 0.0.4."""
+        lines = []
+
+        def family(name, kind, doc):
+            lines.append(f'# HELP {name} {doc}')
+            lines.append(f'# TYPE {name} {kind}')
+
+        with self._lock:
+            family('http_requests_total', 'counter', 'Requests by endpoint, method and status.')
+            for (endpoint, method, status), n in sorted(self.requests.items()):
+                lines.append(f'http_requests_total{{endpoint="{endpoint}",method="{method}",'
+                             f'status="{status}"}} {n}')
+
+            family('http_request_duration_seconds', 'histogram', 'Request latency by endpoint.')
+            for endpoint, hist in sorted(self.latency.items()):
+                cumulative = 0
+                for bound, n in zip(BUCKETS + ('+Inf',), hist.counts):
+                    cumulative += n
+                    lines.append(f'http_request_duration_seconds_bucket{{endpoint="{endpoint}",'
+                                 f'le="{bound}"}} {cumulative}')
+                lines.append(f'http_request_duration_seconds_sum{{endpoint="{endpoint}"}} '
+                             f'{hist.sum:.6f}')
+                lines.append(f'http_request_duration_seconds_count{{endpoint="{endpoint}"}} '
+                             f'{cumulative}')
+
+            for name, kind, doc, values in (
+                ('db_queries_total', 'counter', 'SQL statements by endpoint.', self.queries),
+                ('db_query_duration_seconds_total', 'counter',
+                 'Time spent in SQL statements by endpoint.', self.query_time),
+                ('db_slow_queries_total', 'counter',
+                 'SQL statements slower than SLOW_QUERY_MS by endpoint.', self.slow_queries),
+            ):
+                family(name, kind, doc)
+                for endpoint, value in sorted(values.items()):
+                    value = f'{value:.6f}' if isinstance(value, float) else value
+                    lines.append(f'{name}{{endpoint="{endpoint}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def metrics() -> Metrics:
+    return current_app.extensions['metrics']
+
+
+def _endpoint() -> str:
+    if not has_request_context():
+        return NO_REQUEST
+    return request.endpoint or UNMATCHED
+
+
+def _start_request():
+    g.metrics_start = time.perf_counter()
+
+
+def _end_request(response):
+    start = g.pop('metrics_start', None)
+    if start is not None:
+        method = request.method if request.method in METHODS else 'OTHER'
+        metrics().record_request(_endpoint(), method, response.status_code,
+                                 time.perf_counter() - start)
+    return response
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('metrics_query_start', []).append(time.perf_counter())
+
+
+def _on_error(context):
+    # A failed statement never reaches after_cursor_execute
+    if context.connection is not None and context.connection.info.get('metrics_query_start'):
+        context.connection.info['metrics_query_start'].pop()
+
+
+def _make_after_cursor_execute(app):
+    registry = app.extensions['metrics']
+    threshold = app.config.get('SLOW_QUERY_MS', 200) / 1000
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['metrics_query_start'].pop()
+        endpoint = _endpoint()
+        slow = elapsed >= threshold
+        registry.record_query(endpoint, elapsed, slow)
+        if slow:
+            logger.warning('slow query (%.0f ms) in %s: %s', elapsed * 1000, endpoint,
+                           ' '.join(statement.split()))
+
+    return after_cursor_execute
+
+
+def init_app(app) -> None:
+    """Time requests and the SQL of every engine of *app*."""
+    if not app.config.get('METRICS_ENABLED', True):
+        return
+    app.extensions['metrics'] = Metrics()
+    app.before_request(_start_request)
+    app.after_request(_end_request)
+    after_cursor_execute = _make_after_cursor_execute(app)
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', after_cursor_execute)
+            event.listen(engine, 'handle_error', _on_error)
@@ -0,0 +1,194 @@
+"""Rendered-HTML cache for public profile pages (``/p/<slug>``).
+
+Pages are stored per slug with the CSRF token replaced by a placeholder, so
+one cached copy can be served to every visitor: the current session's token
+is injected back on each hit. Requests with pending flash messages bypass
+the cache, since those messages are rendered into the page.
+
+Entries are tagged with the day they were rendered because the page embeds
+the booking calendar, which starts today.
+
+Backends are chosen with ``PAGE_CACHE_BACKEND``:
+
+* ``memory`` (default) — per-process LRU, see :class:`~app.services.cache.TTLCache`.
+* ``file`` — one file per slug under ``PAGE_CACHE_DIR``, shared by every
+  worker on the host.
+* ``redis`` — any Redis-compatible server at ``PAGE_CACHE_REDIS_URL``;
+  needs the optional ``redis`` package.
+* ``none`` — disabled.
+"""
+import hashlib
+import os
+import tempfile
+import time
+from datetime import date
+from functools import wraps
+
+from flask import current_app, make_response, session
+from flask_wtf.csrf import generate_csrf
+
+from app.extensions import db
+from app.models.landing import LandingRequest
+from app.services.assets import asset_bundle
+from app.services.cache import MISS, TTLCache
+
+CSRF_PLACEHOLDER = '__PAGE_CACHE_CSRF_TOKEN__'
+
+
+class MemoryPageCache:
+    """Per-process backend on top of TTLCache."""
+
+    def __init__(self, ttl: float, max_entries: int = 1024):
+        self._cache = TTLCache(ttl=ttl, max_entries=max_entries)
+
+    def get(self, key: str):
+        value = self._cache.get(key)
+        return None if value is MISS else value
+
+    def set(self, key: str, value: str):
+        self._cache.set(key, value)
+
+    def delete(self, key: str):
+        self._cache.delete(key)
+
+
+class FilePageCache:
+    """Backend storing each entry as a file; the first line holds its expiry time."""
+
+    def __init__(self, directory: str, ttl: float):
+        self.directory = directory
+        self.ttl = ttl
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+    def get(self, key: str):
+        try:
+            with open(self._path(key), encoding='utf-8') as f:
+                expires = float(f.readline())
+                if expires < time.time():
+                    return None
+                return f.read()
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def set(self, key: str, value: str):
+        # Write to a temp file and rename so readers never see a partial page
+        fd, tmp = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(f'{time.time() + self.ttl}\n')
+            f.write(value)
+        os.replace(tmp, self._path(key))
+
+    def delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+class RedisPageCache:
+    """Backend for any server speaking the Redis protocol."""
+
+    def __init__(self, url: str, ttl: float, prefix: str = 'pagecache:'):
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError(
+                "PAGE_CACHE_BACKEND='redis' requires the 'redis' package"
+            ) from exc
+        self._client = redis.Redis.from_url(url)
+        self.ttl = int(ttl)
+        self.prefix = prefix
+
+    def get(self, key: str):
+        value = self._client.get(self.prefix + key)
+        return value.decode('utf-8') if value is not None else None
+
+    def set(self, key: str, value: str):
+        self._client.set(self.prefix + key, value.encode('utf-8'), ex=self.ttl)
+
+    def delete(self, key: str):
+        self._client.delete(self.prefix + key)
+
+
+def _create_backend(config):
+    backend = config.get('PAGE_CACHE_BACKEND', 'memory')
+    ttl = config.get('PAGE_CACHE_TTL', 300)
+    if backend == 'memory':
+        return MemoryPageCache(ttl)
+    if backend == 'file':
+        return FilePageCache(config['PAGE_CACHE_DIR'], ttl)
+    if backend == 'redis':
+        return RedisPageCache(config['PAGE_CACHE_REDIS_URL'], ttl)
+    if backend == 'none':
+        return None
+    raise ValueError(f'Unknown PAGE_CACHE_BACKEND: {backend!r}')
+
+
+def _backend():
+    ext = current_app.extensions
+    if 'page_cache' not in ext:
+        ext['page_cache'] = _create_backend(current_app.config)
+    return ext['page_cache']
+
+
+def _key(slug: str) -> str:
+    # Pages link fingerprinted assets; a deploy that changes them starts a new keyspace
+    return f'p:{asset_bundle().version}:{slug}'
+
+
+def _csrf_enabled() -> bool:
+    return current_app.config.get('WTF_CSRF_ENABLED', True)
+
+
+def page_cached(view):
+    """Serve the decorated ``view(slug)`` from the page cache when possible.
+
+    A request with pending flash messages always renders, and its page is not
+    stored. Only successful HTML string results are cached.
+    """
+    @wraps(view)
+    def decorated(slug):
+        backend = _backend()
+        if backend is None or '_flashes' in session:
+            return view(slug)
+
+        key = _key(slug)
+        today = date.today().isoformat()
+        value = backend.get(key)
+        if value is not None:
+            day, _, html = value.partition('\n')
+            if day == today:
+                if _csrf_enabled():
+                    html = html.replace(CSRF_PLACEHOLDER, generate_csrf())
+                response = make_response(html)
+                response.headers['X-Page-Cache'] = 'HIT'
+                return response
+
+        html = view(slug)
+        if not isinstance(html, str):
+            return html
+        shareable = html.replace(generate_csrf(), CSRF_PLACEHOLDER) if _csrf_enabled() else html
+        backend.set(key, f'{today}\n{shareable}')
+        response = make_response(html)
+        response.headers['X-Page-Cache'] = 'MISS'
+        return response
+    return decorated
+
+
+def invalidate_page(slug: str) -> None:
+    """Drop the cached page for *slug*."""
+    backend = _backend()
+    if backend is not None:
+        backend.delete(_key(slug))
+
+
+def invalidate_user_pages(user_id) -> None:
+    """Drop the cached pages of every profile owned by *user_id*."""
+    if _backend() is None or user_id is None:
+        return
+    slugs = db.session.query(LandingRequest.public_slug).filter_by(user_id=user_id).all()
+    for (slug,) in slugs:
+        invalidate_page(slug)
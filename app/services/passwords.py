@@ -0,0 +1,76 @@
+"""Password hashing with a configurable method and a bounded verification pool.
+
+``PASSWORD_HASH_METHOD`` is any werkzeug method string, e.g.
+``'scrypt:32768:8:1'`` (werkzeug's default) or ``'pbkdf2:sha256:600000'``.
+Changing it does not invalidate stored hashes. Each user is re-hashed with
+the new method on their next successful login (see ``User.check_password``),
+whether the new setting is stronger or cheaper.
+
+Verification runs on a per-app pool of ``PASSWORD_VERIFY_WORKERS``
+threads. hashlib releases the GIL while hashing, so a burst of logins uses
+at most that many cores and the rest of the worker keeps serving pages.
+At most ``PASSWORD_VERIFY_QUEUE`` checks wait for a thread. Beyond that,
+:func:`verify_password` raises :class:`PasswordCheckBusy` instead of
+queueing without bound.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from flask import current_app
+from werkzeug.security import check_password_hash, generate_password_hash
+
+DEFAULT_METHOD = 'scrypt:32768:8:1'
+
+
+class PasswordCheckBusy(RuntimeError):
+    """Too many password checks are already running or waiting."""
+
+
+class _VerifyPool:
+    def __init__(self, workers: int, queue: int):
+        self.executor = ThreadPoolExecutor(max_workers=workers,
+                                           thread_name_prefix='password-verify')
+        self.slots = threading.BoundedSemaphore(workers + queue)
+
+    def run(self, fn, *args):
+        if not self.slots.acquire(blocking=False):
+            raise PasswordCheckBusy()
+        try:
+            return self.executor.submit(fn, *args).result()
+        finally:
+            self.slots.release()
+
+
+def _pool() -> _VerifyPool:
+    pool = current_app.extensions.get('password_verify_pool')
+    if pool is None:
+        pool = _VerifyPool(current_app.config.get('PASSWORD_VERIFY_WORKERS', 4),
+                           current_app.config.get('PASSWORD_VERIFY_QUEUE', 32))
+        current_app.extensions['password_verify_pool'] = pool
+    return pool
+
+
+def hash_method() -> str:
+    return current_app.config.get('PASSWORD_HASH_METHOD', DEFAULT_METHOD)
+
+
+@lru_cache(maxsize=16)
+def _stored_prefix(method: str) -> str:
+    # werkzeug fills in default parameters ('scrypt' -> 'scrypt:32768:8:1'),
+    # so compare against what it actually writes
+    return generate_password_hash('', method=method).split('$', 1)[0]
+
+
+def hash_password(password: str) -> str:
+    return generate_password_hash(password, method=hash_method())
+
+
+def needs_rehash(pwhash: str) -> bool:
+    """True when *pwhash* was made with another method or work factor than the configured one."""
+    return pwhash.split('$', 1)[0] != _stored_prefix(hash_method())
+
+
+def verify_password(pwhash: str, password: str) -> bool:
+    """check_password_hash on the verification pool. May raise PasswordCheckBusy."""
+    return _pool().run(check_password_hash, pwhash, password)
@@ -0,0 +1,54 @@
+"""Sector prompt templates (``app/sectors/<sector>/prompt.txt``), parsed once.
+
+Templates use ``str.format`` placeholders. Only the fields in
+``PROMPT_FIELDS`` are allowed, and this is checked when a template is
+loaded, so a typo fails at app start instead of on a user's submit.
+Templates are loaded with their sector by :mod:`app.services.sectors`.
+"""
+from string import Formatter
+
+PROMPT_FILE = 'prompt.txt'
+PROMPT_FIELDS = frozenset({'nombre', 'descripcion', 'ubicacion'})
+
+
+class PromptTemplateError(ValueError):
+    """A prompt.txt uses a placeholder build_prompt does not provide."""
+
+
+class PromptTemplate:
+    """A template split into (literal, field) pairs, ready to render."""
+
+    __slots__ = ('sector', '_parts')
+
+    def __init__(self, sector: str, text: str):
+        self.sector = sector
+        self._parts = self._compile(sector, text)
+
+    @staticmethod
+    def _compile(sector: str, text: str) -> tuple:
+        parts = []
+        try:
+            parsed = list(Formatter().parse(text))
+        except ValueError as exc:
+            raise PromptTemplateError(f'{sector}/{PROMPT_FILE}: {exc}') from exc
+        for literal, field, spec, conversion in parsed:
+            if field is not None:
+                if field not in PROMPT_FIELDS:
+                    raise PromptTemplateError(
+                        f'{sector}/{PROMPT_FILE}: unknown placeholder {{{field}}}; '
+                        f'expected one of {sorted(PROMPT_FIELDS)}')
+                if spec or conversion:
+                    raise PromptTemplateError(
+                        f'{sector}/{PROMPT_FILE}: {{{field}}} must not use a format spec')
+            parts.append((literal, field))
+        return tuple(parts)
+
+    @property
+    def fields(self) -> frozenset:
+        return frozenset(field for _, field in self._parts if field is not None)
+
+    def render(self, **values) -> str:
+        return ''.join(
+            literal if field is None else literal + str(values[field])
+            for literal, field in self._parts
+        )
@@ -0,0 +1,164 @@
+"""Sector registry, loaded from ``app/sectors/<name>/``.
+
+Each sector directory holds::
+
+    theme.json    label, community name and description, colours, icon, order
+    prompt.txt    the generation prompt (see :mod:`app.services.prompt_templates`)
+
+Adding a sector means adding a directory; forms, views and ``build_prompt``
+all read from the registry. Everything is loaded and validated once by
+:func:`init_app`. With ``auto_reload`` (the default in debug) the directory
+is re-checked on each lookup and changed files are re-read, so edits show
+up without a restart.
+"""
+import json
+import os
+from typing import NamedTuple
+
+from flask import current_app
+
+from app.services.prompt_templates import PROMPT_FILE, PromptTemplate, PromptTemplateError
+
+SECTORS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'sectors')
+THEME_FILE = 'theme.json'
+# Used for profiles whose sector has since been removed
+DEFAULT_SECTOR = 'abogatap'
+
+_THEME_KEYS = ('label', 'community', 'community_desc', 'primary', 'bg', 'icon_bg', 'icon')
+
+
+class SectorError(ValueError):
+    """A sector directory is missing a file or a theme key."""
+
+
+class Sector(NamedTuple):
+    """One sector's theme and prompt. Immutable; templates read it like the old theme dict."""
+    name: str
+    label: str
+    community: str
+    community_desc: str
+    primary: str
+    bg: str
+    icon_bg: str
+    icon: str
+    order: int
+    prompt: PromptTemplate
+    mtime: float = 0
+
+    @property
+    def choice_label(self) -> str:
+        return f'{self.community} — {self.label}'
+
+
+def load_sector(directory: str, name: str) -> Sector:
+    """Read and validate the sector *name* under *directory*."""
+    base = os.path.join(directory, name)
+    theme_path = os.path.join(base, THEME_FILE)
+    prompt_path = os.path.join(base, PROMPT_FILE)
+    try:
+        mtime = max(os.path.getmtime(theme_path), os.path.getmtime(prompt_path))
+        with open(theme_path, encoding='utf-8') as f:
+            theme = json.load(f)
+        with open(prompt_path, encoding='utf-8') as f:
+            prompt = PromptTemplate(name, f.read())
+    except FileNotFoundError as exc:
+        raise SectorError(f'{name}: missing {os.path.basename(exc.filename)}') from exc
+    except PromptTemplateError:
+        raise
+    except ValueError as exc:
+        raise SectorError(f'{name}/{THEME_FILE}: {exc}') from exc
+    missing = [key for key in _THEME_KEYS if key not in theme]
+    if missing:
+        raise SectorError(f'{name}/{THEME_FILE}: missing {", ".join(missing)}')
+    return Sector(name=name, order=int(theme.get('order', 0)), prompt=prompt, mtime=mtime,
+                  **{key: theme[key] for key in _THEME_KEYS})
+
+
+class SectorRegistry:
+    """Every sector directory under *directory*, in display order."""
+
+    def __init__(self, directory: str = SECTORS_DIR, auto_reload: bool = False):
+        self.directory = directory
+        self.auto_reload = auto_reload
+        self._sectors = {}
+        self._choices = ()
+
+    def _index(self):
+        ordered = sorted(self._sectors.values(), key=lambda s: (s.order, s.name))
+        self._sectors = {s.name: s for s in ordered}
+        self._choices = tuple((s.name, s.choice_label) for s in ordered)
+
+    def load(self) -> 'SectorRegistry':
+        """(Re)load every sector, raising SectorError or PromptTemplateError on the first bad one."""
+        self._sectors = {
+            name: load_sector(self.directory, name)
+            for name in os.listdir(self.directory)
+            if os.path.isdir(os.path.join(self.directory, name))
+        }
+        self._index()
+        return self
+
+    def _refresh(self):
+        # Debug only: re-read changed sectors, pick up added and removed ones
+        changed = False
+        names = {name for name in os.listdir(self.directory)
+                 if os.path.isdir(os.path.join(self.directory, name))}
+        for name in set(self._sectors) - names:
+            del self._sectors[name]
+            changed = True
+        for name in names:
+            base = os.path.join(self.directory, name)
+            try:
+                mtime = max(os.path.getmtime(os.path.join(base, THEME_FILE)),
+                            os.path.getmtime(os.path.join(base, PROMPT_FILE)))
+            except OSError:
+                changed |= self._sectors.pop(name, None) is not None
+                continue
+            current = self._sectors.get(name)
+            if current is None or current.mtime != mtime:
+                self._sectors[name] = load_sector(self.directory, name)
+                changed = True
+        if changed:
+            self._index()
+
+    def get(self, name: str):
+        """Return the Sector *name*, or None if there is no such sector."""
+        if self.auto_reload:
+            self._refresh()
+        return self._sectors.get(name)
+
+    def get_or_default(self, name: str) -> Sector:
+        """Sector *name*, or DEFAULT_SECTOR for profiles of a removed sector."""
+        return self.get(name) or self._sectors[DEFAULT_SECTOR]
+
+    def choices(self) -> tuple:
+        """``(name, "Community — Label")`` pairs for a SelectField."""
+        if self.auto_reload:
+            self._refresh()
+        return self._choices
+
+    def __iter__(self):
+        if self.auto_reload:
+            self._refresh()
+        return iter(tuple(self._sectors.values()))
+
+    def __contains__(self, name) -> bool:
+        return self.get(name) is not None
+
+
+def init_app(app) -> SectorRegistry:
+    """Load the sectors for *app*; reload on change if in debug."""
+    auto_reload = app.config.get('SECTORS_AUTO_RELOAD')
+    if auto_reload is None:
+        auto_reload = app.debug
+    registry = SectorRegistry(SECTORS_DIR, auto_reload).load()
+    app.extensions['sectors'] = registry
+    return registry
+
+
+def sector_registry() -> SectorRegistry:
+    """The current app's registry, loading it on first use."""
+    registry = current_app.extensions.get('sectors')
+    if registry is None:
+        registry = init_app(current_app)
+    return registry
@@ -0,0 +1,113 @@
+"""Production settings for SQLite engines.
+
+With the default rollback journal, a writer locks readers out of the whole
+file, and concurrent contact and booking POSTs fail with "database is
+locked". For every SQLite engine of the app, this module:
+
+* sets the pragmas below on each new connection (``connect`` event), each
+  taken from config and skipped when set to None:
+
+  ===================  ====================  ==========================================
+  pragma               config key            default
+  ===================  ====================  ==========================================
+  journal_mode         SQLITE_JOURNAL_MODE   ``wal``: readers never wait for the writer
+  synchronous          SQLITE_SYNCHRONOUS    ``normal``: fsync at checkpoints, safe in WAL
+  busy_timeout         SQLITE_BUSY_TIMEOUT   5000 ms of retrying a lock held elsewhere
+  mmap_size            SQLITE_MMAP_SIZE      256 MiB of the file read through mmap
+  cache_size           SQLITE_CACHE_SIZE     -65536 (KiB, i.e. 64 MiB of page cache)
+  ===================  ====================  ==========================================
+
+* when ``SQLITE_SERIALIZE_WRITES`` is on, lets only one connection of the
+  process write at a time. A connection takes the lock at its first write
+  statement and releases it at commit or rollback. Other writers wait in
+  Python for up to ``SQLITE_BUSY_TIMEOUT`` instead of polling the file
+  lock. Reads never take it. Writers in other processes are still
+  arbitrated by ``busy_timeout``.
+
+The Python driver opens a transaction only at the first INSERT/UPDATE/
+DELETE, so a write transaction never upgrades an older read snapshot,
+which WAL would reject with SQLITE_BUSY_SNAPSHOT.
+"""
+import re
+import sqlite3
+import threading
+
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+
+from app.extensions import db
+
+PRAGMA_KEYS = (
+    ('journal_mode', 'SQLITE_JOURNAL_MODE'),
+    ('synchronous', 'SQLITE_SYNCHRONOUS'),
+    ('busy_timeout', 'SQLITE_BUSY_TIMEOUT'),
+    ('mmap_size', 'SQLITE_MMAP_SIZE'),
+    ('cache_size', 'SQLITE_CACHE_SIZE'),
+)
+_WRITE = re.compile(r'\s*(INSERT|UPDATE|DELETE|REPLACE|CREATE|DROP|ALTER)\b', re.IGNORECASE)
+# connection.info key: this connection holds the write lock
+_HOLDS = 'sqlite_write_lock'
+
+
+def pragmas(config) -> dict:
+    """{pragma: value} from *config*, without the ones set to None."""
+    return {name: config[key] for name, key in PRAGMA_KEYS if config.get(key) is not None}
+
+
+class WriteLock:
+    """Process-wide writer lock shared by every connection of one engine.
+
+    Re-entrant, so a thread that already writes through one connection is
+    not blocked by its own lock on a second one.
+    """
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._lock = threading.RLock()
+
+    def before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if conn.info.get(_HOLDS) or not _WRITE.match(statement):
+            return
+        if not self._lock.acquire(timeout=self.timeout):
+            raise OperationalError(statement, parameters,
+                                   sqlite3.OperationalError('database is locked'))
+        conn.info[_HOLDS] = True
+
+    def release(self, info: dict):
+        if info.pop(_HOLDS, False):
+            self._lock.release()
+
+    def on_end(self, conn):
+        self.release(conn.info)
+
+    def on_checkin(self, dbapi_connection, connection_record):
+        # Returned to the pool without commit or rollback (e.g. closed mid-transaction)
+        self.release(connection_record.info)
+
+
+def configure_engine(engine, config) -> None:
+    """Install the pragmas and, if enabled, the write lock on *engine*."""
+    values = pragmas(config)
+
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in values.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+        cursor.close()
+
+    event.listen(engine, 'connect', set_pragmas)
+    if config.get('SQLITE_SERIALIZE_WRITES'):
+        lock = WriteLock((config.get('SQLITE_BUSY_TIMEOUT') or 5000) / 1000)
+        event.listen(engine, 'before_cursor_execute', lock.before_execute)
+        # Fired just before the COMMIT runs; a writer let in early waits in busy_timeout
+        event.listen(engine, 'commit', lock.on_end)
+        event.listen(engine, 'rollback', lock.on_end)
+        event.listen(engine.pool, 'checkin', lock.on_checkin)
+
+
+def init_app(app) -> None:
+    """Apply the profile to every SQLite engine (default and binds) of *app*."""
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == 'sqlite':
+                configure_engine(engine, app.config)
@@ -0,0 +1,207 @@
+"""Daily rollups (``daily_stat``) behind the admin dashboard.
+
+Each ORM insert of a LandingRequest, User, Contact or Appointment bumps the
+matching row of its UTC creation day in the same transaction, and each ORM
+delete takes it back. Cancelled appointments are not counted, so a status
+change to or from ``cancelled`` moves the count too. A ``before_flush``
+hook handles deletes and status changes while the rows still hold their
+old values; an ``after_flush`` hook handles the flush's new objects, once
+their defaults are set. Each issues one upsert. Writes that bypass the ORM
+(``agenda_service.book_slot``, bulk imports) call :func:`record`
+themselves. ``flask rebuild-stats`` recomputes the table from the source
+tables.
+
+The admin page then reads totals and time series from a few rows per day
+instead of counting the whole tables.
+"""
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import event, inspect
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.models.appointment import Appointment
+from app.models.contact import Contact
+from app.models.daily_stat import DailyStat
+from app.models.landing import LandingRequest
+from app.models.user import User
+
+METRICS = ('requests', 'users', 'contacts', 'appointments')
+SERIES_DAYS = 30
+# Rows per multi-row upsert when rebuilding
+_CHUNK = 500
+
+_UPSERT_DIALECTS = {'sqlite': sqlite.insert, 'postgresql': postgresql.insert}
+CANCELLED = 'cancelled'
+
+
+def _metric_of(obj):
+    """(metric, dimension) counted when *obj* is inserted, or None."""
+    if isinstance(obj, LandingRequest):
+        return 'requests', f'{obj.landing_type}:{obj.sector}'
+    if isinstance(obj, User):
+        return 'users', ''
+    if isinstance(obj, Contact):
+        return 'contacts', ''
+    if isinstance(obj, Appointment):
+        return 'appointments', ''
+    return None
+
+
+def _counted(obj, status=None) -> bool:
+    """Whether *obj* (an Appointment with *status*, by default its own) is counted."""
+    if isinstance(obj, Appointment):
+        return (status or obj.status) != CANCELLED
+    return True
+
+
+def _utc_day(value) -> date:
+    return (value or datetime.now(timezone.utc)).date()
+
+
+def record(connection, counts: Counter) -> None:
+    """Add *counts* ({(day, metric, dimension): n}) to daily_stat on *connection*."""
+    table = DailyStat.__table__
+    rows = [{'day': day, 'metric': metric, 'dimension': dimension, 'count': n}
+            for (day, metric, dimension), n in counts.items()]
+    insert = _UPSERT_DIALECTS.get(connection.dialect.name)
+    for start in range(0, len(rows), _CHUNK):
+        chunk = rows[start:start + _CHUNK]
+        if insert is not None:
+            stmt = insert(table).values(chunk)
+            connection.execute(stmt.on_conflict_do_update(
+                index_elements=['day', 'metric', 'dimension'],
+                set_={'count': table.c.count + stmt.excluded['count']},
+            ))
+            continue
+        for row in chunk:
+            updated = connection.execute(
+                table.update()
+                .where(table.c.day == row['day'], table.c.metric == row['metric'],
+                       table.c.dimension == row['dimension'])
+                .values(count=table.c.count + row['count'])
+            ).rowcount
+            if not updated:
+                connection.execute(table.insert().values(**row))
+
+
+def record_one(metric: str, dimension: str = '', day: date = None) -> None:
+    """Count one row inserted outside the ORM, in the current session's transaction."""
+    record(db.session.connection(), Counter({(day or _utc_day(None), metric, dimension): 1}))
+
+
+def _before_flush(session, flush_context, instances):
+    counts = Counter()
+    for obj in session.deleted:
+        key = _metric_of(obj)
+        if key is None:
+            continue
+        old = inspect(obj).attrs.status.history.deleted if isinstance(obj, Appointment) else ()
+        if _counted(obj, old[0] if old else None):
+            counts[(_utc_day(obj.created_at), *key)] -= 1
+    for obj in session.dirty:
+        if not isinstance(obj, Appointment) or obj in session.deleted:
+            continue
+        history = inspect(obj).attrs.status.history
+        if not history.deleted:
+            continue
+        was, now = _counted(obj, history.deleted[0]), _counted(obj)
+        if was != now:
+            counts[(_utc_day(obj.created_at), 'appointments', '')] += now - was
+    if counts:
+        record(session.connection(), counts)
+
+
+def _after_flush(session, flush_context):
+    # session.new still lists the objects this flush inserted
+    counts = Counter()
+    for obj in session.new:
+        key = _metric_of(obj)
+        if key is not None and _counted(obj):
+            counts[(_utc_day(obj.created_at), *key)] += 1
+    if counts:
+        record(session.connection(), counts)
+
+
+_LISTENERS = (
+    ('before_flush', _before_flush),
+    ('after_flush', _after_flush),
+)
+
+
+def init_app(app) -> None:
+    """Install the flush hooks (once per process; they serve every app)."""
+    for name, fn in _LISTENERS:
+        if not event.contains(Session, name, fn):
+            event.listen(Session, name, fn)
+
+
+def rebuild() -> int:
+    """Recompute daily_stat from the source tables. Returns how many rows it wrote.
+
+    The caller commits.
+    """
+    sources = [
+        ('requests', LandingRequest, (LandingRequest.landing_type, LandingRequest.sector), ()),
+        ('users', User, (), ()),
+        ('contacts', Contact, (), ()),
+        ('appointments', Appointment, (), (Appointment.status != CANCELLED,)),
+    ]
+    counts = Counter()
+    for metric, model, dimensions, filters in sources:
+        day = db.func.date(model.created_at)
+        rows = db.session.query(day, *dimensions, db.func.count(model.id))\
+            .filter(model.created_at.isnot(None), *filters)\
+            .group_by(day, *dimensions).all()
+        for row_day, *dims, n in rows:
+            # SQLite's date() returns text, PostgreSQL's a date
+            row_day = date.fromisoformat(row_day) if isinstance(row_day, str) else row_day
+            counts[(row_day, metric, ':'.join(dims))] += n
+
+    DailyStat.query.delete()
+    record(db.session.connection(), counts)
+    return len(counts)
+
+
+def totals() -> dict:
+    """All-time totals: ``total``, ``total_b2b``, ``total_b2c``, ``total_users``,
+    ``total_contacts``, ``total_appointments`` and ``sectors`` [(sector, n)]."""
+    rows = db.session.query(DailyStat.metric, DailyStat.dimension,
+                            db.func.sum(DailyStat.count))\
+        .group_by(DailyStat.metric, DailyStat.dimension).all()
+    by_metric, by_type, by_sector = Counter(), Counter(), Counter()
+    for metric, dimension, n in rows:
+        by_metric[metric] += n
+        if metric == 'requests':
+            landing_type, _, sector = dimension.partition(':')
+            by_type[landing_type] += n
+            by_sector[sector] += n
+    return {
+        'total': by_metric['requests'],
+        'total_b2b': by_type['b2b'],
+        'total_b2c': by_type['b2c'],
+        'total_users': by_metric['users'],
+        'total_contacts': by_metric['contacts'],
+        'total_appointments': by_metric['appointments'],
+        'sectors': sorted(by_sector.items(), key=lambda item: (-item[1], item[0])),
+    }
+
+
+def series(days: int = SERIES_DAYS, today: date = None) -> dict:
+    """Per-day counts of each metric for the last *days* days (oldest first).
+
+    Returns ``{'days': [date, ...], 'requests': [n, ...], 'users': [...], ...}``.
+    """
+    today = today or _utc_day(None)
+    first = today - timedelta(days=days - 1)
+    rows = db.session.query(DailyStat.day, DailyStat.metric, db.func.sum(DailyStat.count))\
+        .filter(DailyStat.day >= first, DailyStat.day <= today)\
+        .group_by(DailyStat.day, DailyStat.metric).all()
+    index = {(day, metric): n for day, metric, n in rows}
+    span = [first + timedelta(days=i) for i in range(days)]
+    result = {'days': span}
+    for metric in METRICS:
+        result[metric] = [index.get((day, metric), 0) for day in span]
+    return result
@@ -0,0 +1,75 @@
+"""Per-process cache behind ``login_manager.user_loader``.
+
+Flask-Login calls the loader once per request (``current_user`` is then
+memoized on ``g``), which used to cost one SELECT on ``user`` per
+authenticated request. The loader now keeps the user's column values in
+a TTLCache (``USER_CACHE_TTL`` seconds). On a hit it attaches a User built
+from them to the request's session with ``merge(load=False)``, which
+issues no SQL. Relationships such as ``current_user.professional`` still
+lazy-load normally.
+
+Setting ``is_admin`` or ``password_hash`` drops the cached entry when the
+change is made and again once it commits. Other processes see the change
+within the TTL.
+"""
+from flask import has_app_context
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
+
+from app.extensions import db
+from app.models.user import User
+from app.services.cache import MISS, app_cache
+
+_COLUMNS = ('id', 'email', 'password_hash', 'is_admin', 'created_at')
+# session.info key: ids whose cached entry must go once the transaction commits
+_PENDING = 'user_cache_invalidate'
+
+
+def _cache():
+    return app_cache('user_cache', 'USER_CACHE_TTL', default_ttl=30)
+
+
+def cached_user(user_id: int):
+    """The User *user_id* in the current session, from the cache when possible."""
+    cache = _cache()
+    values = cache.get(user_id)
+    if values is MISS:
+        user = db.session.get(User, user_id)
+        if user is not None:
+            cache.set(user_id, {c: getattr(user, c) for c in _COLUMNS})
+        return user
+    user = User(**values)
+    make_transient_to_detached(user)
+    # Returns the session's own instance if this user is already loaded
+    return db.session.merge(user, load=False)
+
+
+def invalidate_user(user_id) -> None:
+    if user_id is not None and has_app_context():
+        _cache().delete(user_id)
+
+
+def _on_change(target, value, oldvalue, initiator):
+    invalidate_user(target.id)
+    session = object_session(target)
+    if session is not None and target.id is not None:
+        session.info.setdefault(_PENDING, set()).add(target.id)
+
+
+def _after_commit(session):
+    for user_id in session.info.pop(_PENDING, ()):
+        invalidate_user(user_id)
+
+
+_LISTENERS = (
+    (User.is_admin, 'set', _on_change),
+    (User.password_hash, 'set', _on_change),
+    (Session, 'after_commit', _after_commit),
+)
+
+
+def init_app(app) -> None:
+    """Install the invalidation hooks (once per process)."""
+    for target, name, fn in _LISTENERS:
+        if not event.contains(target, name, fn):
+            event.listen(target, name, fn)
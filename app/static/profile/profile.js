@@ -0,0 +1,187 @@
+// ── Theme toggle ──────────────────────────────
+(function () {
+    var btn = document.getElementById('themeToggle');
+    if (btn) {
+        btn.addEventListener('click', function () {
+            var isDark = document.documentElement.classList.toggle('dark');
+            localStorage.setItem('theme', isDark ? 'dark' : 'light');
+        });
+    }
+}());
+
+// ── Service card selection ────────────────────
+function selectService(card) {
+    var alreadySelected = card.classList.contains('selected');
+    document.querySelectorAll('.service-card').forEach(function(c) {
+        c.classList.remove('selected');
+    });
+    var apptSvc = document.getElementById('apptServiceId');
+    if (!alreadySelected) {
+        card.classList.add('selected');
+        if (apptSvc) apptSvc.value = card.dataset.id;
+    } else {
+        if (apptSvc) apptSvc.value = '0';
+    }
+}
+
+// ── Calendar ──────────────────────────────────
+// Free slots are embedded by the page as <script id="agenda-data" type="application/json">
+var AGENDA, calYear, calMonth, selectedDate;
+
+var MONTH_NAMES = ['Enero','Febrero','Marzo','Abril','Mayo','Junio',
+                   'Julio','Agosto','Septiembre','Octubre','Noviembre','Diciembre'];
+var DAY_NAMES   = ['lunes','martes','miércoles','jueves','viernes','sábado','domingo'];
+var MON_NAMES   = ['enero','febrero','marzo','abril','mayo','junio',
+                   'julio','agosto','septiembre','octubre','noviembre','diciembre'];
+
+(function init() {
+    var data = document.getElementById('agenda-data');
+    if (!data) return;
+    AGENDA = JSON.parse(data.textContent);
+    var now = new Date();
+    calYear  = now.getFullYear();
+    calMonth = now.getMonth();
+    renderCalendar();
+})();
+
+function renderCalendar() {
+    var cal   = document.getElementById('calGrid');
+    var label = document.getElementById('calMonthLabel');
+    label.textContent = MONTH_NAMES[calMonth] + ' ' + calYear;
+    cal.innerHTML = '';
+
+    // Day headers (Mon-first)
+    ['L','M','X','J','V','S','D'].forEach(function(d) {
+        var el = document.createElement('div');
+        el.className = 'cal-day-header';
+        el.textContent = d;
+        cal.appendChild(el);
+    });
+
+    // Empty cells before first day of month
+    var firstDay = new Date(calYear, calMonth, 1);
+    var startDow = (firstDay.getDay() + 6) % 7; // Mon = 0
+    for (var i = 0; i < startDow; i++) {
+        var empty = document.createElement('div');
+        empty.className = 'cal-day empty';
+        cal.appendChild(empty);
+    }
+
+    var today = new Date();
+    today.setHours(0, 0, 0, 0);
+    var daysInMonth = new Date(calYear, calMonth + 1, 0).getDate();
+
+    for (var d = 1; d <= daysInMonth; d++) {
+        var cellDate = new Date(calYear, calMonth, d);
+        var dateStr  = fmtDate(calYear, calMonth + 1, d);
+        var dow      = (cellDate.getDay() + 6) % 7;
+
+        var el = document.createElement('div');
+        el.className = 'cal-day';
+        el.textContent = d;
+
+        var isPast  = cellDate < today;
+        var isToday = cellDate.getTime() === today.getTime();
+
+        if (isToday) el.classList.add('today');
+
+        if (isPast) {
+            el.classList.add('past');
+        } else if (AGENDA.free[dateStr] !== undefined) {
+            if (AGENDA.free[dateStr].indexOf('1') === -1) {
+                el.classList.add('fully-booked');
+                el.title = 'Sin plazas disponibles';
+            } else {
+                el.classList.add('available');
+                (function(ds, elem) {
+                    elem.addEventListener('click', function() { pickDay(ds, elem); });
+                })(dateStr, el);
+            }
+        } else {
+            el.classList.add('unavailable');
+        }
+
+        if (dateStr === selectedDate) el.classList.add('selected');
+        cal.appendChild(el);
+    }
+}
+
+function fmtDate(y, m, d) {
+    return y + '-' + pad(m) + '-' + pad(d);
+}
+function pad(n) { return n < 10 ? '0' + n : '' + n; }
+
+function pickDay(dateStr, el) {
+    selectedDate = dateStr;
+    document.querySelectorAll('.cal-day.selected').forEach(function(e) {
+        e.classList.remove('selected');
+    });
+    el.classList.add('selected');
+    renderSlots(dateStr);
+}
+
+function renderSlots(dateStr) {
+    var container = document.getElementById('slotsContainer');
+    var btnsDiv   = document.getElementById('slotBtns');
+    var lbl       = document.getElementById('slotsDateLabel');
+
+    var parts = dateStr.split('-');
+    var y = parseInt(parts[0]), m = parseInt(parts[1]), d = parseInt(parts[2]);
+    var dow = (new Date(y, m - 1, d).getDay() + 6) % 7;
+    // Slot times for the weekday; AGENDA.free holds one '1'/'0' per slot
+    var allSlots  = AGENDA.slots[dow] || [];
+    var free      = AGENDA.free[dateStr] || '';
+    lbl.textContent = DAY_NAMES[dow] + ' ' + d + ' de ' + MON_NAMES[m - 1];
+
+    btnsDiv.innerHTML = '';
+    allSlots.forEach(function(slot, i) {
+        var btn = document.createElement('button');
+        btn.type = 'button';
+        btn.className = 'slot-btn';
+        btn.textContent = slot;
+        if (free.charAt(i) !== '1') {
+            btn.classList.add('booked');
+            btn.disabled = true;
+        } else {
+            (function(s, b) {
+                b.addEventListener('click', function() { pickSlot(s, b); });
+            })(slot, btn);
+        }
+        btnsDiv.appendChild(btn);
+    });
+
+    container.style.display = 'block';
+    document.getElementById('bookingFormWrap').style.display = 'none';
+    container.scrollIntoView({ behavior: 'smooth', block: 'nearest' });
+}
+
+function pickSlot(time, btn) {
+    document.querySelectorAll('.slot-btn.selected').forEach(function(b) {
+        b.classList.remove('selected');
+    });
+    btn.classList.add('selected');
+
+    document.getElementById('apptDate').value = selectedDate;
+    document.getElementById('apptTime').value = time;
+
+    var parts = selectedDate.split('-');
+    var y = parseInt(parts[0]), m = parseInt(parts[1]), d = parseInt(parts[2]);
+    var dow = (new Date(y, m - 1, d).getDay() + 6) % 7;
+    document.getElementById('apptSummary').textContent =
+        DAY_NAMES[dow] + ' ' + d + ' de ' + MON_NAMES[m - 1] + ' a las ' + time;
+
+    var wrap = document.getElementById('bookingFormWrap');
+    wrap.style.display = 'block';
+    wrap.scrollIntoView({ behavior: 'smooth', block: 'nearest' });
+}
+
+function prevMonth() {
+    calMonth--;
+    if (calMonth < 0) { calMonth = 11; calYear--; }
+    renderCalendar();
+}
+function nextMonth() {
+    calMonth++;
+    if (calMonth > 11) { calMonth = 0; calYear++; }
+    renderCalendar();
+}
@@ -0,0 +1,123 @@
+"""OFFSET vs keyset paging of admin orders over a large synthetic table.
+
+Builds a temporary SQLite file with --rows LandingRequest rows (1M by
+default; the first run takes a while), then times fetching one page at
+increasing depths:
+
+* offset: COUNT + LIMIT/OFFSET on admin_orders_query, as the view did before
+* keyset: keyset_admin_orders from a cursor at the same depth
+
+Usage: python -m benchmarks.admin_orders_paging [--rows 1000000] [--keep]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from app import create_app
+from app.extensions import db
+from app.models.landing import LandingRequest
+from app.services.landing_service import (
+    admin_orders_query, encode_cursor, keyset_admin_orders,
+)
+
+PER_PAGE = 25
+SECTORS = ('abogatap', 'segurotap', 'inmotap', 'consultortap')
+
+
+def _populate(rows: int) -> None:
+    random.seed(1)
+    start = datetime(2020, 1, 1)
+    conn = db.engine.raw_connection()
+    cur = conn.cursor()
+    batch = []
+    for i in range(rows):
+        created = (start + timedelta(seconds=i * 60 + random.randint(0, 59))).isoformat(' ')
+        batch.append((f's{i:010d}', random.choice(('b2b', 'b2c')), random.choice(SECTORS),
+                      f'Negocio {i}', '', '', created, created))
+        if len(batch) == 50_000:
+            cur.executemany(
+                'INSERT INTO landing_request (public_slug, landing_type, sector, business_name,'
+                ' description, location, created_at, updated_at) VALUES (?,?,?,?,?,?,?,?)', batch)
+            batch.clear()
+    if batch:
+        cur.executemany(
+            'INSERT INTO landing_request (public_slug, landing_type, sector, business_name,'
+            ' description, location, created_at, updated_at) VALUES (?,?,?,?,?,?,?,?)', batch)
+    conn.commit()
+    cur.execute('ANALYZE')
+    conn.close()
+
+
+def _best(fn, repeat: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        db.session.expunge_all()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def _offset_page(page: int, filters: dict) -> list:
+    """The old view's page: a plain COUNT for the total, then LIMIT/OFFSET."""
+    query = admin_orders_query(**filters)
+    query.order_by(None).with_entities(db.func.count(LandingRequest.id)).scalar()
+    return query.offset((page - 1) * PER_PAGE).limit(PER_PAGE).all()
+
+
+def _cursor_at(page: int, filters: dict):
+    """Cursor whose 'next' page is *page* (computed outside the timings)."""
+    if page == 1:
+        return None
+    row = admin_orders_query(**filters).order_by(None)\
+        .order_by(LandingRequest.created_at.desc(), LandingRequest.id.desc())\
+        .offset((page - 1) * PER_PAGE - 1).limit(1).one()
+    return encode_cursor('next', row)
+
+
+def run(rows: int, keep: bool) -> None:
+    path = os.path.join(tempfile.gettempdir(), f'bench_orders_{rows}.db')
+
+    class BenchConfig:
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        SECRET_KEY = 'bench'
+
+    fresh = not os.path.exists(path)
+    app = create_app(BenchConfig)
+    try:
+        with app.app_context():
+            if fresh:
+                db.create_all()
+                t = time.perf_counter()
+                _populate(rows)
+                print(f'populated {rows} rows in {time.perf_counter() - t:.1f}s')
+            for filters in ({}, {'filter_type': 'b2c', 'filter_sector': 'segurotap'}):
+                _compare(filters)
+    finally:
+        if not keep:
+            os.remove(path)
+
+
+def _compare(filters: dict) -> None:
+    matching = admin_orders_query(**filters).order_by(None)\
+        .with_entities(db.func.count(LandingRequest.id)).scalar()
+    last = max(matching // PER_PAGE, 1)
+    depths = sorted({p for p in (1, 10, 100, 1000, 10_000, last // 2, last) if 1 <= p <= last})
+    print(f'\nfilters={filters or "none"} ({matching} rows)')
+    print(f'{"page":>8} {"offset ms":>10} {"keyset ms":>10}')
+    for page in depths:
+        offset_ms = _best(lambda: _offset_page(page, filters))
+        cursor = _cursor_at(page, filters)
+        keyset_ms = _best(lambda: keyset_admin_orders(cursor, PER_PAGE, **filters).items)
+        print(f'{page:>8} {offset_ms:10.2f} {keyset_ms:10.2f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--keep', action='store_true', help='Keep the database for the next run.')
+    args = parser.parse_args()
+    run(args.rows, args.keep)
@@ -0,0 +1,62 @@
+"""build_prompt with a cold and a warm sector registry.
+
+* cold:        the registry is reloaded from disk before each call
+* warm:        templates already parsed in memory (production)
+* auto-reload: warm, plus a stat() of every sector file per call (debug)
+
+Usage: python -m benchmarks.build_prompt [--count 20000]
+"""
+import argparse
+import time
+
+from app import create_app
+from app.services.landing_service import build_prompt
+
+
+class BenchConfig:
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SECRET_KEY = 'bench'
+
+
+class _Req:
+    sector = 'abogatap'
+    business_name = 'Despacho Pérez'
+    contact_name = None
+    description = ''
+    location = 'Madrid'
+    website = ''
+
+
+class _Service:
+    title = 'Derecho penal'
+    description = 'Defensa criminal'
+
+
+def _timed(count: int, before=None) -> float:
+    req, services = _Req(), [_Service()] * 3
+    start = time.perf_counter()
+    for _ in range(count):
+        if before:
+            before()
+        build_prompt(req, services)
+    return (time.perf_counter() - start) / count * 1e6
+
+
+def run(count: int) -> None:
+    app = create_app(BenchConfig)
+    with app.app_context():
+        registry = app.extensions['sectors']
+        cold = _timed(max(count // 20, 1), before=registry.load)
+        warm = _timed(count)
+        registry.auto_reload = True
+        reload = _timed(count)
+    print(f'cold         {cold:8.2f} us/call')
+    print(f'warm         {warm:8.2f} us/call  x{cold / warm:.1f}')
+    print(f'auto-reload  {reload:8.2f} us/call')
+    print(f'{len(registry.choices())} sectors')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=20000)
+    run(parser.parse_args().count)
@@ -0,0 +1,79 @@
+"""Bytes on the wire and CPU per request, with and without response compression.
+
+Requests a public profile page (/p/<slug>) with a per-request CSRF token,
+its CSS/JS bundles and static/css/style.css through the test client, in
+four modes: no Accept-Encoding, gzip with the compressed-output cache
+disabled (COMPRESS_CACHE_SIZE=0), gzip with the cache, and br when the
+brotli package is installed.
+
+Usage: python -m benchmarks.compression [--requests 500]
+"""
+import argparse
+import re
+import time
+
+from app import create_app
+from app.extensions import db
+from app.models.landing import LandingRequest
+from app.models.landing_service import LandingService
+from app.services.compression import available_encodings
+
+
+def _app(cache_size: int):
+    class BenchConfig:
+        SQLALCHEMY_DATABASE_URI = 'sqlite://'
+        SECRET_KEY = 'bench'
+        SERVER_NAME = 'localhost'
+        COMPRESS_CACHE_SIZE = cache_size
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+        req = LandingRequest(public_slug='bench', landing_type='b2b', sector='abogatap',
+                             business_name='Despacho Bench', description='Derecho civil',
+                             location='Madrid', contact_name='Ana', phone='600000000')
+        req.services.append(LandingService(title='Consulta', description='Primera visita', order=0))
+        db.session.add(req)
+        db.session.commit()
+    return app
+
+
+def _urls(app) -> list:
+    with app.app_context():
+        html = app.test_client().get('/p/bench').get_data(as_text=True)
+    return ['/p/bench', *(f'/assets/{n}' for n in re.findall(r'/assets/([\w./-]+)', html)),
+            '/static/css/style.css']
+
+
+def _measure(app, url: str, headers: dict, n: int):
+    client = app.test_client()
+    wire = 0
+    start = time.process_time()
+    for _ in range(n):
+        with app.app_context():  # fresh g: a new CSRF token signature per request
+            response = client.get(url, headers=headers)
+            wire += len(response.get_data())
+            response.close()
+    return wire / n, (time.process_time() - start) / n * 1e3
+
+
+def run(requests: int) -> None:
+    modes = [('identity', 256, {}), ('gzip, no cache', 0, {'Accept-Encoding': 'gzip'}),
+             ('gzip', 256, {'Accept-Encoding': 'gzip'})]
+    if 'br' in available_encodings():
+        modes.append(('br', 256, {'Accept-Encoding': 'br'}))
+    apps = {size: _app(size) for size in {m[1] for m in modes}}
+    urls = _urls(apps[256])
+    print(f'{requests} requests per URL and mode; CPU is process time')
+    print(f'{"url":<40} {"mode":<15} {"bytes":>8} {"ms cpu":>7}')
+    for url in urls:
+        for label, size, headers in modes:
+            wire, cpu = _measure(apps[size], url, headers, requests)
+            print(f'{url[:40]:<40} {label:<15} {wire:8.0f} {cpu:7.3f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=500)
+    args = parser.parse_args()
+    run(args.requests)
@@ -0,0 +1,73 @@
+"""Bulk CSV import vs. one /comenzar submission per row.
+
+Builds a temporary SQLite file and imports --rows synthetic professionals:
+
+* form: one POST to /comenzar per row (flush, QR, commit each), on a sample
+* bulk: import_landings over the whole CSV with --workers QR processes
+
+Usage: python -m benchmarks.import_landings [--rows 10000] [--workers 4] [--sample 200]
+"""
+import argparse
+import io
+import os
+import tempfile
+import time
+
+from app import create_app
+from app.extensions import db
+from app.services.import_service import import_landings, read_csv
+
+SECTORS = ('abogatap', 'segurotap', 'inmotap', 'consultortap')
+
+
+def _csv(rows: int) -> str:
+    lines = ['sector,contact_name,phone,email,service_1_title,service_1_description,'
+             'service_2_title']
+    for i in range(rows):
+        lines.append(f'{SECTORS[i % len(SECTORS)]},Profesional {i},6{i:08d},'
+                     f'p{i}@example.com,Consulta,Primera visita,Seguimiento')
+    return '\n'.join(lines) + '\n'
+
+
+def run(rows: int, workers: int, sample: int) -> None:
+    path = os.path.join(tempfile.gettempdir(), 'bench_import.db')
+
+    class BenchConfig:
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        SECRET_KEY = 'bench'
+        WTF_CSRF_ENABLED = False
+        SERVER_NAME = 'bench.local'
+
+    if os.path.exists(path):
+        os.remove(path)
+    app = create_app(BenchConfig)
+    try:
+        with app.app_context():
+            db.create_all()
+            client = app.test_client()
+            start = time.perf_counter()
+            for i in range(sample):
+                client.post('/comenzar', data={
+                    'sector': 'abogatap', 'contact_name': f'Form {i}', 'phone': '600000000',
+                    'service_1_title': 'Consulta',
+                })
+            per_row = (time.perf_counter() - start) / sample
+            print(f'form: {per_row * 1e3:.1f} ms/row -> {rows} rows in ~{per_row * rows:.0f}s')
+
+            start = time.perf_counter()
+            report = import_landings(read_csv(io.StringIO(_csv(rows))), workers=workers)
+            elapsed = time.perf_counter() - start
+            print(f'bulk: {report.created} rows in {elapsed:.1f}s '
+                  f'({report.created / elapsed:.0f} rows/s, workers={workers})')
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--sample', type=int, default=200,
+                        help='Rows submitted through the form to estimate its rate.')
+    args = parser.parse_args()
+    run(args.rows, args.workers, args.sample)
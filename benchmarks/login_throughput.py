@@ -0,0 +1,60 @@
+"""Password checks per second for each PASSWORD_HASH_METHOD setting.
+
+For every method, --logins concurrent checks are submitted from --clients
+threads through verify_password, so they go through the bounded pool of
+PASSWORD_VERIFY_WORKERS threads as auth.login does.
+
+Usage: python -m benchmarks.login_throughput [--logins 64] [--clients 16] [--workers 4]
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app import create_app
+from app.services.passwords import PasswordCheckBusy, hash_password, verify_password
+
+METHODS = (
+    'scrypt:32768:8:1',      # werkzeug's default
+    'scrypt:16384:8:1',
+    'pbkdf2:sha256:600000',  # OWASP 2023 floor for PBKDF2-SHA256
+    'pbkdf2:sha256:260000',
+)
+
+
+def run(logins: int, clients: int, workers: int) -> None:
+    class BenchConfig:
+        SQLALCHEMY_DATABASE_URI = 'sqlite://'
+        SECRET_KEY = 'bench'
+        PASSWORD_VERIFY_WORKERS = workers
+        PASSWORD_VERIFY_QUEUE = clients
+
+    app = create_app(BenchConfig)
+    print(f'{logins} checks from {clients} clients, pool of {workers} threads')
+    print(f'{"method":<24} {"ms/check":>9} {"checks/s":>9}')
+    for method in METHODS:
+        with app.app_context():
+            app.config['PASSWORD_HASH_METHOD'] = method
+            pwhash = hash_password('correct horse')
+
+        def check(_):
+            with app.app_context():
+                try:
+                    return verify_password(pwhash, 'correct horse')
+                except PasswordCheckBusy:
+                    return None
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            results = list(pool.map(check, range(logins)))
+        elapsed = time.perf_counter() - start
+        assert all(results), 'some checks were rejected; raise PASSWORD_VERIFY_QUEUE'
+        print(f'{method:<24} {elapsed / logins * 1e3:9.1f} {logins / elapsed:9.1f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--logins', type=int, default=64)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+    run(args.logins, args.clients, args.workers)
@@ -0,0 +1,60 @@
+"""Per-request cost of METRICS_ENABLED on an uncached public profile page.
+
+Renders /p/<slug> with the page cache off, so each request runs its SQL,
+through the test client --requests times with metrics off and on.
+The best of --repeat runs is reported.
+
+Usage: python -m benchmarks.metrics_overhead [--requests 2000] [--repeat 3]
+"""
+import argparse
+import time
+
+from app import create_app
+from app.extensions import db
+from app.models.landing import LandingRequest
+from app.models.landing_service import LandingService
+
+
+def _app(enabled: bool):
+    class BenchConfig:
+        SQLALCHEMY_DATABASE_URI = 'sqlite://'
+        SECRET_KEY = 'bench'
+        SERVER_NAME = 'localhost'
+        PAGE_CACHE_BACKEND = 'none'
+        METRICS_ENABLED = enabled
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+        req = LandingRequest(public_slug='bench', landing_type='b2b', sector='abogatap',
+                             business_name='Despacho Bench', description='', location='',
+                             contact_name='Ana', phone='600000000')
+        req.services.append(LandingService(title='Consulta', order=0))
+        db.session.add(req)
+        db.session.commit()
+    return app
+
+
+def run(requests: int, repeat: int) -> None:
+    print(f'{requests} requests to /p/bench, best of {repeat}')
+    results = {}
+    for enabled in (False, True):
+        app = _app(enabled)
+        client = app.test_client()
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(requests):
+                client.get('/p/bench')
+            best = min(best, time.perf_counter() - start)
+        results[enabled] = best / requests * 1e6
+        print(f'metrics {"on " if enabled else "off"}  {results[enabled]:8.1f} us/request')
+    print(f'overhead     {results[True] - results[False]:8.1f} us/request')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    run(args.requests, args.repeat)
@@ -0,0 +1,31 @@
+"""Throughput of generate_qr_batch, serial vs. process pool.
+
+Usage: python -m benchmarks.qr_batch [--count 400] [--workers 1 2 4]
+"""
+import argparse
+import os
+import time
+
+from app.services.landing_service import generate_qr_batch
+
+
+def run(count: int, workers_list: list) -> None:
+    urls = [f'https://tarjeta.example.com/p/{i:08x}' for i in range(count)]
+    print(f'{count} QR codes, {os.cpu_count()} CPUs')
+    baseline = None
+    for workers in workers_list:
+        start = time.perf_counter()
+        generate_qr_batch(urls, workers=workers)
+        elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f'workers={workers:<3} {elapsed:7.2f}s  {count / elapsed:8.1f} QR/s  '
+              f'x{baseline / elapsed:.2f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=400)
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=[1, 2, os.cpu_count() or 1])
+    args = parser.parse_args()
+    run(args.count, args.workers)
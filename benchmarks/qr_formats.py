@@ -0,0 +1,35 @@
+"""Bytes produced and render time per QR format, cold and memoized.
+
+Usage: python -m benchmarks.qr_formats [--count 200]
+"""
+import argparse
+import time
+
+from app.services.landing_service import QR_FORMATS, QrOptions, render_qr
+
+VARIANTS = [QrOptions(format=fmt) for fmt in QR_FORMATS] + [
+    QrOptions(error_correction='L', box_size=4, border=2, format='png-optimized'),
+    QrOptions(error_correction='H', format='png'),
+]
+
+
+def run(count: int) -> None:
+    urls = [f'https://tarjeta.example.com/p/{i:010x}' for i in range(count)]
+    print(f'{"options":<50} {"avg bytes":>10} {"cold ms":>9} {"memo us":>9}')
+    for options in VARIANTS:
+        render_qr.cache_clear()
+        start = time.perf_counter()
+        sizes = [len(render_qr(url, options)) for url in urls]
+        cold = (time.perf_counter() - start) / count
+        start = time.perf_counter()
+        for url in urls:
+            render_qr(url, options)
+        warm = (time.perf_counter() - start) / count
+        label = f'{options.format} ec={options.error_correction} box={options.box_size} border={options.border}'
+        print(f'{label:<50} {sum(sizes) / count:10.0f} {cold * 1e3:9.2f} {warm * 1e6:9.2f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=200)
+    run(parser.parse_args().count)
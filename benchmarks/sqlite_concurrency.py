@@ -0,0 +1,97 @@
+"""Concurrent reads and writes on a SQLite file, before and after the production profile.
+
+Each of --threads threads sends --requests requests through its own test
+client: --write-ratio of them are contact POSTs (/p/<slug>/contactar, one
+INSERT and a commit), the rest are uncached public page GETs. The
+'default' profile is SQLite as the driver opens it (rollback journal,
+synchronous=FULL, the driver's 5 s timeout). 'production' is the Config
+defaults of app/services/sqlite_profile.py.
+
+Usage: python -m benchmarks.sqlite_concurrency [--threads 8] [--requests 200] [--write-ratio 0.3]
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+from app import create_app
+from app.extensions import db
+from app.models.landing import LandingRequest
+from app.models.landing_service import LandingService
+from config import Config
+
+PROFILES = {
+    'default': dict(SQLITE_JOURNAL_MODE=None, SQLITE_SYNCHRONOUS=None, SQLITE_BUSY_TIMEOUT=None,
+                    SQLITE_MMAP_SIZE=None, SQLITE_CACHE_SIZE=None, SQLITE_SERIALIZE_WRITES=False),
+    'production': {},
+}
+
+
+def _app(path: str, overrides: dict):
+    class BenchConfig(Config):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        SECRET_KEY = 'bench'
+        SERVER_NAME = 'localhost'
+        WTF_CSRF_ENABLED = False
+        PAGE_CACHE_BACKEND = 'none'
+
+    for key, value in overrides.items():
+        setattr(BenchConfig, key, value)
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+        req = LandingRequest(public_slug='bench', landing_type='b2b', sector='abogatap',
+                             business_name='Despacho Bench', description='', location='',
+                             contact_name='Ana', phone='600000000')
+        req.services.append(LandingService(title='Consulta', order=0))
+        db.session.add(req)
+        db.session.commit()
+    return app
+
+
+def _worker(app, requests: int, write_ratio: float, seed: int, results: list) -> None:
+    rng = random.Random(seed)
+    client = app.test_client()
+    ok = errors = 0
+    for i in range(requests):
+        if rng.random() < write_ratio:
+            res = client.post('/p/bench/contactar', data={'name': f'Visitante {seed}-{i}'})
+            success = res.status_code == 302
+        else:
+            res = client.get('/p/bench')
+            success = res.status_code == 200
+        ok, errors = ok + success, errors + (not success)
+    results.append((ok, errors))
+
+
+def run(threads: int, requests: int, write_ratio: float) -> None:
+    print(f'{threads} threads x {requests} requests, {write_ratio:.0%} writes')
+    print(f'{"profile":<12} {"req/s":>8} {"errors":>7}')
+    for name, overrides in PROFILES.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            app = _app(os.path.join(tmp, 'bench.db'), overrides)
+            results = []
+            pool = [threading.Thread(target=_worker, args=(app, requests, write_ratio, n, results))
+                    for n in range(threads)]
+            start = time.perf_counter()
+            for t in pool:
+                t.start()
+            for t in pool:
+                t.join()
+            elapsed = time.perf_counter() - start
+            with app.app_context():
+                db.engine.dispose()
+        ok = sum(r[0] for r in results)
+        errors = sum(r[1] for r in results)
+        print(f'{name:<12} {ok / elapsed:8.1f} {errors:7d}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--write-ratio', type=float, default=0.3)
+    args = parser.parse_args()
+    run(args.threads, args.requests, args.write_ratio)
@@ -3,10 +3,89 @@ import os
 basedir = os.path.abspath(os.path.dirname(__file__))
 
 
+def engine_options(url: str) -> dict:
+    """Pool and timeout settings for a PostgreSQL *url*; SQLite keeps SQLAlchemy's defaults."""
+    if not url or not url.startswith('postgresql'):
+        return {}
+    return {
+        # Connections per process kept open, and how many more a burst may open
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        # Seconds to wait for a free connection before failing the request
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 10)),
+        # Reopen connections older than this (seconds), before a proxy or server drops them
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+        # Check each connection with a cheap round trip when it leaves the pool
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', '1') == '1',
+        # Server-side limits in ms: statements, and transactions left idle by a crashed request
+        'connect_args': {'options': (
+            f"-c statement_timeout={int(os.environ.get('DB_STATEMENT_TIMEOUT', 15000))}"
+            f" -c idle_in_transaction_session_timeout="
+            f"{int(os.environ.get('DB_IDLE_IN_TRANSACTION_TIMEOUT', 60000))}"
+        )},
+    }
+
+
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
     SQLALCHEMY_DATABASE_URI = os.environ.get(
         'DATABASE_URL',
         f'sqlite:///{os.path.join(basedir, "app.db")}'
     )
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
+    # Read replica for the SELECTs of GET requests (app/services/db_routing.py)
+    DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
+    SQLALCHEMY_BINDS = (
+        {'replica': {'url': DATABASE_REPLICA_URL, **engine_options(DATABASE_REPLICA_URL)}}
+        if DATABASE_REPLICA_URL else {}
+    )
+    # Seconds a visitor keeps reading from the primary after one of their requests wrote
+    DB_REPLICA_STICKY_SECONDS = int(os.environ.get('DB_REPLICA_STICKY_SECONDS', 5))
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # SQLite pragmas set on every connection (None leaves SQLite's default);
+    # busy_timeout is in ms, cache_size in pages or, when negative, KiB
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE', 'wal')
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'normal')
+    SQLITE_BUSY_TIMEOUT = int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000))
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))
+    SQLITE_CACHE_SIZE = int(os.environ.get('SQLITE_CACHE_SIZE', -64 * 1024))
+    # One writing connection at a time per process; the others queue in Python
+    SQLITE_SERIALIZE_WRITES = os.environ.get('SQLITE_SERIALIZE_WRITES', '1') == '1'
+    # Seconds a public booking calendar stays cached per profile
+    AGENDA_CACHE_TTL = int(os.environ.get('AGENDA_CACHE_TTL', 60))
+    # Seconds the dashboard counters stay cached per user
+    DASHBOARD_STATS_TTL = int(os.environ.get('DASHBOARD_STATS_TTL', 30))
+    # Rendered /p/<slug> pages: 'memory', 'file', 'redis' or 'none'
+    PAGE_CACHE_BACKEND = os.environ.get('PAGE_CACHE_BACKEND', 'memory')
+    PAGE_CACHE_TTL = int(os.environ.get('PAGE_CACHE_TTL', 300))
+    PAGE_CACHE_DIR = os.environ.get('PAGE_CACHE_DIR', os.path.join(basedir, 'instance', 'page_cache'))
+    PAGE_CACHE_REDIS_URL = os.environ.get('PAGE_CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    # QR rendering: error correction L/M/Q/H, pixels per module, quiet-zone modules,
+    # and the stored format ('png' or 'png-optimized')
+    QR_ERROR_CORRECTION = os.environ.get('QR_ERROR_CORRECTION', 'M')
+    QR_BOX_SIZE = int(os.environ.get('QR_BOX_SIZE', 10))
+    QR_BORDER = int(os.environ.get('QR_BORDER', 4))
+    QR_FORMAT = os.environ.get('QR_FORMAT', 'png')
+    # Re-read app/sectors/* when edited; None follows app.debug
+    SECTORS_AUTO_RELOAD = None
+    # Callable 'module:attribute' that turns a LandingRequest into its generated_html
+    LANDING_GENERATOR = os.environ.get(
+        'LANDING_GENERATOR', 'app.services.generation_service:offline_generator')
+    # Seconds the admin order totals (per filter) stay cached
+    ADMIN_ORDERS_COUNT_TTL = int(os.environ.get('ADMIN_ORDERS_COUNT_TTL', 60))
+    # werkzeug hash method for new passwords; stored hashes are upgraded on login
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    # Concurrent password checks per process, and how many may wait for one
+    PASSWORD_VERIFY_WORKERS = int(os.environ.get('PASSWORD_VERIFY_WORKERS', 4))
+    PASSWORD_VERIFY_QUEUE = int(os.environ.get('PASSWORD_VERIFY_QUEUE', 32))
+    # Seconds a logged-in user's row is reused by the user_loader without a query
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 30))
+    # gzip/brotli responses: zlib level for dynamic bodies (static files always use 9),
+    # smallest body worth compressing (bytes) and how many compressed bodies are kept
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', '1') == '1'
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL', 6))
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE', 500))
+    COMPRESS_CACHE_SIZE = int(os.environ.get('COMPRESS_CACHE_SIZE', 256))
+    # Per-endpoint latency and SQL metrics at /admin/metrics, and the slow-query log threshold
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') == '1'
+    SLOW_QUERY_MS = int(os.environ.get('SLOW_QUERY_MS', 200))
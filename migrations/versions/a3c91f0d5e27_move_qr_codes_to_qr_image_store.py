@@ -0,0 +1,78 @@
+"""move qr codes to content-addressed qr_image store
+
+Revision ID: a3c91f0d5e27
+Revises: 58e262ebefc8
+Create Date: 2026-10-18 10:02:11.418203
+
+"""
+import base64
+import hashlib
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c91f0d5e27'
+down_revision = '58e262ebefc8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('qr_image',
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('data', sa.LargeBinary(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('sha256')
+    )
+    with op.batch_alter_table('landing_request', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('qr_hash', sa.String(length=64), nullable=True))
+
+    # Move existing base64 PNGs into the store, one copy per distinct image
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(
+        'SELECT id, qr_code FROM landing_request WHERE qr_code IS NOT NULL'
+    )).fetchall()
+    stored = set()
+    now = datetime.now(timezone.utc)
+    for row_id, qr_code in rows:
+        png = base64.b64decode(qr_code)
+        digest = hashlib.sha256(png).hexdigest()
+        if digest not in stored:
+            conn.execute(
+                sa.text('INSERT INTO qr_image (sha256, data, created_at) VALUES (:sha, :data, :now)'),
+                {'sha': digest, 'data': png, 'now': now},
+            )
+            stored.add(digest)
+        conn.execute(
+            sa.text('UPDATE landing_request SET qr_hash = :sha WHERE id = :id'),
+            {'sha': digest, 'id': row_id},
+        )
+
+    with op.batch_alter_table('landing_request', schema=None) as batch_op:
+        batch_op.create_foreign_key('fk_landing_request_qr_hash', 'qr_image', ['qr_hash'], ['sha256'])
+        batch_op.drop_column('qr_code')
+
+
+def downgrade():
+    with op.batch_alter_table('landing_request', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('qr_code', sa.Text(), nullable=True))
+
+    conn = op.get_bind()
+    rows = conn.execute(sa.text(
+        'SELECT lr.id, qi.data FROM landing_request lr '
+        'JOIN qr_image qi ON qi.sha256 = lr.qr_hash'
+    )).fetchall()
+    for row_id, png in rows:
+        conn.execute(
+            sa.text('UPDATE landing_request SET qr_code = :qr WHERE id = :id'),
+            {'qr': base64.b64encode(png).decode('utf-8'), 'id': row_id},
+        )
+
+    with op.batch_alter_table('landing_request', schema=None) as batch_op:
+        batch_op.drop_constraint('fk_landing_request_qr_hash', type_='foreignkey')
+        batch_op.drop_column('qr_hash')
+
+    op.drop_table('qr_image')
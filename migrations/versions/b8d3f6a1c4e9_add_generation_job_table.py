@@ -0,0 +1,43 @@
+"""add generation_job table
+
+Revision ID: b8d3f6a1c4e9
+Revises: e1f5a9c3d2b6
+Create Date: 2026-10-18 15:21:44.907312
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b8d3f6a1c4e9'
+down_revision = 'e1f5a9c3d2b6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('generation_job',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('landing_request_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=10), server_default='pending', nullable=False),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('worker', sa.String(length=64), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['landing_request_id'], ['landing_request.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('generation_job', schema=None) as batch_op:
+        batch_op.create_index('ix_generation_job_status_id', ['status', 'id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_generation_job_landing_request_id'), ['landing_request_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('generation_job', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_generation_job_landing_request_id'))
+        batch_op.drop_index('ix_generation_job_status_id')
+
+    op.drop_table('generation_job')
@@ -0,0 +1,50 @@
+"""unique index on active appointment slots
+
+Revision ID: c7e2d4b81f93
+Revises: a3c91f0d5e27
+Create Date: 2026-10-18 11:24:50.903117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7e2d4b81f93'
+down_revision = 'a3c91f0d5e27'
+branch_labels = None
+depends_on = None
+
+ACTIVE_SLOT_PREDICATE = sa.text("status != 'cancelled'")
+
+
+def upgrade():
+    conn = op.get_bind()
+    conn.execute(sa.text("UPDATE appointment SET status = 'pending' WHERE status IS NULL"))
+
+    # Earlier double bookings would violate the new index: keep the first
+    # booking of each slot and cancel the rest so the owner can still see them
+    conn.execute(sa.text(
+        "UPDATE appointment SET status = 'cancelled' "
+        "WHERE status != 'cancelled' AND id NOT IN ("
+        "  SELECT MIN(id) FROM appointment WHERE status != 'cancelled' "
+        "  GROUP BY landing_request_id, date, time"
+        ")"
+    ))
+
+    with op.batch_alter_table('appointment', schema=None) as batch_op:
+        batch_op.alter_column('status', existing_type=sa.String(length=20),
+                              nullable=False, server_default='pending')
+
+    op.create_index('uq_appointment_active_slot', 'appointment',
+                    ['landing_request_id', 'date', 'time'], unique=True,
+                    sqlite_where=ACTIVE_SLOT_PREDICATE,
+                    postgresql_where=ACTIVE_SLOT_PREDICATE)
+
+
+def downgrade():
+    op.drop_index('uq_appointment_active_slot', table_name='appointment')
+
+    with op.batch_alter_table('appointment', schema=None) as batch_op:
+        batch_op.alter_column('status', existing_type=sa.String(length=20),
+                              nullable=True, server_default=None)
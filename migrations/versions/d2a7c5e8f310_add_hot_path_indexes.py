@@ -0,0 +1,40 @@
+"""add indexes for hot foreign-key and lookup columns
+
+Revision ID: d2a7c5e8f310
+Revises: b8d3f6a1c4e9
+Create Date: 2026-10-18 16:05:31.662019
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2a7c5e8f310'
+down_revision = 'b8d3f6a1c4e9'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('landing_request', 'ix_landing_request_user_id_created_at', ['user_id', 'created_at']),
+    ('landing_request', 'ix_landing_request_email_user_id', ['email', 'user_id']),
+    ('landing_request', 'ix_landing_request_type_sector_created_at',
+     ['landing_type', 'sector', 'created_at']),
+    ('landing_request', 'ix_landing_request_sector_created_at', ['sector', 'created_at']),
+    ('landing_request', 'ix_landing_request_created_at', ['created_at']),
+    ('contact', 'ix_contact_request_id_created_at', ['request_id', 'created_at']),
+    ('landing_service', 'ix_landing_service_request_id_order', ['request_id', 'order']),
+    ('availability', 'ix_availability_request_day', ['landing_request_id', 'day_of_week']),
+    ('appointment', 'ix_appointment_request_date_time', ['landing_request_id', 'date', 'time']),
+]
+
+
+def upgrade():
+    for table, name, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for table, name, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
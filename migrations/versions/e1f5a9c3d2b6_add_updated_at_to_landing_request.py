@@ -0,0 +1,28 @@
+"""add updated_at to landing_request
+
+Revision ID: e1f5a9c3d2b6
+Revises: c7e2d4b81f93
+Create Date: 2026-10-18 12:40:07.215846
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e1f5a9c3d2b6'
+down_revision = 'c7e2d4b81f93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('landing_request', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    op.execute('UPDATE landing_request SET updated_at = created_at')
+
+
+def downgrade():
+    with op.batch_alter_table('landing_request', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
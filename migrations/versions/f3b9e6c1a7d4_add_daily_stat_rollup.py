@@ -0,0 +1,47 @@
+"""add daily_stat rollup table for the admin dashboard
+
+Revision ID: f3b9e6c1a7d4
+Revises: d2a7c5e8f310
+Create Date: 2026-10-18 17:12:08.431907
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b9e6c1a7d4'
+down_revision = 'd2a7c5e8f310'
+branch_labels = None
+depends_on = None
+
+
+# Same aggregation as stats_service.rebuild(), in SQL both SQLite and PostgreSQL accept
+BACKFILL = [
+    "INSERT INTO daily_stat (day, metric, dimension, count) "
+    "SELECT date(created_at), 'requests', landing_type || ':' || sector, count(id) "
+    "FROM landing_request WHERE created_at IS NOT NULL "
+    "GROUP BY date(created_at), landing_type, sector",
+] + [
+    f"INSERT INTO daily_stat (day, metric, dimension, count) "
+    f"SELECT date(created_at), '{metric}', '', count(id) "
+    f"FROM \"{table}\" WHERE created_at IS NOT NULL GROUP BY date(created_at)"
+    for metric, table in (('users', 'user'), ('contacts', 'contact'),
+                          ('appointments', 'appointment'))
+]
+
+
+def upgrade():
+    op.create_table('daily_stat',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('metric', sa.String(length=20), nullable=False),
+    sa.Column('dimension', sa.String(length=40), server_default='', nullable=False),
+    sa.Column('count', sa.Integer(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('day', 'metric', 'dimension')
+    )
+    for statement in BACKFILL:
+        op.execute(statement)
+
+
+def downgrade():
+    op.drop_table('daily_stat')
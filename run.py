@@ -1,7 +1,17 @@
+import os
+
 import click
 from app import create_app
 from app.extensions import db
 from app.models.user import User
+from app.services.export_service import export_profiles
+from app.services.generation_service import run_workers
+from app.services.import_service import (
+    IMPORT_BATCH_SIZE, ImportFormatError, import_landings, read_csv,
+)
+from app.services.landing_service import prune_qr_images, regenerate_qr_codes
+from app.services.stats_service import rebuild as rebuild_stats
+from config import Config
 
 app = create_app()
 
@@ -19,5 +29,89 @@ def make_admin(email):
     click.echo(f'{email} ahora es administrador.')
 
 
+@app.cli.command('export-profiles')
+@click.argument('out_dir', default='static_profiles')
+@click.option('--workers', default=os.cpu_count() or 1, show_default=True,
+              help='Processes used to render the pages.')
+@click.option('--force', is_flag=True, help='Re-render every profile, not only changed ones.')
+def export_profiles_command(out_dir, workers, force):
+    """Render public profiles to static HTML + QR PNG. Usage: flask export-profiles out/"""
+    count = export_profiles(out_dir, config_class=Config, workers=workers, force=force)
+    click.echo(f'{count} perfiles exportados en {out_dir}.')
+
+
+def _require_base_url(base_url):
+    """Refuse to build QR codes for http://localhost when no public URL is known."""
+    if not base_url and not app.config.get('SERVER_NAME'):
+        raise click.UsageError(
+            'Indica la URL pública del sitio (p. ej. https://tudominio.com) o configura SERVER_NAME.')
+
+
+@app.cli.command('regenerate-qr')
+@click.argument('base_url', required=False)
+@click.option('--slug', 'slugs', multiple=True, help='Only this profile (repeatable).')
+@click.option('--workers', default=os.cpu_count() or 1, show_default=True,
+              help='Processes used to render the QR codes.')
+def regenerate_qr_command(base_url, slugs, workers):
+    """Regenerate profile QR codes. Usage: flask regenerate-qr https://nuevo-dominio.com
+
+    BASE_URL defaults to SERVER_NAME; without either the command fails.
+    The images no profile uses any more are deleted afterwards.
+    """
+    _require_base_url(base_url)
+    count = regenerate_qr_codes(base_url, slugs=slugs or None, workers=workers)
+    pruned = prune_qr_images()
+    db.session.commit()
+    click.echo(f'{count} códigos QR regenerados, {pruned} imágenes sin uso eliminadas.')
+
+
+@app.cli.command('prune-qr')
+def prune_qr_command():
+    """Delete stored QR images no profile uses. Usage: flask prune-qr"""
+    pruned = prune_qr_images()
+    db.session.commit()
+    click.echo(f'{pruned} imágenes QR sin uso eliminadas.')
+
+
+@app.cli.command('generation-worker')
+@click.option('--workers', default=1, show_default=True, help='Worker processes to run.')
+@click.option('--once', is_flag=True, help='Exit when the queue is empty.')
+@click.option('--poll', default=1.0, show_default=True, help='Seconds between polls when idle.')
+def generation_worker_command(workers, once, poll):
+    """Generate landing HTML for queued requests. Usage: flask generation-worker --workers 4"""
+    run_workers(Config, workers=workers, once=once, poll_interval=poll)
+
+
+@app.cli.command('import-landings')
+@click.argument('csv_file', type=click.File('rb'))
+@click.option('--base-url', help='Public site the QR codes point at (default: SERVER_NAME).')
+@click.option('--workers', default=os.cpu_count() or 1, show_default=True,
+              help='Processes used to render the QR codes.')
+@click.option('--batch-size', default=IMPORT_BATCH_SIZE, show_default=True)
+def import_landings_command(csv_file, base_url, workers, batch_size):
+    """Create profiles from a CSV. Usage: flask import-landings colegiados.csv
+
+    --base-url defaults to SERVER_NAME; without either the command fails.
+    """
+    _require_base_url(base_url)
+    try:
+        rows = read_csv(csv_file)
+    except ImportFormatError as exc:
+        raise click.ClickException(str(exc))
+    report = import_landings(rows, base_url=base_url, workers=workers, batch_size=batch_size)
+    for row, errors in report.errors:
+        details = '; '.join(f'{field}: {" ".join(msgs)}' for field, msgs in errors.items())
+        click.echo(f'Fila {row}: {details}', err=True)
+    click.echo(f'{report.created} perfiles importados, {len(report.errors)} filas con errores.')
+
+
+@app.cli.command('rebuild-stats')
+def rebuild_stats_command():
+    """Recompute the admin dashboard rollups. Usage: flask rebuild-stats"""
+    rows = rebuild_stats()
+    db.session.commit()
+    click.echo(f'{rows} filas de estadísticas recalculadas.')
+
+
 if __name__ == '__main__':
     app.run(debug=True)
@@ -1,5 +1,8 @@
 """Fixtures compartidas para toda la suite de tests."""
+from contextlib import contextmanager
+
 import pytest
+from sqlalchemy import event
 from werkzeug.security import generate_password_hash
 
 from app import create_app
@@ -96,3 +99,39 @@ def make_landing(db, user=None, sector='abogatap', business_name='Despacho Test'
     db.session.add(svc)
     db.session.commit()
     return req
+
+
+@contextmanager
+def capture_sql(db, params=False):
+    """Recoge en una lista las sentencias SQL emitidas dentro del bloque.
+
+    Con ``params=True`` cada elemento es ``(sentencia, parámetros)``.
+    """
+    statements = []
+
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters) if params else statement)
+
+    event.listen(db.engine, 'before_cursor_execute', _before_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', _before_execute)
+
+
+@pytest.fixture
+def assert_num_queries(db):
+    """Context manager que falla si el bloque no emite exactamente *n* sentencias SQL.
+
+        with assert_num_queries(2):
+            client.get('/p/slug')
+    """
+    @contextmanager
+    def _assert_num_queries(expected):
+        with capture_sql(db) as statements:
+            yield statements
+        assert len(statements) == expected, (
+            f'Se esperaban {expected} consultas y hubo {len(statements)}:\n'
+            + '\n---\n'.join(statements)
+        )
+    return _assert_num_queries
@@ -1,4 +1,9 @@
 """Tests para el blueprint admin: control de acceso y vistas."""
+import re
+from datetime import datetime
+
+from app.models.landing import LandingRequest
+from app.services.landing_service import decode_cursor, encode_cursor, keyset_admin_orders
 from tests.conftest import make_user, make_admin, make_landing, login
 
 
@@ -103,3 +108,77 @@ def test_pedidos_paginacion(client, db):
     login(client, admin.email, 'adminpass')
     res = client.get('/admin/pedidos?page=1')
     assert res.status_code == 200
+
+
+# ---------------------------------------------------------------------------
+# Paginación por cursor (keyset)
+# ---------------------------------------------------------------------------
+
+def _pedidos(db, n, sector='abogatap'):
+    """Crea *n* pedidos; de dos en dos comparten created_at para probar el desempate por id."""
+    reqs = [make_landing(db, sector=sector, business_name=f'Negocio {i}') for i in range(n)]
+    for i, req in enumerate(reqs):
+        req.created_at = datetime(2026, 1, 1 + i // 2)
+    db.session.commit()
+    return reqs
+
+
+def _ids(page):
+    return [r.id for r in page.items]
+
+
+def test_keyset_recorre_todo_sin_repetir(db):
+    reqs = _pedidos(db, 11)
+    esperado = [r.id for r in sorted(reqs, key=lambda r: (r.created_at, r.id), reverse=True)]
+
+    vistos, cursor, pages = [], None, []
+    while True:
+        page = keyset_admin_orders(cursor, per_page=4)
+        pages.append(page)
+        vistos += _ids(page)
+        if not page.has_next:
+            break
+        cursor = page.next_cursor
+    assert vistos == esperado
+    assert [len(p.items) for p in pages] == [4, 4, 3]
+    assert not pages[0].has_prev
+
+    # Y hacia atrás se vuelve exactamente a las mismas páginas
+    anterior = keyset_admin_orders(pages[2].prev_cursor, per_page=4)
+    assert _ids(anterior) == _ids(pages[1])
+    primera = keyset_admin_orders(anterior.prev_cursor, per_page=4)
+    assert _ids(primera) == _ids(pages[0])
+    assert not primera.has_prev
+
+
+def test_keyset_respeta_filtros(db):
+    _pedidos(db, 3, sector='abogatap')
+    salud = _pedidos(db, 5, sector='saludtap')
+    page = keyset_admin_orders(per_page=3, filter_sector='saludtap')
+    siguiente = keyset_admin_orders(page.next_cursor, per_page=3, filter_sector='saludtap')
+    assert set(_ids(page) + _ids(siguiente)) == {r.id for r in salud}
+    assert not siguiente.has_next
+
+
+def test_cursor_opaco_ida_y_vuelta(db):
+    (req,) = _pedidos(db, 1)
+    token = encode_cursor('next', req)
+    assert str(req.id) not in token
+    assert decode_cursor(token) == ('next', req.created_at, req.id)
+
+
+def test_cursor_invalido_vuelve_a_la_primera_pagina(db):
+    _pedidos(db, 3)
+    assert _ids(keyset_admin_orders('basura!!', per_page=2)) == _ids(keyset_admin_orders(per_page=2))
+
+
+def test_pedidos_vista_con_cursor(client, db):
+    _pedidos(db, 30)
+    admin = make_admin(db)
+    login(client, admin.email, 'adminpass')
+    res = client.get('/admin/pedidos')
+    assert b'30 pedidos' in res.data
+    cursor = re.search(r'cursor=([\w-]+)', res.get_data(as_text=True)).group(1)
+    res = client.get(f'/admin/pedidos?cursor={cursor}')
+    assert res.status_code == 200
+    assert res.data.count(b'class="link-code"') == 5
@@ -0,0 +1,287 @@
+"""Tests para app/services/agenda_service.py: expansión de huecos y caché por slug."""
+import json
+import threading
+from datetime import date, timedelta
+
+import pytest
+
+from app import create_app
+from app.extensions import db as _db
+from app.models.availability import Availability
+from app.models.appointment import Appointment
+from app.services.agenda_service import agenda_json, book_slot, build_calendar, slot_times
+from app.services.cache import MISS, TTLCache
+from tests.conftest import TestConfig, make_user, make_landing, login, capture_sql
+
+
+def _next_weekday(weekday, start=None):
+    start = start or date.today()
+    return start + timedelta(days=(weekday - start.weekday()) % 7 or 7)
+
+
+def _con_agenda(db, days=(0,), start='09:00', end='12:00', minutes=60, user=None):
+    req = make_landing(db, user=user)
+    for day in days:
+        db.session.add(Availability(landing_request_id=req.id, day_of_week=day,
+                                    start_time=start, end_time=end, slot_minutes=minutes))
+    db.session.commit()
+    return req
+
+
+def _reservar(db, req, appt_date, appt_time, status='pending'):
+    appt = Appointment(landing_request_id=req.id, name='Cliente', date=appt_date,
+                       time=appt_time, status=status)
+    db.session.add(appt)
+    db.session.commit()
+    return appt
+
+
+# ---------------------------------------------------------------------------
+# slot_times
+# ---------------------------------------------------------------------------
+
+def test_slot_times_basico():
+    assert slot_times('09:00', '12:00', 60) == ['09:00', '10:00', '11:00']
+
+
+def test_slot_times_descarta_hueco_incompleto():
+    assert slot_times('09:00', '10:15', 30) == ['09:00', '09:30']
+
+
+def test_slot_times_minutos_invalidos():
+    assert slot_times('09:00', '12:00', 0) == []
+
+
+# ---------------------------------------------------------------------------
+# build_calendar
+# ---------------------------------------------------------------------------
+
+def test_build_calendar_sin_agenda_devuelve_none(app, db):
+    req = make_landing(db)
+    assert build_calendar(req) is None
+
+
+def test_build_calendar_solo_dias_configurados(app, db):
+    req = _con_agenda(db, days=(0, 2))
+    cal = build_calendar(req, start=date(2030, 1, 7), days=7)  # lunes
+    assert sorted(cal['free']) == ['2030-01-07', '2030-01-09']
+    assert cal['slots']['0'] == ['09:00', '10:00', '11:00']
+    assert cal['free']['2030-01-07'] == '111'
+
+
+def test_build_calendar_marca_reservas_y_ignora_canceladas(app, db):
+    req = _con_agenda(db, days=(0,))
+    lunes = date(2030, 1, 7)
+    _reservar(db, req, lunes, '10:00')
+    _reservar(db, req, lunes, '11:00', status='cancelled')
+    cal = build_calendar(req, start=lunes, days=7)
+    assert cal['free']['2030-01-07'] == '101'
+
+
+def test_build_calendar_dia_completo(app, db):
+    req = _con_agenda(db, days=(0,), end='11:00')
+    lunes = date(2030, 1, 7)
+    _reservar(db, req, lunes, '09:00')
+    _reservar(db, req, lunes, '10:00')
+    cal = build_calendar(req, start=lunes, days=1)
+    assert cal['free']['2030-01-07'] == '00'
+
+
+def test_build_calendar_consulta_solo_la_ventana(app, db):
+    req = _con_agenda(db, days=(0,))
+    lunes = date(2030, 1, 7)
+    _reservar(db, req, lunes - timedelta(days=7), '09:00')
+    _reservar(db, req, lunes + timedelta(days=7), '09:00')
+    cal = build_calendar(req, start=lunes, days=7)
+    assert cal['free'] == {'2030-01-07': '111'}
+
+
+# ---------------------------------------------------------------------------
+# AgendaCache / agenda_json
+# ---------------------------------------------------------------------------
+
+def test_agenda_json_expira_al_cambiar_de_dia(app, db):
+    from app.services.agenda_service import _cache
+    req = _con_agenda(db, days=tuple(range(7)))
+    agenda_json(req)
+    ayer = date.today() - timedelta(days=1)
+    _cache().set(req.public_slug, (ayer, 'viejo'))
+    assert agenda_json(req) != 'viejo'
+
+
+def test_ttl_cache_lru_limita_entradas():
+    cache = TTLCache(ttl=60, max_entries=2)
+    for key in ('a', 'b', 'c'):
+        cache.set(key, key)
+    assert cache.get('a') is MISS
+    assert cache.get('c') == 'c'
+
+
+def test_ttl_cache_expira():
+    cache = TTLCache(ttl=-1)
+    cache.set('a', 1)
+    assert cache.get('a') is MISS
+
+
+def test_agenda_json_segunda_llamada_no_consulta_bd(app, db):
+    req = _con_agenda(db, days=tuple(range(7)))
+    first = agenda_json(req)
+    with capture_sql(db) as statements:
+        second = agenda_json(req)
+    assert first == second
+    assert statements == []
+
+
+def test_reservar_invalida_cache(client, db):
+    req = _con_agenda(db, days=tuple(range(7)))
+    dia = _next_weekday(0)
+    client.get(f'/p/{req.public_slug}')
+    client.post(f'/p/{req.public_slug}/cita', data={
+        'name': 'Lucía', 'appt_date': dia.isoformat(), 'appt_time': '09:00',
+    })
+    cal = json.loads(agenda_json(req))
+    assert cal['free'][dia.isoformat()] == '011'
+
+
+def test_cambio_de_estado_invalida_cache(client, db):
+    user = make_user(db)
+    req = _con_agenda(db, days=tuple(range(7)), user=user)
+    dia = _next_weekday(0)
+    appt = _reservar(db, req, dia, '09:00')
+    assert json.loads(agenda_json(req))['free'][dia.isoformat()] == '011'
+
+    login(client, user.email, 'password123')
+    client.post(f'/dashboard/citas/{appt.id}/estado', data={'status': 'cancelled'})
+    assert json.loads(agenda_json(req))['free'][dia.isoformat()] == '111'
+
+
+def test_reactivar_cita_cancelada_con_hueco_ocupado(client, db):
+    user = make_user(db)
+    req = _con_agenda(db, days=tuple(range(7)), user=user)
+    dia = _next_weekday(0)
+    cancelada = _reservar(db, req, dia, '09:00', status='cancelled')
+    _reservar(db, req, dia, '09:00')
+    cancelada_id = cancelada.id
+
+    login(client, user.email, 'password123')
+    res = client.post(f'/dashboard/citas/{cancelada_id}/estado',
+                      data={'status': 'confirmed'}, follow_redirects=True)
+    assert res.status_code == 200
+    assert 'Ese horario ya está ocupado'.encode('utf-8') in res.data
+    assert db.session.get(Appointment, cancelada_id).status == 'cancelled'
+
+
+def test_editar_agenda_invalida_cache(client, db):
+    user = make_user(db)
+    req = _con_agenda(db, days=(0,), user=user)
+    assert '1' not in json.loads(agenda_json(req))['slots']
+
+    login(client, user.email, 'password123')
+    client.post(f'/dashboard/citas/{req.id}/agenda', data={
+        'days': ['0', '1'], 'start_time': '09:00', 'end_time': '12:00', 'slot_minutes': '60',
+    })
+    assert '1' in json.loads(agenda_json(req))['slots']
+
+
+def test_public_view_incluye_calendario(client, db):
+    req = _con_agenda(db, days=tuple(range(7)))
+    res = client.get(f'/p/{req.public_slug}')
+    assert res.status_code == 200
+    assert b'<script id="agenda-data" type="application/json">{"start"' in res.data
+
+
+# ---------------------------------------------------------------------------
+# Reserva: validación de hueco e inserción sin carreras
+# ---------------------------------------------------------------------------
+
+def _post_cita(client, req, dia, hora, nombre='Lucía'):
+    return client.post(f'/p/{req.public_slug}/cita', data={
+        'name': nombre, 'appt_date': dia.isoformat(), 'appt_time': hora,
+    }, follow_redirects=True)
+
+
+def test_book_slot_rechaza_hueco_ocupado(app, db):
+    req = _con_agenda(db)
+    dia = _next_weekday(0)
+    assert book_slot(landing_request_id=req.id, name='A', date=dia, time='09:00')
+    assert book_slot(landing_request_id=req.id, name='B', date=dia, time='09:00') is None
+    db.session.commit()
+    assert Appointment.query.count() == 1
+    assert Appointment.query.one().status == 'pending'
+
+
+def test_book_slot_hueco_cancelado_se_puede_reservar(app, db):
+    req = _con_agenda(db)
+    dia = _next_weekday(0)
+    _reservar(db, req, dia, '09:00', status='cancelled')
+    assert book_slot(landing_request_id=req.id, name='B', date=dia, time='09:00')
+
+
+def test_cita_ok(client, db):
+    req = _con_agenda(db)
+    res = _post_cita(client, req, _next_weekday(0), '10:00')
+    assert 'Cita reservada'.encode('utf-8') in res.data
+    assert Appointment.query.count() == 1
+
+
+def test_cita_hueco_ocupado(client, db):
+    req = _con_agenda(db)
+    dia = _next_weekday(0)
+    _post_cita(client, req, dia, '10:00')
+    res = _post_cita(client, req, dia, '10:00', nombre='Otro')
+    assert 'ya no está disponible'.encode('utf-8') in res.data
+    assert Appointment.query.count() == 1
+
+
+def test_cita_hora_fuera_de_agenda(client, db):
+    req = _con_agenda(db, start='09:00', end='12:00', minutes=60)
+    res = _post_cita(client, req, _next_weekday(0), '09:30')
+    assert 'no está disponible'.encode('utf-8') in res.data
+    assert Appointment.query.count() == 0
+
+
+def test_cita_dia_sin_agenda(client, db):
+    req = _con_agenda(db, days=(0,))
+    res = _post_cita(client, req, _next_weekday(1), '09:00')
+    assert 'no está disponible'.encode('utf-8') in res.data
+    assert Appointment.query.count() == 0
+
+
+@pytest.fixture
+def file_app(tmp_path):
+    """App sobre un SQLite en fichero: varias conexiones reales a la vez."""
+    class FileConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path / "concurrency.db"}'
+
+    application = create_app(FileConfig)
+    with application.app_context():
+        _db.create_all()
+        yield application
+        _db.session.remove()
+        _db.drop_all()
+
+
+def test_reservas_concurrentes_un_solo_ganador(file_app):
+    req = _con_agenda(_db, days=tuple(range(7)))
+    slug, dia = req.public_slug, _next_weekday(0)
+    threads_n = 16
+    barrier = threading.Barrier(threads_n)
+    statuses = []
+
+    def reservar(i):
+        client = file_app.test_client()
+        barrier.wait()
+        res = client.post(f'/p/{slug}/cita', data={
+            'name': f'Cliente {i}', 'appt_date': dia.isoformat(), 'appt_time': '09:00',
+        })
+        statuses.append(res.status_code)
+
+    threads = [threading.Thread(target=reservar, args=(i,)) for i in range(threads_n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert statuses == [302] * threads_n
+    _db.session.expire_all()
+    assert Appointment.query.filter_by(date=dia, time='09:00').count() == 1
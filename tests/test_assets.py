@@ -0,0 +1,92 @@
+"""Tests para los bundles CSS/JS con huella de la página pública (app/services/assets.py)."""
+import re
+
+from app.services import assets
+from app.services.assets import asset_bundle, build_assets
+from app.services.export_service import export_profiles
+from app.services.sectors import sector_registry
+from tests.conftest import make_landing
+
+
+def _assets(html):
+    return re.findall(r'/assets/([\w./-]+)', html)
+
+
+def test_pagina_publica_es_un_shell_con_bundles(client, db):
+    req = make_landing(db, sector='segurotap')
+    html = client.get(f'/p/{req.public_slug}').get_data(as_text=True)
+    assert '<style>' not in html
+    nombres = _assets(html)
+    assert any(re.fullmatch(r'profile\.[0-9a-f]{12}\.css', n) for n in nombres)
+    assert any(re.fullmatch(r'profile\.[0-9a-f]{12}\.js', n) for n in nombres)
+    assert any(n.startswith('sector-segurotap.') for n in nombres)
+
+
+def test_assets_se_sirven_inmutables(client, db):
+    req = make_landing(db)
+    for nombre in _assets(client.get(f'/p/{req.public_slug}').get_data(as_text=True)):
+        res = client.get(f'/assets/{nombre}')
+        assert res.status_code == 200
+        assert 'immutable' in res.headers['Cache-Control']
+        assert 'max-age=31536000' in res.headers['Cache-Control']
+    assert client.get('/assets/profile.000000000000.css').status_code == 404
+
+
+def test_css_por_sector_con_sus_colores(app):
+    abogatap = sector_registry().get('abogatap')
+    bundle = asset_bundle()
+    css = bundle.get(bundle.name_of('sector-abogatap.css')).data.decode()
+    assert f'--primary: {abogatap.primary}' in css
+    assert f'--bg-page: {abogatap.bg}' in css
+
+
+def test_huella_cambia_con_el_contenido(app, tmp_path):
+    (tmp_path / 'profile.css').write_text('body { color: red; }')
+    (tmp_path / 'profile.js').write_text('')
+    antes = build_assets([], source_dir=str(tmp_path)).name_of('profile.css')
+    (tmp_path / 'profile.css').write_text('body { color: blue; }')
+    despues = build_assets([], source_dir=str(tmp_path)).name_of('profile.css')
+    assert antes != despues
+
+
+def test_fuentes_propias(app, tmp_path):
+    fuentes = tmp_path / 'fonts'
+    fuentes.mkdir()
+    (fuentes / 'Inter-var.woff2').write_bytes(b'wOF2fake')
+    bundle = build_assets([], font_dir=str(fuentes))
+    fuente = bundle.name_of('fonts/Inter-var.woff2')
+    css = bundle.get(bundle.name_of('profile.css')).data.decode()
+    assert f"src: url('{fuente}')" in css
+    assert 'font-weight: 100 900' in css
+    assert bundle.get(fuente).mimetype == 'font/woff2'
+
+
+def test_google_fonts_hasta_tener_inter_propia(app, client, db, tmp_path, monkeypatch):
+    req = make_landing(db)
+    assert 'fonts.googleapis.com' in client.get(f'/p/{req.public_slug}').get_data(as_text=True)
+
+    fuentes = tmp_path / 'fonts'
+    fuentes.mkdir()
+    (fuentes / 'Inter-var.woff2').write_bytes(b'wOF2fake')
+    real = assets.build_assets
+    monkeypatch.setattr(assets, 'build_assets',
+                        lambda sectors: real(sectors, font_dir=str(fuentes)))
+    app.extensions.pop('assets')
+    app.extensions.pop('assets_stamp', None)
+    try:
+        bundle = asset_bundle()
+        css = bundle.get(bundle.name_of('profile.css')).data.decode()
+        assert "font-family: 'Inter'" in css
+        html = client.get(f'/p/{req.public_slug}').get_data(as_text=True)
+        assert 'fonts.googleapis.com' not in html
+    finally:
+        app.extensions.pop('assets')
+        app.extensions.pop('assets_stamp', None)
+
+
+def test_export_estatico_incluye_assets(app, db, tmp_path):
+    req = make_landing(db)
+    export_profiles(str(tmp_path))
+    html = (tmp_path / 'p' / f'{req.public_slug}.html').read_text(encoding='utf-8')
+    for nombre in _assets(html):
+        assert (tmp_path / 'assets' / nombre).exists()
@@ -0,0 +1,153 @@
+"""Tests para la compresión gzip/brotli de respuestas (app/services/compression.py)."""
+import gzip
+import re
+
+import pytest
+from flask import g
+from werkzeug.http import parse_accept_header
+
+from app import create_app
+from app.extensions import db as _db
+from app.services import compression
+from app.services.compression import CompressedOutputCache, compress_response, negotiate
+from tests.conftest import TestConfig, login, make_landing, make_user
+
+GZIP = {'Accept-Encoding': 'gzip, deflate'}
+
+
+def _accept(value):
+    return parse_accept_header(value)
+
+
+def test_negociacion_de_encoding(monkeypatch):
+    monkeypatch.setattr(compression, 'brotli', None)
+    assert negotiate(_accept('gzip, deflate, br')) == 'gzip'
+    assert negotiate(_accept('identity')) is None
+    assert negotiate(_accept('gzip;q=0')) is None
+    assert negotiate(_accept('*')) == 'gzip'
+    monkeypatch.setattr(compression, 'brotli', object())
+    assert negotiate(_accept('gzip, br')) == 'br'
+    assert negotiate(_accept('gzip, br;q=0.5')) == 'gzip'
+
+
+def test_pagina_publica_comprimida(client, db):
+    req = make_landing(db)
+    plano = client.get(f'/p/{req.public_slug}')
+    res = client.get(f'/p/{req.public_slug}', headers=GZIP)
+    assert 'Content-Encoding' not in plano.headers
+    assert res.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in res.headers['Vary']
+    assert int(res.headers['Content-Length']) < len(plano.data) / 2
+    assert gzip.decompress(res.data) == plano.data
+
+
+def test_cache_reutiliza_la_salida_comprimida(client, db):
+    req = make_landing(db)
+    cache = client.application.extensions['compressed_output']
+    client.get(f'/p/{req.public_slug}', headers=GZIP)
+    entradas = len(cache._cache)
+    for _ in range(3):
+        client.get(f'/p/{req.public_slug}', headers=GZIP)
+    assert len(cache._cache) == entradas
+
+
+def test_static_precomprimido_al_arrancar(client):
+    res = client.get('/static/css/style.css', headers=GZIP)
+    assert res.headers['Content-Encoding'] == 'gzip'
+    assert res.headers['ETag'].startswith('W/')
+    plano = client.get('/static/css/style.css')
+    assert gzip.decompress(res.data) == plano.data
+    assert ('css/style.css', 'gzip') in client.application.extensions['compressed_static']
+    # La revalidación sigue devolviendo 304 con el ETag débil
+    assert client.get('/static/css/style.css', headers={
+        **GZIP, 'If-None-Match': res.headers['ETag']}).status_code == 304
+
+
+def test_respuestas_que_no_se_comprimen(client, db):
+    assert 'Content-Encoding' not in client.get('/p/no-existe', headers=GZIP).headers
+    res = client.get('/csrf-token', headers=GZIP)  # JSON por debajo del tamaño mínimo
+    assert 'Content-Encoding' not in res.headers
+
+
+def test_empalme_gzip_equivale_al_cuerpo_completo():
+    cache = CompressedOutputCache(max_entries=8)
+    cuerpo = b'<html>' + b'texto repetido ' * 200 + b'TOKEN-A' + b' cola ' * 200 + b'</html>'
+    salida = cache.get_spliced(cuerpo, b'TOKEN-A')
+    assert gzip.decompress(salida) == cuerpo
+    otro = cuerpo.replace(b'TOKEN-A', b'TOKEN-BBBB')
+    assert gzip.decompress(cache.get_spliced(otro, b'TOKEN-BBBB')) == otro
+    assert len(cache._cache) == 1
+
+
+@pytest.fixture
+def app_csrf():
+    class CsrfConfig(TestConfig):
+        WTF_CSRF_ENABLED = True
+
+    application = create_app(CsrfConfig)
+    with application.app_context():
+        _db.create_all()
+        yield application
+        _db.session.remove()
+        _db.drop_all()
+
+
+def test_pagina_con_token_csrf_por_peticion(app_csrf):
+    req = make_landing(_db)
+    cuerpos = []
+    for _ in range(2):  # dos visitantes, dos sesiones y dos tokens
+        client = app_csrf.test_client()
+        with app_csrf.app_context():
+            res = client.get(f'/p/{req.public_slug}', headers=GZIP)
+        assert res.headers['Content-Encoding'] == 'gzip'
+        cuerpos.append(gzip.decompress(res.data).decode())
+    tokens = [re.search(r'name="csrf_token"[^>]*value="([^"]+)"', c) or
+              re.search(r'value="([^"]+)"[^>]*name="csrf_token"', c) for c in cuerpos]
+    assert all(tokens)
+    assert tokens[0].group(1) != tokens[1].group(1)
+    assert len(app_csrf.extensions['compressed_output']._cache) == 1
+
+
+def _respuesta_con_tokens(app, n, headers):
+    cuerpo = '<html>' + '<form><input name="csrf_token" value="TOKEN-SECRETO"></form>' * n
+    with app.test_request_context('/p/algo', headers=headers):
+        g.csrf_token = 'TOKEN-SECRETO'
+        res = app.response_class(cuerpo + 'texto ' * 200 + '</html>', mimetype='text/html')
+        return compress_response(res)
+
+
+def test_varios_tokens_csrf_no_se_comprimen(app):
+    res = _respuesta_con_tokens(app, 2, GZIP)
+    assert 'Content-Encoding' not in res.headers
+    assert len(app.extensions['compressed_output']._cache) == 0
+    assert _respuesta_con_tokens(app, 1, GZIP).headers['Content-Encoding'] == 'gzip'
+
+
+def test_brotli_con_token_usa_el_empalme_gzip_o_nada(app, monkeypatch):
+    monkeypatch.setattr(compression, 'brotli', object())  # compress() fallaría si se usara
+    res = _respuesta_con_tokens(app, 1, {'Accept-Encoding': 'br, gzip'})
+    assert res.headers['Content-Encoding'] == 'gzip'
+    assert b'TOKEN-SECRETO' in gzip.decompress(res.get_data())
+    res = _respuesta_con_tokens(app, 1, {'Accept-Encoding': 'br'})
+    assert 'Content-Encoding' not in res.headers
+
+
+def test_paginas_autenticadas_no_se_comprimen(client, db):
+    user = make_user(db)
+    make_landing(db, user=user)
+    login(client, user.email, 'password123')
+    res = client.get('/dashboard', headers=GZIP)
+    assert res.status_code == 200
+    assert len(res.data) > 500
+    assert 'Content-Encoding' not in res.headers
+    assert len(client.application.extensions['compressed_output']._cache) == 0
+
+
+def test_desactivada(monkeypatch):
+    class SinCompresion(TestConfig):
+        COMPRESS_ENABLED = False
+
+    application = create_app(SinCompresion)
+    res = application.test_client().get('/static/css/style.css', headers=GZIP)
+    assert 'Content-Encoding' not in res.headers
+    res.close()
@@ -1,6 +1,7 @@
 """Tests para el blueprint dashboard: índice, mensaje y CRUD de perfil/servicio."""
 from tests.conftest import make_user, make_landing, login
 from app.models.contact import Contact
+from app.services.cache import MISS
 
 
 # ---------------------------------------------------------------------------
@@ -152,3 +153,88 @@ def test_eliminar_servicio_otro_usuario_403(client, db):
     login(client, user.email, 'password123')
     res = client.post(f'/servicios/{svc.id}/eliminar')
     assert res.status_code == 403
+
+
+# ---------------------------------------------------------------------------
+# Contadores agregados y caché
+# ---------------------------------------------------------------------------
+
+def _con_actividad(db, user):
+    from datetime import date, timedelta
+    from app.models.appointment import Appointment
+    req = make_landing(db, user=user)
+    db.session.add_all([
+        Contact(request_id=req.id, name='Uno'),
+        Contact(request_id=req.id, name='Dos'),
+        Appointment(landing_request_id=req.id, name='Cita', time='09:00',
+                    date=date.today() + timedelta(days=1)),
+    ])
+    db.session.commit()
+    return req
+
+
+def test_request_counters_un_solo_select(app, db):
+    from app.services.dashboard_service import request_counters
+    from tests.conftest import capture_sql
+    user = make_user(db)
+    req = _con_actividad(db, user)
+    vacio = make_landing(db, user=user)
+    req_id, vacio_id = req.id, vacio.id
+    with capture_sql(db) as statements:
+        counters = request_counters([req_id, vacio_id])
+    assert len(statements) == 1
+    assert counters[req_id] == {'contacts': 2, 'contacts_12m': 2, 'appointments': 1,
+                                'services': 1, 'has_agenda': False}
+    assert counters[vacio_id]['contacts'] == 0
+
+
+def test_dashboard_muestra_totales(client, db):
+    user = make_user(db)
+    _con_actividad(db, user)
+    login(client, user.email, 'password123')
+    res = client.get('/dashboard')
+    assert res.status_code == 200
+    assert b'2 en total' in res.data
+    assert b'1 en total' in res.data
+
+
+def test_dashboard_consultas_acotadas(client, db):
+    from tests.conftest import capture_sql
+    user = make_user(db)
+    for _ in range(3):
+        _con_actividad(db, user)
+    login(client, user.email, 'password123')
+    with capture_sql(db) as primera:
+        client.get('/dashboard')
+    with capture_sql(db) as segunda:
+        client.get('/dashboard')
+    # Un único agregado, y en la segunda visita sale de caché
+    assert sum('GROUP BY' in sql for sql in primera) == 1
+    assert sum('GROUP BY' in sql for sql in segunda) == 0
+    # Ninguna carga perezosa por perfil
+    lazy = ('? = contact.request_id', '? = appointment.landing_request_id',
+            '? = landing_service.request_id', '? = availability.landing_request_id')
+    assert not any(fk in sql for sql in primera for fk in lazy)
+
+
+def test_nuevo_contacto_invalida_contadores(client, db):
+    user = make_user(db)
+    req = _con_actividad(db, user)
+    login(client, user.email, 'password123')
+    client.get('/dashboard')
+    client.post(f'/p/{req.public_slug}/contactar', data={'service_id': '0', 'name': 'Tres'})
+    res = client.get('/dashboard')
+    assert b'3 en total' in res.data
+
+
+def test_cambio_de_estado_invalida_contadores(client, db):
+    from app.models.appointment import Appointment
+    from app.services.dashboard_service import _cache
+    user = make_user(db)
+    req = _con_actividad(db, user)
+    appt_id = Appointment.query.filter_by(landing_request_id=req.id).one().id
+    login(client, user.email, 'password123')
+    client.get('/dashboard')
+    assert _cache().get(user.id) is not MISS
+    client.post(f'/dashboard/citas/{appt_id}/estado', data={'status': 'confirmed'})
+    assert _cache().get(user.id) is MISS
@@ -0,0 +1,129 @@
+"""Tests para las exportaciones CSV/NDJSON en streaming (app/services/data_export.py)."""
+import csv
+import io
+import json
+import tracemalloc
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import insert
+
+from app.models.appointment import Appointment
+from app.models.contact import Contact
+from tests.conftest import login, make_admin, make_landing, make_user
+
+
+def test_admin_exporta_pedidos_csv_con_enlace(client, db):
+    make_landing(db, user=make_user(db), business_name='Despacho, Pérez')
+    make_landing(db, sector='segurotap')
+    admin = make_admin(db)
+    login(client, admin.email, 'adminpass')
+
+    res = client.get('/admin/pedidos/exportar.csv?sector=abogatap')
+    assert res.status_code == 200
+    assert res.mimetype == 'text/csv'
+    assert 'filename="pedidos.csv"' in res.headers['Content-Disposition']
+    rows = list(csv.DictReader(io.StringIO(res.get_data(as_text=True))))
+    assert len(rows) == 1
+    assert rows[0]['negocio'] == 'Despacho, Pérez'
+    assert rows[0]['cliente'] == 'user@test.com'
+    assert rows[0]['enlace'].startswith('http://localhost/p/')
+
+
+def test_admin_exporta_ndjson(client, db):
+    req = make_landing(db)
+    admin = make_admin(db)
+    login(client, admin.email, 'adminpass')
+    res = client.get('/admin/pedidos/exportar.ndjson')
+    (line,) = res.get_data(as_text=True).splitlines()
+    fila = json.loads(line)
+    assert fila['id'] == req.id
+    assert fila['cliente'] == ''
+    assert fila['enlace'].endswith(f'/p/{req.public_slug}')
+
+
+def test_exportar_formato_desconocido_404(client, db):
+    admin = make_admin(db)
+    login(client, admin.email, 'adminpass')
+    assert client.get('/admin/pedidos/exportar.xlsx').status_code == 404
+
+
+def test_exportar_pedidos_usuario_normal_403(client, db):
+    make_user(db)
+    login(client, 'user@test.com', 'password123')
+    assert client.get('/admin/pedidos/exportar.csv').status_code == 403
+
+
+def test_profesional_exporta_solo_sus_contactos_y_citas(client, db):
+    user = make_user(db)
+    mio = make_landing(db, user=user)
+    ajeno = make_landing(db, user=make_user(db, email='otro@test.com'))
+    db.session.add_all([
+        Contact(request_id=mio.id, name='Ana', email='ana@test.com'),
+        Contact(request_id=ajeno.id, name='Luis'),
+        Appointment(landing_request_id=mio.id, name='Eva', date=date(2026, 1, 5), time='10:00'),
+        Appointment(landing_request_id=ajeno.id, name='Leo', date=date(2026, 1, 5), time='10:00'),
+    ])
+    db.session.commit()
+    login(client, user.email, 'password123')
+
+    contactos = list(csv.DictReader(io.StringIO(
+        client.get('/dashboard/solicitudes/exportar.csv').get_data(as_text=True))))
+    assert [c['nombre'] for c in contactos] == ['Ana']
+    citas = [json.loads(line) for line in
+             client.get('/dashboard/citas/exportar.ndjson').get_data(as_text=True).splitlines()]
+    assert [(c['nombre'], c['fecha'], c['hora']) for c in citas] == [('Eva', '2026-01-05', '10:00')]
+
+
+def test_csv_neutraliza_formulas_y_ndjson_no(client, db):
+    user = make_user(db)
+    mio = make_landing(db, user=user)
+    db.session.add(Contact(request_id=mio.id, name='=HYPERLINK("http://x.test")',
+                           phone='+34600111222', message='@SUM(A1)'))
+    db.session.commit()
+    login(client, user.email, 'password123')
+
+    contacto, = csv.DictReader(io.StringIO(
+        client.get('/dashboard/solicitudes/exportar.csv').get_data(as_text=True)))
+    assert contacto['nombre'] == '\'=HYPERLINK("http://x.test")'
+    assert contacto['telefono'] == "'+34600111222"
+    assert contacto['mensaje'] == "'@SUM(A1)"
+    assert contacto['email'] == ''
+    crudo = json.loads(client.get('/dashboard/solicitudes/exportar.ndjson').get_data(as_text=True))
+    assert crudo['nombre'] == '=HYPERLINK("http://x.test")'
+
+
+def test_exportar_sin_login_redirige(client):
+    assert client.get('/dashboard/solicitudes/exportar.csv').status_code == 302
+
+
+def test_exportacion_grande_en_memoria_constante(client, db):
+    """50k contactos se exportan sin que la memoria crezca con el número de filas."""
+    user = make_user(db)
+    req = make_landing(db, user=user)
+    now = datetime.now(timezone.utc)
+    total = 50_000
+    for start in range(0, total, 10_000):
+        db.session.execute(insert(Contact), [
+            {'request_id': req.id, 'name': f'Contacto {i}', 'email': f'c{i}@test.com',
+             'message': 'x' * 100, 'created_at': now - timedelta(seconds=i)}
+            for i in range(start, start + 10_000)
+        ])
+    db.session.commit()
+    login(client, user.email, 'password123')
+
+    tracemalloc.start()
+    try:
+        res = client.get('/dashboard/solicitudes/exportar.csv', buffered=False)
+        size = lines = 0
+        for chunk in res.response:
+            size += len(chunk)
+            lines += chunk.count(b'\n')
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        res.close()
+
+    assert lines == total + 1
+    assert size > 8_000_000
+    # Cargar las filas de golpe costaría decenas de MB; en streaming, la mitad de la salida como mucho
+    assert peak < 4_000_000, f'pico de {peak / 1e6:.1f} MB'
@@ -0,0 +1,106 @@
+"""Tests para el enrutado de lecturas a la réplica (app/services/db_routing.py).
+
+Dos ficheros SQLite hacen de primaria y réplica. El mismo perfil tiene un
+nombre distinto en cada uno, así se ve de cuál salió cada lectura.
+"""
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import create_app
+from app.extensions import db as _db
+from app.models.contact import Contact
+from app.models.landing import LandingRequest
+from tests.conftest import TestConfig
+
+
+@pytest.fixture
+def app(tmp_path):
+    class ReplicaConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path / "primaria.db"}'
+        SQLALCHEMY_BINDS = {'replica': f'sqlite:///{tmp_path / "replica.db"}'}
+        PAGE_CACHE_BACKEND = 'none'
+        DB_REPLICA_STICKY_SECONDS = 30
+
+    application = create_app(ReplicaConfig)
+    with application.app_context():
+        _db.create_all()
+        for key, nombre in ((None, 'Despacho Primaria'), ('replica', 'Despacho Réplica')):
+            engine = _db.engines[key]
+            _db.metadata.create_all(engine)
+            with Session(engine) as s:
+                s.add(LandingRequest(public_slug='perfil', landing_type='b2b',
+                                     sector='abogatap', business_name=nombre, contact_name=nombre,
+                                     description='', location=''))
+                s.commit()
+    yield application
+    with application.app_context():
+        for engine in _db.engines.values():
+            engine.dispose()
+    # init_app registra un MetaData global por bind; las demás apps no tienen réplica
+    _db.metadatas.pop('replica', None)
+
+
+def _get(app, client, url):
+    with app.app_context():  # contexto nuevo por petición, como en producción
+        return client.get(url).get_data(as_text=True)
+
+
+def test_get_anonimo_lee_de_la_replica(app):
+    assert 'Despacho Réplica' in _get(app, app.test_client(), '/p/perfil')
+
+
+def test_fuera_de_peticion_se_usa_la_primaria(app):
+    with app.app_context():
+        assert _db.session.scalar(select(LandingRequest.business_name)) == 'Despacho Primaria'
+
+
+def test_post_escribe_en_la_primaria_y_fija_al_visitante(app):
+    client = app.test_client()
+    with app.app_context():
+        res = client.post('/p/perfil/contactar', data={'name': 'Visitante'})
+    assert res.status_code == 302
+    with app.app_context():
+        assert _db.session.scalar(select(Contact.name)) == 'Visitante'
+        with Session(_db.engines['replica']) as s:
+            assert s.scalar(select(Contact.name)) is None
+    # Lee lo que acaba de escribir aunque la réplica vaya con retraso
+    assert 'Despacho Primaria' in _get(app, client, '/p/perfil')
+    # Otro visitante sigue leyendo de la réplica
+    assert 'Despacho Réplica' in _get(app, app.test_client(), '/p/perfil')
+
+
+def test_la_fijacion_caduca(app):
+    app.config['DB_REPLICA_STICKY_SECONDS'] = 0
+    client = app.test_client()
+    with app.app_context():
+        client.post('/p/perfil/contactar', data={'name': 'Visitante'})
+    assert 'Despacho Réplica' in _get(app, client, '/p/perfil')
+
+
+def test_select_for_update_va_a_la_primaria(app):
+    with app.test_request_context('/p/perfil'):
+        app.preprocess_request()
+        consulta = select(LandingRequest.business_name)
+        assert _db.session.scalar(consulta) == 'Despacho Réplica'
+        assert _db.session.scalar(consulta.with_for_update()) == 'Despacho Primaria'
+
+
+def test_tras_escribir_en_un_get_el_resto_va_a_la_primaria(app):
+    with app.test_request_context('/p/perfil'):
+        app.preprocess_request()
+        _db.session.add(Contact(request_id=1, name='Desde GET'))
+        _db.session.flush()
+        assert _db.session.scalar(select(LandingRequest.business_name)) == 'Despacho Primaria'
+        _db.session.rollback()
+
+
+def test_opciones_de_pool_solo_para_postgresql(monkeypatch):
+    from config import engine_options
+    monkeypatch.setenv('DB_POOL_SIZE', '20')
+    opciones = engine_options('postgresql+psycopg2://app@db/app')
+    assert opciones['pool_size'] == 20
+    assert opciones['pool_pre_ping'] is True
+    assert 'statement_timeout=15000' in opciones['connect_args']['options']
+    assert engine_options('sqlite:///app.db') == {}
+    assert engine_options(None) == {}
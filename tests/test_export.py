@@ -0,0 +1,119 @@
+"""Tests para la exportación estática de perfiles públicos (flask export-profiles)."""
+import json
+from datetime import date, timedelta
+
+from app import create_app
+from app.extensions import db as _db
+from app.models.availability import Availability
+from app.models.landing_service import LandingService
+from app.services.export_service import export_profiles, render_static_profile
+from app.services.landing_service import attach_qr
+from tests.conftest import TestConfig, make_landing
+
+
+def _con_qr(db, **kwargs):
+    req = make_landing(db, **kwargs)
+    attach_qr(req, f'https://ejemplo.com/p/{req.public_slug}')
+    db.session.commit()
+    return req
+
+
+def test_exporta_html_y_qr(app, db, tmp_path):
+    req = _con_qr(db, business_name='Despacho Estático')
+    assert export_profiles(str(tmp_path)) == 1
+    html = (tmp_path / 'p' / f'{req.public_slug}.html').read_text(encoding='utf-8')
+    assert 'Consulta legal' in html
+    png = (tmp_path / 'qr' / f'{req.public_slug}.png').read_bytes()
+    assert png[:4] == b'\x89PNG'
+    manifest = json.loads((tmp_path / 'manifest.json').read_text())
+    assert req.public_slug in manifest
+
+
+def test_export_incremental(app, db, tmp_path):
+    req = _con_qr(db)
+    _con_qr(db)
+    assert export_profiles(str(tmp_path)) == 2
+    assert export_profiles(str(tmp_path)) == 0
+
+    req.contact_name = 'Nombre Nuevo'
+    db.session.commit()
+    assert export_profiles(str(tmp_path)) == 1
+    html = (tmp_path / 'p' / f'{req.public_slug}.html').read_text(encoding='utf-8')
+    assert 'Nombre Nuevo' in html
+
+
+def test_export_force_reexporta_todo(app, db, tmp_path):
+    _con_qr(db)
+    export_profiles(str(tmp_path))
+    assert export_profiles(str(tmp_path), force=True) == 1
+
+
+def test_export_borra_perfiles_eliminados(app, db, tmp_path):
+    borrado = _con_qr(db)
+    queda = _con_qr(db)
+    export_profiles(str(tmp_path))
+    slug = borrado.public_slug
+    LandingService.query.filter_by(request_id=borrado.id).delete()
+    db.session.delete(borrado)
+    db.session.commit()
+
+    assert export_profiles(str(tmp_path), force=True) == 1
+    assert not (tmp_path / 'p' / f'{slug}.html').exists()
+    assert not (tmp_path / 'qr' / f'{slug}.png').exists()
+    assert (tmp_path / 'p' / f'{queda.public_slug}.html').exists()
+    assert set(json.loads((tmp_path / 'manifest.json').read_text())) == {queda.public_slug}
+
+
+def test_export_con_agenda_se_renueva_cada_dia(app, db, tmp_path):
+    req = _con_qr(db)
+    db.session.add(Availability(landing_request_id=req.id, day_of_week=0))
+    db.session.commit()
+    export_profiles(str(tmp_path))
+    manifest_path = tmp_path / 'manifest.json'
+    manifest = json.loads(manifest_path.read_text())
+    manifest[req.public_slug]['exported_on'] = (date.today() - timedelta(days=1)).isoformat()
+    manifest_path.write_text(json.dumps(manifest))
+    assert export_profiles(str(tmp_path)) == 1
+
+
+def test_reserva_marca_el_perfil_como_cambiado(client, db, tmp_path):
+    req = _con_qr(db)
+    db.session.add(Availability(landing_request_id=req.id, day_of_week=0))
+    db.session.commit()
+    export_profiles(str(tmp_path))
+    dia = date.today() + timedelta(days=(0 - date.today().weekday()) % 7 or 7)
+    client.post(f'/p/{req.public_slug}/cita', data={
+        'name': 'Lucía', 'appt_date': dia.isoformat(), 'appt_time': '09:00',
+    })
+    assert export_profiles(str(tmp_path)) == 1
+
+
+def test_html_estatico_sin_token_de_sesion(app, db):
+    app.config['WTF_CSRF_ENABLED'] = True
+    req = make_landing(db)
+    html = render_static_profile(req)
+    assert '__PAGE_CACHE_CSRF_TOKEN__' in html
+    assert "fetch('/csrf-token'" in html
+
+
+def test_csrf_token_endpoint(client):
+    res = client.get('/csrf-token')
+    assert res.status_code == 200
+    assert res.get_json()['csrf_token']
+    assert 'no-store' in res.headers['Cache-Control']
+
+
+def test_export_con_process_pool(tmp_path):
+    class FileConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path / "export.db"}'
+
+    application = create_app(FileConfig)
+    out = tmp_path / 'out'
+    with application.app_context():
+        _db.create_all()
+        slugs = [_con_qr(_db, business_name=f'Negocio {i}').public_slug for i in range(6)]
+        assert export_profiles(str(out), config_class=FileConfig,
+                               workers=2, chunk_size=2) == 6
+        _db.session.remove()
+        _db.drop_all()
+    assert sorted(p.stem for p in (out / 'p').iterdir()) == sorted(slugs)
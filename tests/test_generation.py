@@ -0,0 +1,172 @@
+"""Tests para la generación asíncrona de generated_html (app/services/generation_service.py)."""
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app import create_app
+from app.extensions import db as _db
+from app.models.generation_job import GenerationJob
+from app.models.landing import LandingRequest
+from app.services.generation_service import (
+    MAX_ATTEMPTS, claim_next_job, enqueue_generation, load_generator, offline_generator,
+    requeue_stale, work,
+)
+from tests.conftest import TestConfig, login, make_landing, make_user
+from tests.test_landing import FORM_BASE
+
+
+def stub_generator(req):
+    """Generador determinista y offline para los tests."""
+    return f'<html>{req.sector}:{req.public_slug}</html>'
+
+
+def _en_cola(db, n=1):
+    reqs = []
+    for i in range(n):
+        req = make_landing(db, business_name=f'Despacho {i}')
+        enqueue_generation(req)
+        reqs.append(req)
+    db.session.commit()
+    return reqs
+
+
+def test_crear_perfil_encola_sin_generar(client, db):
+    client.post('/comenzar', data=FORM_BASE)
+    req = LandingRequest.query.first()
+    job = GenerationJob.query.one()
+    assert job.landing_request_id == req.id
+    assert job.status == 'pending'
+    assert req.generated_html is None
+
+
+def test_worker_genera_y_guarda_html(db):
+    (req,) = _en_cola(db)
+    assert work(generator=stub_generator, once=True) == 1
+    db.session.expire_all()
+    assert req.generated_html == stub_generator(req)
+    job = GenerationJob.query.one()
+    assert job.status == 'done'
+    assert job.attempts == 1
+    assert job.finished_at is not None
+
+
+def test_worker_once_con_cola_vacia(db):
+    assert work(generator=stub_generator, once=True) == 0
+
+
+def test_fallo_reintenta_y_luego_queda_fallido(db):
+    _en_cola(db)
+
+    def roto(req):
+        raise RuntimeError('sin conexión')
+
+    for _ in range(MAX_ATTEMPTS):
+        assert work(generator=roto, once=True, max_jobs=1) == 1
+    job = GenerationJob.query.one()
+    assert job.status == 'failed'
+    assert job.attempts == MAX_ATTEMPTS
+    assert 'sin conexión' in job.error
+    assert work(generator=roto, once=True) == 0
+
+
+def test_requeue_stale_recupera_trabajos_huerfanos(db):
+    _en_cola(db)
+    job_id = claim_next_job('muerto')
+    job = db.session.get(GenerationJob, job_id)
+    job.started_at = datetime.now(timezone.utc) - timedelta(hours=1)
+    db.session.commit()
+    assert requeue_stale() == 1
+    assert db.session.get(GenerationJob, job_id).status == 'pending'
+
+
+def test_requeue_stale_no_reintenta_sin_limite(db):
+    _en_cola(db)
+    hace_una_hora = datetime.now(timezone.utc) - timedelta(hours=1)
+    # Cada intento tumba al worker: nunca llega a la rama de excepción de run_job
+    for _ in range(MAX_ATTEMPTS):
+        job_id = claim_next_job('muerto')
+        db.session.get(GenerationJob, job_id).started_at = hace_una_hora
+        db.session.commit()
+        requeue_stale()
+    db.session.expire_all()
+    job = db.session.get(GenerationJob, job_id)
+    assert job.status == 'failed'
+    assert job.attempts == MAX_ATTEMPTS
+    assert 'WorkerLost' in job.error
+    assert claim_next_job('otro') is None
+
+
+def test_offline_generator_es_determinista(db):
+    req = make_landing(db, business_name='Despacho <Pérez>')
+    html = offline_generator(req)
+    assert html == offline_generator(req)
+    assert '&lt;Pérez&gt;' in html
+
+
+def test_load_generator_desde_config(app):
+    app.config['LANDING_GENERATOR'] = 'tests.test_generation:stub_generator'
+    assert load_generator() is stub_generator
+
+
+def test_estado_json_y_detalle(client, db):
+    user = make_user(db)
+    login(client, 'user@test.com', 'password123')
+    client.post('/comenzar', data=FORM_BASE)
+    req = LandingRequest.query.first()
+    assert req.user_id == user.id
+
+    res = client.get(f'/mis-landings/{req.id}/generacion')
+    assert res.get_json() == {'status': 'pending', 'attempts': 0}
+    assert 'Estamos generando'.encode('utf-8') in client.get(f'/mis-landings/{req.id}').data
+
+    work(generator=stub_generator, once=True)
+    res = client.get(f'/mis-landings/{req.id}/generacion')
+    assert res.get_json()['status'] == 'done'
+
+
+def test_estado_de_otro_usuario_404(client, db):
+    otro = make_user(db, email='otro@test.com')
+    req = make_landing(db, user=otro)
+    make_user(db)
+    login(client, 'user@test.com', 'password123')
+    assert client.get(f'/mis-landings/{req.id}/generacion').status_code == 404
+
+
+@pytest.fixture
+def file_app(tmp_path):
+    """App sobre un SQLite en fichero para varios workers a la vez."""
+    class FileConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path / "jobs.db"}'
+
+    application = create_app(FileConfig)
+    with application.app_context():
+        _db.create_all()
+        yield application
+        _db.session.remove()
+        _db.drop_all()
+
+
+def test_workers_concurrentes_no_repiten_trabajos(file_app):
+    _en_cola(_db, n=20)
+    workers_n = 4
+    barrier = threading.Barrier(workers_n)
+    done = []
+
+    def trabajar(i):
+        with file_app.app_context():
+            barrier.wait()
+            done.append(work(worker=f'w{i}', generator=stub_generator, once=True))
+            _db.session.remove()
+
+    threads = [threading.Thread(target=trabajar, args=(i,)) for i in range(workers_n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sum(done) == 20
+    _db.session.expire_all()
+    jobs = GenerationJob.query.all()
+    assert {j.status for j in jobs} == {'done'}
+    assert {j.attempts for j in jobs} == {1}
@@ -0,0 +1,131 @@
+"""Tests para la importación masiva de perfiles desde CSV (app/services/import_service.py)."""
+import io
+
+import pytest
+
+from app.models.generation_job import GenerationJob
+from app.models.landing import LandingRequest
+from app.models.landing_service import LandingService
+from app.services import import_service
+from app.services.import_service import ImportFormatError, import_landings, read_csv
+from app.services.stats_service import totals
+from tests.conftest import login, make_admin, make_user
+
+CSV = (
+    'sector,contact_name,phone,email,service_1_title,service_1_description,service_2_title\n'
+    'abogatap,Ana Pérez,600111222,ana@test.com,Divorcios,Mutuo acuerdo,Herencias\n'
+    'segurotap,Luis Gil,,luis@test.com,Hogar,,\n'
+    'noexiste,Eva,600,,Algo,,\n'
+    'segurotap,Marta,600333444,,Vida,,\n'
+)
+
+
+def _importar(text, **kwargs):
+    return import_landings(read_csv(io.BytesIO(text.encode('utf-8'))), **kwargs)
+
+
+def test_importa_filas_validas_y_reporta_errores(db):
+    report = _importar(CSV, batch_size=1)
+    assert report.created == 2
+    assert [(fila, sorted(errores)) for fila, errores in report.errors] == [
+        (3, ['phone']), (4, ['sector'])]
+
+    ana = LandingRequest.query.filter_by(contact_name='Ana Pérez').one()
+    assert ana.landing_type == 'b2b' and ana.user_id is None
+    assert ana.qr_hash and ana.qr_image.data.startswith(b'\x89PNG')
+    assert [(s.title, s.description, s.order) for s in ana.services] == [
+        ('Divorcios', 'Mutuo acuerdo', 0), ('Herencias', None, 1)]
+    assert 'Divorcios' in ana.generated_prompt
+    assert GenerationJob.query.filter_by(status='pending').count() == 2
+    assert LandingService.query.count() == 3
+
+
+def test_importacion_cuenta_en_estadisticas(db):
+    _importar(CSV)
+    t = totals()
+    assert t['total'] == 2
+    assert dict(t['sectors']) == {'abogatap': 1, 'segurotap': 1}
+
+
+def test_qr_apunta_a_base_url(db, monkeypatch):
+    urls = []
+    real = import_service.generate_qr_batch
+
+    def espia(batch, **kwargs):
+        urls.extend(batch)
+        return real(batch, **kwargs)
+
+    monkeypatch.setattr(import_service, 'generate_qr_batch', espia)
+    _importar(CSV, base_url='https://tarjetas.example.com/')
+    assert urls and all(u.startswith('https://tarjetas.example.com/p/') for u in urls)
+
+
+def test_sin_base_url_ni_server_name_no_importa_nada(app, db):
+    app.config['SERVER_NAME'] = None
+    with pytest.raises(ValueError):
+        _importar(CSV)
+    assert LandingRequest.query.count() == 0
+
+
+def test_csv_sin_columnas_obligatorias():
+    with pytest.raises(ImportFormatError, match='phone'):
+        read_csv(io.StringIO('sector,contact_name\nabogatap,Ana\n'))
+
+
+def test_csv_no_utf8_no_importa_nada(client, db):
+    admin = make_admin(db)
+    login(client, admin.email, 'adminpass')
+    res = client.post('/admin/importar', data={
+        'archivo': (io.BytesIO(CSV.encode('latin-1')), 'colegiados.csv'),
+    }, content_type='multipart/form-data')
+    assert res.status_code == 200
+    assert 'no está codificado en UTF-8' in res.get_data(as_text=True)
+    assert LandingRequest.query.count() == 0
+
+
+def test_csv_con_comillas_mal_cerradas(db):
+    texto = CSV + 'abogatap,"Juan,600555666,,Penal,,\n'
+    with pytest.raises(ImportFormatError, match='mal formado'):
+        _importar(texto, batch_size=1)
+    assert LandingRequest.query.count() == 0
+
+
+def test_slug_repetido_descarta_el_lote_y_lo_reporta(db, monkeypatch):
+    _importar(CSV)
+    repetido = LandingRequest.query.first().public_slug
+    monkeypatch.setattr(import_service, 'generate_slug', lambda: repetido)
+    report = _importar(CSV, batch_size=1)
+    assert report.created == 0
+    assert [fila for fila, _ in report.errors] == [2, 3, 4, 5]
+    assert 'public_slug' in dict(report.errors)[2]
+    assert LandingRequest.query.count() == 2
+
+
+def test_csv_con_bom(db):
+    assert _importar('﻿' + CSV).created == 2
+
+
+def test_admin_sube_csv(client, db):
+    admin = make_admin(db)
+    login(client, admin.email, 'adminpass')
+    res = client.post('/admin/importar', data={
+        'archivo': (io.BytesIO(CSV.encode('utf-8')), 'colegiados.csv'),
+    }, content_type='multipart/form-data')
+    assert res.status_code == 200
+    html = res.get_data(as_text=True)
+    assert '2 perfiles importados' in html
+    assert '2 filas con errores' in html
+    assert LandingRequest.query.count() == 2
+
+
+def test_admin_importar_sin_archivo(client, db):
+    admin = make_admin(db)
+    login(client, admin.email, 'adminpass')
+    res = client.post('/admin/importar', data={}, content_type='multipart/form-data')
+    assert 'Selecciona un archivo CSV' in res.get_data(as_text=True)
+
+
+def test_importar_usuario_normal_403(client, db):
+    make_user(db)
+    login(client, 'user@test.com', 'password123')
+    assert client.get('/admin/importar').status_code == 403
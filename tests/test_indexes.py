@@ -0,0 +1,102 @@
+"""EXPLAIN QUERY PLAN de las consultas calientes: deben usar un índice, no recorrer la tabla."""
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.models.appointment import Appointment
+from app.models.availability import Availability
+from app.models.contact import Contact
+from app.models.landing import LandingRequest
+from app.models.user import User
+from app.services.agenda_service import booked_slots, is_bookable
+from app.services.dashboard_service import recent_contacts, request_counters, upcoming_appointments
+from app.services.generation_service import claim_next_job
+from app.services.landing_service import (
+    admin_orders_query, dashboard_landings_query, encode_cursor, keyset_admin_orders,
+    my_landings_query, profile_by_slug_or_404,
+)
+from tests.conftest import capture_sql, make_landing, make_user
+
+# Tablas que nunca deben recorrerse enteras en una consulta caliente
+HOT_TABLES = ('landing_request', 'contact', 'landing_service', 'availability',
+              'appointment', 'generation_job', 'user')
+
+
+def _planned(executed):
+    """Los SELECT/UPDATE/DELETE de *executed*, que son los que tienen plan de consulta."""
+    return [(sql, params) for sql, params in executed
+            if sql.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE'))]
+
+
+def _full_scans(db, statement, parameters):
+    rows = db.session.connection().exec_driver_sql(
+        'EXPLAIN QUERY PLAN ' + statement, parameters).fetchall()
+    details = [row[-1] for row in rows]
+    scans = [d for d in details
+             if d.startswith('SCAN ') and 'USING' not in d
+             and d.split()[1].strip('"') in HOT_TABLES]
+    return scans, details
+
+
+@pytest.fixture
+def datos(db):
+    user = make_user(db)
+    otro = make_user(db, email='otro@test.com')
+    reqs = [make_landing(db, user=u, sector=s)
+            for u in (user, otro) for s in ('abogatap', 'segurotap')]
+    req = reqs[0]
+    req.email = 'cliente@test.com'
+    now = datetime.now(timezone.utc)
+    for i, r in enumerate(reqs):
+        db.session.add(Contact(request_id=r.id, name=f'C{i}', created_at=now - timedelta(days=i)))
+        db.session.add(Availability(landing_request_id=r.id, day_of_week=i % 7))
+        db.session.add(Appointment(landing_request_id=r.id, name=f'A{i}',
+                                   date=date.today() + timedelta(days=i), time='09:00'))
+    db.session.commit()
+    return {'user': user, 'req': req, 'ids': [r.id for r in reqs]}
+
+
+HOT_QUERIES = {
+    'mis_landings': lambda d: my_landings_query(d['user'].id).all(),
+    'dashboard_landings': lambda d: dashboard_landings_query(d['user'].id).all(),
+    'reclamar_por_email': lambda d: LandingRequest.query.filter_by(
+        email='cliente@test.com', user_id=None).update({'user_id': d['user'].id}),
+    'login_email': lambda d: User.query.filter_by(email='user@test.com').first(),
+    'contadores_dashboard': lambda d: request_counters(d['ids'][:2]),
+    'contactos_recientes': lambda d: recent_contacts(d['ids'][:2]),
+    'citas_proximas': lambda d: upcoming_appointments(d['ids'][:2]),
+    'servicios_del_perfil': lambda d: d['req'].services,
+    'slot_reservable': lambda d: is_bookable(d['req'].id, date.today(), '09:00'),
+    'citas_ocupadas': lambda d: booked_slots(d['req'].id, date.today(),
+                                             date.today() + timedelta(days=90)),
+    'perfil_publico': lambda d: profile_by_slug_or_404(d['req'].public_slug, 'public_view'),
+    'pedidos_admin': lambda d: admin_orders_query().limit(25).all(),
+    'pedidos_admin_tipo': lambda d: admin_orders_query('b2c').limit(25).all(),
+    'pedidos_admin_sector': lambda d: admin_orders_query('', 'segurotap').limit(25).all(),
+    'pedidos_admin_tipo_sector': lambda d: admin_orders_query('b2c', 'abogatap').limit(25).all(),
+    'pedidos_admin_cursor': lambda d: keyset_admin_orders(
+        encode_cursor('next', d['req']), filter_type='b2c', filter_sector='abogatap'),
+    'pedidos_admin_cursor_atras': lambda d: keyset_admin_orders(
+        encode_cursor('prev', d['req']), filter_sector='abogatap'),
+    'cola_de_generacion': lambda d: claim_next_job('w1'),
+}
+
+
+@pytest.mark.parametrize('name', sorted(HOT_QUERIES))
+def test_consulta_caliente_usa_indice(db, datos, name):
+    db.session.expire_all()
+    with capture_sql(db, params=True) as executed:
+        HOT_QUERIES[name](datos)
+    executed = _planned(executed)
+    assert executed, f'{name} no emitió SQL'
+    for statement, parameters in executed:
+        scans, plan = _full_scans(db, statement, parameters)
+        assert not scans, f'{name}: recorrido completo\n{statement}\n' + '\n'.join(plan)
+
+
+def test_pedidos_admin_sin_ordenacion_temporal(db, datos):
+    """El índice (landing_type, sector, created_at) también sirve el ORDER BY."""
+    with capture_sql(db, params=True) as executed:
+        admin_orders_query('b2c', 'abogatap').limit(25).all()
+    _, plan = _full_scans(db, *_planned(executed)[0])
+    assert not any('TEMP B-TREE' in step for step in plan), '\n'.join(plan)
@@ -50,8 +50,8 @@ def test_crear_ok_genera_qr(client, db):
     from app.models.landing import LandingRequest
     client.post('/comenzar', data=FORM_BASE)
     req = LandingRequest.query.first()
-    assert req.qr_code is not None
-    assert len(req.qr_code) > 100  # base64 PNG no está vacío
+    assert req.qr_hash is not None
+    assert req.qr_image.data[:4] == b'\x89PNG'
 
 
 def test_crear_ok_genera_prompt(client, db):
@@ -94,6 +94,79 @@ def test_resultado_slug_inexistente_404(client):
     assert res.status_code == 404
 
 
+def test_resultado_enlaza_qr_sin_data_uri(client, db):
+    client.post('/comenzar', data=FORM_BASE)
+    from app.models.landing import LandingRequest
+    req = LandingRequest.query.first()
+    res = client.get(f'/resultado/{req.public_slug}')
+    assert f'/qr/{req.public_slug}.png'.encode() in res.data
+    assert b'data:image/png;base64' not in res.data
+
+
+# ---------------------------------------------------------------------------
+# /qr/<slug>.png
+# ---------------------------------------------------------------------------
+
+def test_qr_png_ok(client, db):
+    from app.models.landing import LandingRequest
+    client.post('/comenzar', data=FORM_BASE)
+    req = LandingRequest.query.first()
+    res = client.get(f'/qr/{req.public_slug}.png')
+    assert res.status_code == 200
+    assert res.mimetype == 'image/png'
+    assert res.data[:4] == b'\x89PNG'
+    assert res.headers['ETag'] == f'"{req.qr_hash}"'
+    assert 'max-age' in res.headers['Cache-Control']
+
+
+def test_qr_png_etag_devuelve_304(client, db):
+    from app.models.landing import LandingRequest
+    client.post('/comenzar', data=FORM_BASE)
+    req = LandingRequest.query.first()
+    res = client.get(f'/qr/{req.public_slug}.png',
+                     headers={'If-None-Match': f'"{req.qr_hash}"'})
+    assert res.status_code == 304
+    assert res.data == b''
+
+
+def test_qr_png_sin_qr_404(client, db):
+    req = make_landing(db)
+    res = client.get(f'/qr/{req.public_slug}.png')
+    assert res.status_code == 404
+
+
+def test_qr_png_slug_inexistente_404(client):
+    res = client.get('/qr/slug-inventado.png')
+    assert res.status_code == 404
+
+
+def test_qr_svg_ok_y_revalidable(client, db):
+    req = make_landing(db)
+    res = client.get(f'/qr/{req.public_slug}.svg')
+    assert res.status_code == 200
+    assert res.mimetype == 'image/svg+xml'
+    assert b'<svg' in res.data
+    again = client.get(f'/qr/{req.public_slug}.svg',
+                       headers={'If-None-Match': res.headers['ETag']})
+    assert again.status_code == 304
+
+
+def test_qr_svg_slug_inexistente_404(client):
+    res = client.get('/qr/slug-inventado.svg')
+    assert res.status_code == 404
+
+
+def test_qr_png_usa_opciones_de_config(app, client, db):
+    from app.models.landing import LandingRequest
+    from app.services.landing_service import QrOptions, generate_qr_png
+    app.config.update(QR_FORMAT='png-optimized', QR_BOX_SIZE=4)
+    client.post('/comenzar', data=FORM_BASE)
+    req = LandingRequest.query.first()
+    res = client.get(f'/qr/{req.public_slug}.png')
+    url = f'http://localhost/p/{req.public_slug}'
+    assert res.data == generate_qr_png(url, QrOptions(box_size=4, format='png-optimized'))
+
+
 # ---------------------------------------------------------------------------
 # /mis-landings
 # ---------------------------------------------------------------------------
@@ -176,6 +249,31 @@ def test_public_view_slug_inexistente_404(client):
     assert res.status_code == 404
 
 
+def test_public_view_sin_agenda_numero_de_consultas(client, db, assert_num_queries):
+    """Perfil + servicios en un SELECT; una consulta más para ver que no hay agenda."""
+    req = make_landing(db)
+    slug = req.public_slug
+    with assert_num_queries(2):
+        res = client.get(f'/p/{slug}')
+    assert res.status_code == 200
+    assert b'Consulta legal' in res.data
+
+
+def test_public_view_con_agenda_numero_de_consultas(client, db, assert_num_queries):
+    """Primera visita: perfil+servicios, disponibilidad y reservas. Después, caché de página."""
+    from app.models.availability import Availability
+    req = make_landing(db)
+    db.session.add(Availability(landing_request_id=req.id, day_of_week=0))
+    db.session.commit()
+    slug = req.public_slug
+    with assert_num_queries(3):
+        client.get(f'/p/{slug}')
+    with assert_num_queries(0):
+        res = client.get(f'/p/{slug}')
+    assert b'Consulta legal' in res.data
+    assert b'id="agenda-data"' in res.data
+
+
 # ---------------------------------------------------------------------------
 # /p/<slug>/contactar — captura de lead
 # ---------------------------------------------------------------------------
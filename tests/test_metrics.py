@@ -0,0 +1,91 @@
+"""Tests para las métricas por endpoint y /admin/metrics (app/services/metrics.py)."""
+import logging
+import re
+
+from app import create_app
+from app.services.metrics import Histogram, metrics
+from tests.conftest import TestConfig, login, make_admin, make_landing, make_user
+
+
+def _valor(texto, serie):
+    m = re.search(rf'^{re.escape(serie)} (\S+)$', texto, re.MULTILINE)
+    return float(m.group(1)) if m else None
+
+
+def test_metricas_solo_para_admin(client, db):
+    assert client.get('/admin/metrics').status_code == 302  # al login
+    make_user(db)
+    login(client, 'user@test.com', 'password123')
+    assert client.get('/admin/metrics').status_code == 403
+
+
+def test_peticiones_y_consultas_por_endpoint(client, db):
+    req = make_landing(db)
+    for _ in range(3):
+        client.get(f'/p/{req.public_slug}')
+    client.get('/no-existe')
+    make_admin(db)
+    login(client, 'admin@test.com', 'adminpass')
+    res = client.get('/admin/metrics')
+    assert res.status_code == 200
+    assert res.mimetype == 'text/plain'
+    texto = res.get_data(as_text=True)
+    assert _valor(texto, 'http_requests_total{endpoint="landing.public_view",method="GET",'
+                         'status="200"}') == 3
+    assert _valor(texto, 'http_requests_total{endpoint="<unmatched>",method="GET",'
+                         'status="404"}') == 1
+    assert _valor(texto, 'http_request_duration_seconds_count'
+                         '{endpoint="landing.public_view"}') == 3
+    assert _valor(texto, 'http_request_duration_seconds_bucket'
+                         '{endpoint="landing.public_view",le="+Inf"}') == 3
+    assert _valor(texto, 'db_queries_total{endpoint="landing.public_view"}') >= 1
+    assert _valor(texto, 'db_query_duration_seconds_total{endpoint="landing.public_view"}') > 0
+    assert '# TYPE http_request_duration_seconds histogram' in texto
+
+
+def test_metodos_desconocidos_se_agrupan(client, db):
+    req = make_landing(db)
+    for metodo in ('FOO', 'BAR', 'X' * 50):
+        client.open(f'/p/{req.public_slug}', method=metodo)
+    client.delete(f'/p/{req.public_slug}')
+    texto = metrics().render()
+    assert _valor(texto, 'http_requests_total{endpoint="<unmatched>",method="OTHER",'
+                         'status="405"}') == 3
+    assert _valor(texto, 'http_requests_total{endpoint="<unmatched>",method="DELETE",'
+                         'status="405"}') == 1
+    assert 'FOO' not in texto
+
+
+def test_consultas_lentas_en_el_log(db, caplog):
+    class Lenta(TestConfig):
+        SLOW_QUERY_MS = 0
+
+    lenta = create_app(Lenta)
+    with lenta.app_context():
+        db.create_all()
+        req = make_landing(db)
+        with caplog.at_level(logging.WARNING, logger='app.services.metrics'):
+            lenta.test_client().get(f'/p/{req.public_slug}')
+        assert any('slow query' in r.getMessage() and 'landing.public_view' in r.getMessage()
+                   for r in caplog.records)
+        texto = metrics().render()
+        assert _valor(texto, 'db_slow_queries_total{endpoint="landing.public_view"}') >= 1
+        db.drop_all()
+
+
+def test_histograma_acumulativo():
+    h = Histogram()
+    for segundos in (0.001, 0.02, 0.02, 30):
+        h.observe(segundos)
+    assert h.counts[0] == 1       # <= 5 ms
+    assert h.counts[2] == 2       # <= 25 ms
+    assert h.counts[-1] == 1      # +Inf
+    assert round(h.sum, 3) == 30.041
+
+
+def test_desactivadas():
+    class SinMetricas(TestConfig):
+        METRICS_ENABLED = False
+
+    app = create_app(SinMetricas)
+    assert 'metrics' not in app.extensions
@@ -0,0 +1,163 @@
+"""Tests para la caché de páginas públicas /p/<slug>."""
+import re
+from datetime import date, timedelta
+
+import pytest
+
+from app import create_app
+from app.extensions import db as _db
+from app.models.availability import Availability
+from app.services.page_cache import FilePageCache, invalidate_page
+from tests.conftest import TestConfig, make_user, make_landing, login
+
+
+def _get(client, req):
+    return client.get(f'/p/{req.public_slug}')
+
+
+def test_segunda_visita_sale_de_cache(client, db):
+    req = make_landing(db)
+    assert _get(client, req).headers['X-Page-Cache'] == 'MISS'
+    res = _get(client, req)
+    assert res.headers['X-Page-Cache'] == 'HIT'
+    assert b'Consulta legal' in res.data
+
+
+def test_slug_inexistente_no_se_cachea(client):
+    assert client.get('/p/no-existe').status_code == 404
+    assert client.get('/p/no-existe').status_code == 404
+
+
+def test_con_mensajes_flash_no_usa_cache(client, db):
+    req = make_landing(db)
+    _get(client, req)
+    res = client.post(f'/p/{req.public_slug}/contactar',
+                      data={'service_id': '0', 'name': 'Ana'}, follow_redirects=True)
+    assert b'Gracias' in res.data
+    # La página con el mensaje no se guarda: la siguiente visita no lo muestra
+    res = _get(client, req)
+    assert res.headers['X-Page-Cache'] == 'HIT'
+    assert b'Gracias' not in res.data
+
+
+def test_reservar_invalida_pagina(client, db):
+    req = make_landing(db)
+    db.session.add(Availability(landing_request_id=req.id, day_of_week=0))
+    db.session.commit()
+    dia = date.today() + timedelta(days=(0 - date.today().weekday()) % 7 or 7)
+    _get(client, req)
+    client.post(f'/p/{req.public_slug}/cita', data={
+        'name': 'Lucía', 'appt_date': dia.isoformat(), 'appt_time': '09:00',
+    })
+    client.get('/')  # consume el flash de la reserva
+    assert _get(client, req).headers['X-Page-Cache'] == 'MISS'
+
+
+def test_editar_agenda_invalida_pagina(client, db):
+    user = make_user(db)
+    req = make_landing(db, user=user)
+    login(client, user.email, 'password123')
+    _get(client, req)
+    client.post(f'/dashboard/citas/{req.id}/agenda', data={'days': ['0']},
+                follow_redirects=True)
+    res = _get(client, req)
+    assert res.headers['X-Page-Cache'] == 'MISS'
+    assert b'id="agenda-data"' in res.data
+
+
+def test_invalidate_page(client, db):
+    req = make_landing(db)
+    _get(client, req)
+    invalidate_page(req.public_slug)
+    assert _get(client, req).headers['X-Page-Cache'] == 'MISS'
+
+
+# ---------------------------------------------------------------------------
+# CSRF: la copia cacheada se comparte entre sesiones
+# ---------------------------------------------------------------------------
+
+@pytest.fixture
+def csrf_app():
+    """App con CSRF activo. Las peticiones se hacen fuera del app context del test
+    para que cada una tenga su propio `g` (y su propio token), como en producción."""
+    class CsrfConfig(TestConfig):
+        WTF_CSRF_ENABLED = True
+
+    application = create_app(CsrfConfig)
+    with application.app_context():
+        _db.create_all()
+    yield application
+    with application.app_context():
+        _db.session.remove()
+        _db.drop_all()
+
+
+def _csrf_token(html):
+    return re.search(rb'name="csrf_token" type="hidden" value="([^"]+)"', html).group(1)
+
+
+def test_cada_sesion_recibe_su_token_csrf(csrf_app):
+    with csrf_app.app_context():
+        slug = make_landing(_db).public_slug
+    primero, segundo = csrf_app.test_client(), csrf_app.test_client()
+    res1 = primero.get(f'/p/{slug}')
+    res2 = segundo.get(f'/p/{slug}')
+    assert res2.headers['X-Page-Cache'] == 'HIT'
+    assert b'__PAGE_CACHE_CSRF_TOKEN__' not in res2.data
+    assert _csrf_token(res1.data) != _csrf_token(res2.data)
+
+    # El token inyectado es válido para la sesión que lo recibió
+    res = segundo.post(f'/p/{slug}/contactar', data={
+        'csrf_token': _csrf_token(res2.data).decode(), 'service_id': '0', 'name': 'Ana',
+    }, follow_redirects=True)
+    assert b'Gracias' in res.data
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+def test_file_backend_ida_y_vuelta(tmp_path):
+    cache = FilePageCache(str(tmp_path), ttl=60)
+    cache.set('p:abc', 'día\n<html>ñ</html>')
+    assert cache.get('p:abc') == 'día\n<html>ñ</html>'
+    cache.delete('p:abc')
+    assert cache.get('p:abc') is None
+
+
+def test_file_backend_expira(tmp_path):
+    cache = FilePageCache(str(tmp_path), ttl=-1)
+    cache.set('p:abc', 'x')
+    assert cache.get('p:abc') is None
+
+
+def test_backend_file_desde_config(tmp_path):
+    class FileConfig(TestConfig):
+        PAGE_CACHE_BACKEND = 'file'
+        PAGE_CACHE_DIR = str(tmp_path)
+
+    application = create_app(FileConfig)
+    with application.app_context():
+        _db.create_all()
+        req = make_landing(_db)
+        client = application.test_client()
+        assert _get(client, req).headers['X-Page-Cache'] == 'MISS'
+        assert _get(client, req).headers['X-Page-Cache'] == 'HIT'
+        assert len(list(tmp_path.iterdir())) == 1
+        _db.session.remove()
+        _db.drop_all()
+
+
+def test_backend_none_desactiva_cache():
+    class NoCacheConfig(TestConfig):
+        PAGE_CACHE_BACKEND = 'none'
+
+    application = create_app(NoCacheConfig)
+    with application.app_context():
+        _db.create_all()
+        req = make_landing(_db)
+        client = application.test_client()
+        _get(client, req)
+        assert 'X-Page-Cache' not in _get(client, req).headers
+        _db.session.remove()
+        _db.drop_all()
@@ -0,0 +1,86 @@
+"""Tests para el hash de contraseñas configurable (app/services/passwords.py)."""
+import threading
+
+import pytest
+
+from app.extensions import db as _db
+from app.models.user import User
+from app.services.passwords import (
+    PasswordCheckBusy, _pool, hash_password, needs_rehash, verify_password,
+)
+from tests.conftest import login, make_user
+
+BARATO = 'pbkdf2:sha256:1000'
+
+
+def test_hash_usa_el_metodo_configurado(app):
+    app.config['PASSWORD_HASH_METHOD'] = BARATO
+    pwhash = hash_password('secreto')
+    assert pwhash.startswith(BARATO + '$')
+    assert verify_password(pwhash, 'secreto')
+    assert not verify_password(pwhash, 'otro')
+
+
+def test_needs_rehash_normaliza_parametros_por_defecto(app):
+    app.config['PASSWORD_HASH_METHOD'] = 'scrypt'
+    pwhash = hash_password('x')
+    assert not needs_rehash(pwhash)
+    app.config['PASSWORD_HASH_METHOD'] = 'scrypt:32768:8:1'
+    assert not needs_rehash(pwhash)
+    app.config['PASSWORD_HASH_METHOD'] = 'scrypt:16384:8:1'
+    assert needs_rehash(pwhash)
+
+
+@pytest.mark.parametrize('antes, despues', [
+    ('scrypt:32768:8:1', BARATO),   # abaratar
+    (BARATO, 'pbkdf2:sha256:2000'),  # endurecer
+])
+def test_login_rehashea_con_el_metodo_nuevo(app, client, antes, despues):
+    app.config['PASSWORD_HASH_METHOD'] = antes
+    user = User(email='user@test.com')
+    user.set_password('password123')
+    _db.session.add(user)
+    _db.session.commit()
+
+    app.config['PASSWORD_HASH_METHOD'] = despues
+    res = login(client, 'user@test.com', 'password123')
+    assert 'Sesión iniciada'.encode('utf-8') in res.data
+    _db.session.expire_all()
+    assert _db.session.get(User, user.id).password_hash.startswith(despues + '$')
+
+    client.get('/logout')
+    assert 'Sesión iniciada'.encode('utf-8') in login(client, 'user@test.com', 'password123').data
+
+
+def test_password_incorrecta_no_rehashea(app, client, db):
+    user = make_user(db)
+    original = user.password_hash
+    app.config['PASSWORD_HASH_METHOD'] = BARATO
+    res = login(client, 'user@test.com', 'mala')
+    assert b'incorrectos' in res.data
+    db.session.expire_all()
+    assert db.session.get(User, user.id).password_hash == original
+
+
+def test_pool_lleno_rechaza_login_con_503(app, client, db):
+    make_user(db)
+    app.config.update(PASSWORD_VERIFY_WORKERS=1, PASSWORD_VERIFY_QUEUE=0)
+    app.extensions.pop('password_verify_pool', None)
+    liberar, ocupado = threading.Event(), threading.Event()
+
+    def bloquear():
+        ocupado.set()
+        liberar.wait(5)
+
+    hilo = threading.Thread(target=_pool().run, args=(bloquear,))
+    hilo.start()
+    ocupado.wait(5)
+    try:
+        with pytest.raises(PasswordCheckBusy):
+            verify_password('x', 'y')
+        res = client.post('/login', data={'email': 'user@test.com', 'password': 'password123'})
+        assert res.status_code == 503
+    finally:
+        liberar.set()
+        hilo.join()
+    assert 'Sesión iniciada'.encode('utf-8') in login(client, 'user@test.com', 'password123').data
@@ -0,0 +1,31 @@
+"""Tests para app/services/prompt_templates.py: plantillas de prompt precompiladas."""
+import pytest
+
+from app.services.prompt_templates import PROMPT_FIELDS, PromptTemplate, PromptTemplateError
+from app.services.sectors import sector_registry
+
+
+def test_render_igual_que_str_format():
+    text = 'Nombre: {nombre}\n{{literal}} {descripcion} en {ubicacion}.'
+    values = {'nombre': 'Despacho', 'descripcion': 'Penal', 'ubicacion': 'Madrid'}
+    assert PromptTemplate('x', text).render(**values) == text.format(**values)
+
+
+def test_placeholder_desconocido_falla_al_cargar():
+    with pytest.raises(PromptTemplateError, match='telefono'):
+        PromptTemplate('x', 'Llama al {telefono}')
+
+
+def test_format_spec_no_permitido():
+    with pytest.raises(PromptTemplateError):
+        PromptTemplate('x', '{nombre!r}')
+
+
+def test_llave_sin_cerrar_falla_al_cargar():
+    with pytest.raises(PromptTemplateError):
+        PromptTemplate('x', 'Hola {nombre')
+
+
+def test_plantillas_del_repo_son_validas(app):
+    for sector in sector_registry():
+        assert sector.prompt.fields <= PROMPT_FIELDS
@@ -0,0 +1,79 @@
+"""Tests de las consultas de listado: no deben cargar las columnas pesadas."""
+import re
+
+from tests.conftest import make_user, make_admin, make_landing, login, capture_sql
+
+HEAVY_COLUMNS = ('generated_prompt', 'generated_html')
+
+
+def _selected_heavy_columns(statements):
+    """Columnas pesadas que aparecen en las sentencias como valor leído.
+
+    `generated_html IS NOT NULL` solo devuelve un booleano, así que no cuenta.
+    """
+    found = set()
+    for sql in statements:
+        sql = re.sub(r'\w+\.generated_html IS NOT NULL', '', sql)
+        found.update(col for col in HEAVY_COLUMNS if col in sql)
+    return found
+
+
+def _landing_con_contenido(db, user):
+    req = make_landing(db, user=user)
+    req.generated_prompt = 'p' * 5000
+    req.generated_html = '<html>' + 'x' * 50000 + '</html>'
+    db.session.commit()
+    return req
+
+
+def test_admin_pedidos_no_carga_columnas_pesadas(client, db):
+    _landing_con_contenido(db, make_user(db))
+    admin = make_admin(db)
+    login(client, admin.email, 'adminpass')
+    with capture_sql(db) as statements:
+        res = client.get('/admin/pedidos')
+    assert res.status_code == 200
+    assert b'user@test.com' in res.data
+    assert statements
+    assert _selected_heavy_columns(statements) == set()
+
+
+def test_admin_index_no_carga_columnas_pesadas(client, db):
+    _landing_con_contenido(db, make_user(db))
+    admin = make_admin(db)
+    login(client, admin.email, 'adminpass')
+    with capture_sql(db) as statements:
+        res = client.get('/admin/')
+    assert res.status_code == 200
+    assert _selected_heavy_columns(statements) == set()
+
+
+def test_mis_landings_no_carga_columnas_pesadas(client, db):
+    user = make_user(db)
+    _landing_con_contenido(db, user)
+    login(client, user.email, 'password123')
+    with capture_sql(db) as statements:
+        res = client.get('/mis-landings')
+    assert res.status_code == 200
+    assert b'Generada' in res.data
+    assert _selected_heavy_columns(statements) == set()
+
+
+def test_dashboard_no_carga_columnas_pesadas(client, db):
+    user = make_user(db)
+    _landing_con_contenido(db, user)
+    login(client, user.email, 'password123')
+    with capture_sql(db) as statements:
+        res = client.get('/dashboard')
+    assert res.status_code == 200
+    assert _selected_heavy_columns(statements) == set()
+
+
+def test_detalle_si_carga_el_contenido(client, db):
+    user = make_user(db)
+    req = _landing_con_contenido(db, user)
+    login(client, user.email, 'password123')
+    with capture_sql(db) as statements:
+        res = client.get(f'/mis-landings/{req.id}')
+    assert res.status_code == 200
+    assert _selected_heavy_columns(statements) == set(HEAVY_COLUMNS)
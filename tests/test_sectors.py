@@ -0,0 +1,108 @@
+"""Tests para app/services/sectors.py: registro de sectores cargado desde app/sectors/."""
+import json
+import os
+
+import pytest
+
+from app.forms.landing import LandingForm
+from app.services.prompt_templates import PromptTemplateError
+from app.services.sectors import SectorError, SectorRegistry, sector_registry
+
+THEME = {
+    'label': 'Nuevo', 'community': 'NuevoTAP', 'community_desc': 'Desc',
+    'primary': '#000', 'bg': '#fff', 'icon_bg': '#eee', 'icon': '*',
+}
+
+
+def _crear_sector(directory, name, prompt='{nombre}', order=0, **theme):
+    path = directory / name
+    path.mkdir(exist_ok=True)
+    (path / 'theme.json').write_text(json.dumps({**THEME, 'order': order, **theme}),
+                                     encoding='utf-8')
+    (path / 'prompt.txt').write_text(prompt, encoding='utf-8')
+    return path
+
+
+def test_sectores_del_repo_completos(app):
+    registry = sector_registry()
+    names = [name for name, _ in registry.choices()]
+    assert names[0] == 'abogatap'
+    assert len(names) == 9
+    assert set(names) == set(os.listdir(registry.directory))
+
+
+def test_choices_del_formulario_vienen_del_registro(app):
+    with app.test_request_context():
+        form = LandingForm()
+    assert ('saludtap', 'SaludTAP — Salud y Bienestar') in form.sector.choices
+
+
+def test_sector_inmutable(app):
+    sector = sector_registry().get('abogatap')
+    with pytest.raises(AttributeError):
+        sector.primary = '#ff0000'
+    assert not hasattr(sector, '__dict__')
+
+
+def test_get_or_default_para_sector_eliminado(app):
+    assert sector_registry().get('sectorfantasma') is None
+    assert sector_registry().get_or_default('sectorfantasma').name == 'abogatap'
+
+
+def test_orden_por_campo_order(tmp_path):
+    _crear_sector(tmp_path, 'zeta', order=1)
+    _crear_sector(tmp_path, 'alfa', order=2)
+    registry = SectorRegistry(str(tmp_path)).load()
+    assert [name for name, _ in registry.choices()] == ['zeta', 'alfa']
+
+
+def test_falta_clave_del_tema(tmp_path):
+    path = _crear_sector(tmp_path, 'roto')
+    (path / 'theme.json').write_text(json.dumps({'label': 'x'}), encoding='utf-8')
+    with pytest.raises(SectorError, match='community'):
+        SectorRegistry(str(tmp_path)).load()
+
+
+def test_falta_prompt(tmp_path):
+    path = _crear_sector(tmp_path, 'roto')
+    (path / 'prompt.txt').unlink()
+    with pytest.raises(SectorError, match='prompt.txt'):
+        SectorRegistry(str(tmp_path)).load()
+
+
+def test_placeholder_invalido_falla_al_cargar(tmp_path):
+    _crear_sector(tmp_path, 'roto', prompt='{telefono}')
+    with pytest.raises(PromptTemplateError):
+        SectorRegistry(str(tmp_path)).load()
+
+
+def test_sin_auto_reload_no_vuelve_a_leer_disco(tmp_path):
+    path = _crear_sector(tmp_path, 'nuevotap', prompt='v1 {nombre}')
+    registry = SectorRegistry(str(tmp_path)).load()
+    (path / 'prompt.txt').write_text('v2 {nombre}', encoding='utf-8')
+    os.utime(path / 'prompt.txt', (0, os.path.getmtime(path / 'prompt.txt') + 10))
+    assert registry.get('nuevotap').prompt.render(nombre='N') == 'v1 N'
+
+
+def test_auto_reload_detecta_cambios_por_mtime(tmp_path):
+    path = _crear_sector(tmp_path, 'nuevotap', prompt='v1 {nombre}')
+    registry = SectorRegistry(str(tmp_path), auto_reload=True).load()
+    first = registry.get('nuevotap')
+    assert registry.get('nuevotap') is first
+
+    (path / 'theme.json').write_text(json.dumps({**THEME, 'primary': '#123'}), encoding='utf-8')
+    os.utime(path / 'theme.json', (0, first.mtime + 10))
+    assert registry.get('nuevotap').primary == '#123'
+
+
+def test_auto_reload_sector_nuevo_y_borrado(tmp_path):
+    registry = SectorRegistry(str(tmp_path), auto_reload=True).load()
+    assert registry.choices() == ()
+    path = _crear_sector(tmp_path, 'nuevotap')
+    assert registry.choices() == (('nuevotap', 'NuevoTAP — Nuevo'),)
+    (path / 'prompt.txt').unlink()
+    assert registry.get('nuevotap') is None
+
+
+def test_init_app_sigue_debug(app):
+    assert app.extensions['sectors'].auto_reload is False
@@ -6,7 +6,11 @@ import base64
 
 import pytest
 
-from app.services.landing_service import generate_qr, build_prompt
+from app.services.landing_service import (
+    QrOptions, build_prompt, generate_qr, generate_qr_batch, generate_qr_png,
+    prune_qr_images, regenerate_qr_codes, render_qr, store_qr_png, store_qr_pngs,
+)
+from tests.conftest import make_landing
 
 
 # ---------------------------------------------------------------------------
@@ -34,6 +38,116 @@ def test_generate_qr_no_vacio(app):
     assert len(result) > 100
 
 
+def test_render_qr_memoiza_por_url_y_opciones():
+    render_qr.cache_clear()
+    opts = QrOptions(error_correction='H', box_size=5)
+    first = render_qr('https://ejemplo.com/p/memo', opts)
+    assert render_qr('https://ejemplo.com/p/memo', QrOptions(error_correction='H', box_size=5)) is first
+    assert render_qr.cache_info().hits == 1
+    render_qr('https://ejemplo.com/p/memo', opts._replace(border=2))
+    assert render_qr.cache_info().misses == 2
+
+
+def test_render_qr_svg():
+    svg = render_qr('https://ejemplo.com/p/abc', QrOptions(format='svg'))
+    assert b'<svg' in svg
+
+
+def test_render_qr_png_optimizado_no_es_mayor():
+    url = 'https://ejemplo.com/p/abc123'
+    plain = render_qr(url, QrOptions())
+    optimized = render_qr(url, QrOptions(format='png-optimized'))
+    assert optimized[:4] == b'\x89PNG'
+    assert len(optimized) <= len(plain)
+
+
+def test_render_qr_formato_desconocido():
+    with pytest.raises(ValueError):
+        render_qr('https://ejemplo.com', QrOptions(format='gif'))
+
+
+def test_generate_qr_png_rechaza_svg():
+    with pytest.raises(ValueError):
+        generate_qr_png('https://ejemplo.com', QrOptions(format='svg'))
+
+
+def test_store_qr_png_deduplica_por_contenido(app, db):
+    from app.models.qr_image import QrImage
+    png = generate_qr_png('https://ejemplo.com/p/abc123')
+    first = store_qr_png(png)
+    db.session.commit()
+    second = store_qr_png(png)
+    db.session.commit()
+    assert first == second
+    assert len(first) == 64
+    assert QrImage.query.count() == 1
+
+
+def test_generate_qr_batch_mantiene_el_orden():
+    urls = [f'https://ejemplo.com/p/{i}' for i in range(6)]
+    assert generate_qr_batch(urls) == [generate_qr_png(u) for u in urls]
+
+
+def test_generate_qr_batch_en_paralelo_igual_que_en_serie():
+    urls = [f'https://ejemplo.com/p/{i}' for i in range(10)]
+    assert generate_qr_batch(urls, workers=2, chunk_size=3) == generate_qr_batch(urls)
+
+
+def test_store_qr_pngs_inserta_solo_los_nuevos(app, db):
+    from app.models.qr_image import QrImage
+    a, b = generate_qr_png('https://ejemplo.com/a'), generate_qr_png('https://ejemplo.com/b')
+    store_qr_png(a)
+    db.session.commit()
+    digests = store_qr_pngs([a, b, b])
+    db.session.commit()
+    assert digests[1] == digests[2] != digests[0]
+    assert QrImage.query.count() == 2
+
+
+def test_regenerate_qr_codes_apunta_al_nuevo_dominio(app, db):
+    from app.models.qr_image import QrImage
+    reqs = [make_landing(db, business_name=f'Despacho {i}') for i in range(3)]
+    assert regenerate_qr_codes('https://tarjeta.example.com', batch_size=2) == 3
+
+    for req in reqs:
+        db.session.refresh(req)
+        expected = generate_qr_png(f'https://tarjeta.example.com/p/{req.public_slug}')
+        assert db.session.get(QrImage, req.qr_hash).data == expected
+
+
+def test_regenerate_qr_codes_no_toca_perfiles_sin_cambios(app, db):
+    req = make_landing(db)
+    regenerate_qr_codes('https://tarjeta.example.com')
+    db.session.refresh(req)
+    stamp = req.updated_at
+    assert regenerate_qr_codes('https://tarjeta.example.com') == 0
+    db.session.refresh(req)
+    assert req.updated_at == stamp
+
+
+def test_regenerate_qr_codes_filtra_por_slug(app, db):
+    uno = make_landing(db, business_name='Uno')
+    otro = make_landing(db, business_name='Otro')
+    assert regenerate_qr_codes('https://x.example.com', slugs=[uno.public_slug]) == 1
+    db.session.refresh(otro)
+    assert otro.qr_hash is None
+
+
+def test_prune_qr_images_borra_solo_las_huerfanas(app, db):
+    from app.models.qr_image import QrImage
+    reqs = [make_landing(db, business_name=f'Despacho {i}') for i in range(2)]
+    regenerate_qr_codes('https://viejo.example.com')
+    regenerate_qr_codes('https://nuevo.example.com')
+    assert QrImage.query.count() == 4
+    assert prune_qr_images() == 2
+    db.session.commit()
+    for req in reqs:
+        db.session.refresh(req)
+        assert db.session.get(QrImage, req.qr_hash) is not None
+    assert QrImage.query.count() == 2
+    assert prune_qr_images() == 0
+
+
 # ---------------------------------------------------------------------------
 # build_prompt
 # ---------------------------------------------------------------------------
@@ -121,3 +235,12 @@ def test_build_prompt_usa_location_si_disponible(app):
         prompt = build_prompt(req, [])
     # location tiene prioridad sobre website
     assert 'Madrid' in prompt
+
+
+def test_regenerate_qr_codes_sin_url_ni_server_name_falla(app, db):
+    req = make_landing(db)
+    app.config['SERVER_NAME'] = None
+    with pytest.raises(ValueError):
+        regenerate_qr_codes()
+    db.session.refresh(req)
+    assert req.qr_hash is None
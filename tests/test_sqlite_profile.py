@@ -0,0 +1,137 @@
+"""Tests para el perfil de producción de SQLite (app/services/sqlite_profile.py)."""
+import threading
+import time
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app import create_app
+from app.extensions import db as _db
+from config import Config
+from tests.conftest import TestConfig
+
+
+def _app(tmp_path, **overrides):
+    class FileConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{tmp_path / "app.db"}'
+        SQLITE_JOURNAL_MODE = Config.SQLITE_JOURNAL_MODE
+        SQLITE_SYNCHRONOUS = Config.SQLITE_SYNCHRONOUS
+        SQLITE_BUSY_TIMEOUT = Config.SQLITE_BUSY_TIMEOUT
+        SQLITE_MMAP_SIZE = Config.SQLITE_MMAP_SIZE
+        SQLITE_CACHE_SIZE = Config.SQLITE_CACHE_SIZE
+        SQLITE_SERIALIZE_WRITES = True
+
+    for key, value in overrides.items():
+        setattr(FileConfig, key, value)
+    app = create_app(FileConfig)
+    with app.app_context():
+        with _db.engine.begin() as conn:
+            conn.execute(text('CREATE TABLE t (id INTEGER PRIMARY KEY, v TEXT)'))
+    return app
+
+
+@pytest.fixture
+def engine(tmp_path):
+    app = _app(tmp_path, SQLITE_BUSY_TIMEOUT=300)
+    with app.app_context():
+        yield _db.engine
+        _db.engine.dispose()
+
+
+def _pragma(conn, name):
+    return conn.execute(text(f'PRAGMA {name}')).scalar()
+
+
+def test_pragmas_en_cada_conexion(tmp_path):
+    app = _app(tmp_path)
+    with app.app_context(), _db.engine.connect() as conn:
+        assert _pragma(conn, 'journal_mode') == 'wal'
+        assert _pragma(conn, 'synchronous') == 1  # NORMAL
+        assert _pragma(conn, 'busy_timeout') == 5000
+        assert _pragma(conn, 'mmap_size') == 256 * 1024 * 1024
+        assert _pragma(conn, 'cache_size') == -64 * 1024
+        _db.engine.dispose()
+
+
+def test_pragma_a_none_conserva_el_valor_de_sqlite(tmp_path):
+    app = _app(tmp_path, SQLITE_JOURNAL_MODE=None, SQLITE_SYNCHRONOUS=None)
+    with app.app_context(), _db.engine.connect() as conn:
+        assert _pragma(conn, 'journal_mode') == 'delete'
+        assert _pragma(conn, 'synchronous') == 2  # FULL
+        _db.engine.dispose()
+
+
+def test_lectores_no_esperan_al_escritor(engine):
+    with engine.connect() as escritor, engine.connect() as lector:
+        escritor.execute(text("INSERT INTO t (v) VALUES ('a')"))
+        # Transacción de escritura abierta: en WAL el lector ve el último commit
+        assert lector.execute(text('SELECT count(*) FROM t')).scalar() == 0
+        escritor.commit()
+        assert lector.execute(text('SELECT count(*) FROM t')).scalar() == 1
+
+
+def test_escritores_hacen_cola_hasta_el_commit(engine):
+    orden = []
+    dentro = threading.Event()
+
+    def primero():
+        with engine.connect() as conn:
+            conn.execute(text("INSERT INTO t (v) VALUES ('primero')"))
+            dentro.set()
+            time.sleep(0.1)
+            orden.append('commit primero')
+            conn.commit()
+
+    hilo = threading.Thread(target=primero)
+    hilo.start()
+    dentro.wait()
+    with engine.connect() as conn:
+        conn.execute(text("INSERT INTO t (v) VALUES ('segundo')"))
+        orden.append('insert segundo')
+        conn.commit()
+    hilo.join()
+    assert orden == ['commit primero', 'insert segundo']
+
+
+def test_espera_limitada_por_busy_timeout(engine):
+    dentro, fin = threading.Event(), threading.Event()
+
+    def bloquea():
+        with engine.connect() as conn:
+            conn.execute(text("INSERT INTO t (v) VALUES ('x')"))
+            dentro.set()
+            fin.wait()
+            conn.rollback()
+
+    hilo = threading.Thread(target=bloquea)
+    hilo.start()
+    dentro.wait()
+    try:
+        with engine.connect() as conn:
+            with pytest.raises(OperationalError, match='database is locked'):
+                conn.execute(text("INSERT INTO t (v) VALUES ('y')"))
+    finally:
+        fin.set()
+        hilo.join()
+    # El rollback liberó el turno
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO t (v) VALUES ('z')"))
+        assert conn.execute(text('SELECT count(*) FROM t')).scalar() == 1
+
+
+def test_conexion_devuelta_sin_commit_libera_el_turno(engine):
+    conn = engine.connect()
+    conn.execute(text("INSERT INTO t (v) VALUES ('a')"))
+    conn.close()
+    resultado = []
+    hilo = threading.Thread(target=lambda: resultado.append(_inserta(engine)))
+    hilo.start()
+    hilo.join()
+    assert resultado == [1]
+
+
+def _inserta(engine):
+    with engine.begin() as conn:
+        conn.execute(text("INSERT INTO t (v) VALUES ('b')"))
+        return conn.execute(text('SELECT count(*) FROM t')).scalar()
@@ -0,0 +1,74 @@
+"""Tests para la caché del user_loader (app/services/user_cache.py).
+
+El fixture ``app`` deja un contexto de aplicación abierto entre peticiones, con
+lo que ``g`` y la sesión sobrevivirían de una a otra. Cada petición medida se
+hace en un contexto nuevo, como en producción.
+"""
+from app.models.contact import Contact
+from app.models.user import User
+from app.services.user_cache import cached_user
+from tests.conftest import capture_sql, login, make_admin, make_landing, make_user
+
+
+def _get(app, client, url):
+    with app.app_context():
+        return client.get(url)
+
+
+def test_peticion_autenticada_no_consulta_user(app, client, db):
+    user = make_user(db)
+    req = make_landing(db, user=user)
+    contact = Contact(request_id=req.id, name='Ana')
+    db.session.add(contact)
+    db.session.commit()
+    contact_id = contact.id
+    login(client, user.email, 'password123')
+    _get(app, client, f'/dashboard/mensaje/{contact_id}')  # llena la caché
+
+    with capture_sql(db) as statements:
+        res = _get(app, client, f'/dashboard/mensaje/{contact_id}')
+    assert res.status_code == 200
+    assert [s for s in statements if 'FROM user' in s] == []
+    # el contacto y su perfil; nada más
+    assert len(statements) == 2, '\n---\n'.join(statements)
+
+
+def test_sin_cache_cuesta_una_consulta_mas(app, client, db):
+    user = make_user(db)
+    login(client, user.email, 'password123')
+    app.config['USER_CACHE_TTL'] = 0
+    app.extensions.pop('user_cache', None)
+    with capture_sql(db) as statements:
+        _get(app, client, '/mis-landings')
+    assert len([s for s in statements if 'FROM user' in s]) == 1
+
+
+def test_usuario_cacheado_carga_relaciones(app, client, db):
+    user = make_user(db)
+    login(client, user.email, 'password123')
+    _get(app, client, '/dashboard')
+    res = _get(app, client, '/dashboard')  # current_user.professional sobre el usuario cacheado
+    assert res.status_code == 200
+
+
+def test_cambiar_is_admin_invalida(app, client, db):
+    user = make_user(db)
+    login(client, user.email, 'password123')
+    assert _get(app, client, '/admin/').status_code == 403
+
+    db.session.get(User, user.id).is_admin = True
+    db.session.commit()
+    assert _get(app, client, '/admin/').status_code == 200
+
+
+def test_cambiar_password_invalida(app, db):
+    user = make_admin(db)
+    assert cached_user(user.id) is not None
+    user.set_password('nueva-clave')
+    db.session.commit()
+    with app.app_context():
+        assert cached_user(user.id).check_password('nueva-clave')
+
+
+def test_usuario_inexistente(app, db):
+    assert cached_user(999) is None